@@ -7,11 +7,23 @@ Résume, traduit et catégorise les articles
 import os
 import logging
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable, Tuple
 from anthropic import Anthropic
 import yaml
 from scripts.markdown_parser import MarkdownParser
+from scripts.rule_extractors import RuleExtractorRegistry
 from scripts.api_metrics import APIMetrics
+from scripts.model_router import ModelRouter
+from scripts.rate_limiter import RateLimiter, estimate_tokens
+from scripts.run_budget import RunBudget
+from scripts.cassette import get_cassette
+from scripts.link_table import LinkTable
+from scripts.content_classifier import (
+    ContentDescriptor, MARKDOWN_HEADINGS, SUBSTACK_HTML, classify_content, classify_email,
+    ranked_kinds
+)
+from scripts.structured_output import EXTRACTION_TOOL, RANKING_TOOL, salvage_json_array
+from scripts.run_journal import RunJournal, EXTRACTION, TRANSLATION, email_key, article_key
 
 # Configuration du logging
 logging.basicConfig(
@@ -24,25 +36,57 @@ logger = logging.getLogger(__name__)
 class AIProcessor:
     """Processeur IA pour analyser et résumer les newsletters"""
     
-    def __init__(self, config_path: str = "config/sources.yaml"):
+    # Nombre max d'appels pour re-demander la fin d'une réponse tronquée
+    MAX_CONTINUATIONS = 2
+    
+    # Hypothèses d'estimation avant traitement (tokens)
+    ESTIMATED_ARTICLES_PER_EMAIL = 8
+    ESTIMATED_PROMPT_TOKENS = 600
+    ESTIMATED_OUTPUT_TOKENS_PER_ARTICLE = 90
+    ESTIMATED_TRANSLATION_INPUT_TOKENS = 120
+    ESTIMATED_TRANSLATION_OUTPUT_TOKENS = 60
+    ESTIMATED_RANKING_TOKENS_PER_ARTICLE = 70
+    
+    def __init__(self, config_path: str = "config/sources.yaml", config: Optional[Dict] = None):
         """
         Initialise le processeur IA
         
         Args:
             config_path: Chemin vers le fichier de configuration
+            config: Configuration déjà chargée (prioritaire sur config_path)
         """
-        self.config = self._load_config(config_path)
+        self.config = config if config is not None else self._load_config(config_path)
         
-        # Initialiser le client Anthropic
+        # Initialiser le client Anthropic (enveloppé par la cassette record/replay)
+        cassette = get_cassette()
         api_key = os.getenv('ANTHROPIC_API_KEY')
-        if not api_key:
-            raise ValueError("ANTHROPIC_API_KEY doit être défini dans .env")
-        
-        self.client = Anthropic(api_key=api_key)
+        if cassette.replaying:
+            self.client = cassette.wrap_anthropic(None)
+        else:
+            if not api_key:
+                raise ValueError("ANTHROPIC_API_KEY doit être défini dans .env")
+            # Pas de retries du SDK: l'ordonnanceur partagé gère seul les reprises (backoff, RPM/TPM)
+            self.client = cassette.wrap_anthropic(Anthropic(api_key=api_key, max_retries=0))
         
         # Nouveaux composants
-        self.markdown_parser = MarkdownParser()
-        self.metrics = APIMetrics()
+        self.markdown_parser = MarkdownParser(self.config)
+        self.rule_extractors = RuleExtractorRegistry(self.config)
+        
+        # Format détecté -> (méthode suivie dans les métriques, extracteur sans IA)
+        self.extractors = {
+            MARKDOWN_HEADINGS: (
+                'markdown_parser',
+                lambda content, source, html: self.markdown_parser.extract_articles_from_markdown(content, source)
+            ),
+            SUBSTACK_HTML: (
+                'substack_parser',
+                # Sur le HTML brut de l'email s'il existe
+                lambda content, source, html: self.markdown_parser.extract_from_substack(html or content, source)
+            ),
+        }
+        self.router = ModelRouter(self.config)
+        self.scheduler = RateLimiter.from_config(self.config.get('rate_limits'))
+        self.reset_metrics()
         
         logger.info("✅ Client Anthropic initialisé avec markdown parser & métriques")
     
@@ -51,57 +95,200 @@ class AIProcessor:
         with open(config_path, 'r', encoding='utf-8') as f:
             return yaml.safe_load(f)
     
-    def extract_articles_from_newsletter(self, email_content: str, source_name: str) -> List[Dict]:
+    def reset_metrics(self):
+        """Nouvelles métriques pour une génération (processeur réutilisé en mode service)"""
+        self.metrics = APIMetrics(pricing=(self.config.get('models', {}) or {}).get('pricing'))
+    
+    def _create_message(self, model: str, purpose: str, **kwargs):
+        """
+        Appelle l'API Anthropic via l'ordonnanceur partagé (budgets par minute,
+        nouveaux essais) et enregistre tokens, modèle, latence et attente
+        
+        Args:
+            model: Modèle à utiliser
+            purpose: Description de l'appel (métriques)
+            **kwargs: Paramètres transmis à messages.create
+            
+        Returns:
+            Réponse de l'API
+        """
+        estimated_input = estimate_tokens(
+            json.dumps(kwargs.get('messages', []), ensure_ascii=False)
+            + json.dumps(kwargs.get('tools', []), ensure_ascii=False)
+        )
+        
+        message, call_stats = self.scheduler.call(
+            lambda: self.client.messages.create(model=model, **kwargs),
+            estimated_input,
+            kwargs.get('max_tokens', 1024),
+            lambda msg: (msg.usage.input_tokens, msg.usage.output_tokens)
+        )
+        
+        self.metrics.track_anthropic_call(
+            input_tokens=message.usage.input_tokens,
+            output_tokens=message.usage.output_tokens,
+            purpose=purpose,
+            model=model,
+            latency=call_stats['latency'],
+            queue_wait=call_stats['queue_wait'],
+            retries=call_stats['attempts'] - 1
+        )
+        return message
+    
+    def _source_config(self, source_name: str) -> Dict:
+        """Retourne la configuration d'une source par son nom"""
+        for source in self.config.get('sources', []):
+            if source.get('name') == source_name:
+                return source
+        return {}
+    
+    def estimate_run(self, emails_by_source: Dict[str, List[Dict]]) -> List[Dict]:
+        """
+        Estime les appels IA et tokens par étape avant traitement
+        
+        Args:
+            emails_by_source: Dictionnaire {source: [emails]}
+            
+        Returns:
+            Liste d'estimations {'stage', 'source', 'priority', 'model', 'calls',
+            'input_tokens', 'output_tokens', 'from_ai_extraction'}
+        """
+        estimates = []
+        total_articles = 0
+        
+        for source_name, emails in emails_by_source.items():
+            source = self._source_config(source_name)
+            priority = source.get('priority', 'medium')
+            translate = source.get('language') != 'fr'
+            
+            for email in emails or []:
+                content = email.get('content', '')
+                needs_ai = email.get('articles') is None and not (
+                    self.rule_extractors.has_recipe(source_name)
+                    or classify_email(email, source_name).ai_free
+                )
+                articles = (
+                    len(email['articles']) if email.get('articles') is not None
+                    else self.ESTIMATED_ARTICLES_PER_EMAIL
+                )
+                total_articles += articles
+                
+                if needs_ai:
+                    estimates.append({
+                        'stage': 'extraction',
+                        'source': source_name,
+                        'priority': priority,
+                        'model': self.router.model_for('extraction', source_name),
+                        'calls': 1,
+                        'input_tokens': estimate_tokens(content[:10000]) + self.ESTIMATED_PROMPT_TOKENS,
+                        'output_tokens': articles * self.ESTIMATED_OUTPUT_TOKENS_PER_ARTICLE,
+                        'from_ai_extraction': True
+                    })
+                
+                if translate:
+                    calls = 2 * articles  # titre + résumé
+                    estimates.append({
+                        'stage': 'translation',
+                        'source': source_name,
+                        'priority': priority,
+                        'model': self.router.model_for('translation', source_name),
+                        'calls': calls,
+                        'input_tokens': calls * self.ESTIMATED_TRANSLATION_INPUT_TOKENS,
+                        'output_tokens': calls * self.ESTIMATED_TRANSLATION_OUTPUT_TOKENS,
+                        'from_ai_extraction': needs_ai
+                    })
+        
+        if total_articles:
+            min_total = self.config.get('balancing', {}).get('min_articles_total', 25)
+            estimates.append({
+                'stage': 'ranking',
+                'source': None,
+                'priority': 'high',
+                'model': self.router.model_for('ranking'),
+                'calls': 1,
+                'input_tokens': total_articles * self.ESTIMATED_RANKING_TOKENS_PER_ARTICLE + self.ESTIMATED_PROMPT_TOKENS,
+                'output_tokens': min(total_articles, min_total) * 50,
+                'from_ai_extraction': False
+            })
+        
+        return estimates
+    
+    def extract_articles_from_newsletter(self, email_content: str, source_name: str,
+                                         allow_ai: bool = True, html: Optional[str] = None,
+                                         links: Optional[List[Dict]] = None,
+                                         descriptor: Optional[ContentDescriptor] = None) -> List[Dict]:
         """
         Extrait les articles individuels d'une newsletter avec parsing intelligent
         
         Args:
-            email_content: Contenu complet de l'email
+            email_content: Contenu complet de l'email (texte)
             source_name: Nom de la source
+            allow_ai: False pour n'utiliser que les parsers sans IA (budget)
+            html: Partie HTML brute de l'email si disponible
+            links: Table des liens de l'email [{'text', 'href'}]
+            descriptor: Format déjà détecté (voir classify_email), sinon détecté ici
             
         Returns:
             Liste d'articles extraits
         """
         logger.info(f"🤖 Extraction des articles de {source_name}...")
         
-        # NOUVEAU: Détection et parsing sans IA si possible
-        if self.markdown_parser.can_parse_without_ai(email_content, source_name):
-            logger.info(f"  🚀 Parsing sans IA pour {source_name}")
-            
-            # Parser Markdown Firecrawl
-            if '####' in email_content or '#####' in email_content:
-                articles = self.markdown_parser.extract_articles_from_markdown(
-                    email_content, source_name
-                )
-                if articles:
-                    self.metrics.track_extraction_method('markdown_parser', len(articles))
-                    return articles
-            
-            # Parser Substack
-            if 'substack' in source_name.lower() or 'class="post-title"' in email_content:
-                articles = self.markdown_parser.extract_from_substack(
-                    email_content, source_name
-                )
-                if articles:
-                    self.metrics.track_extraction_method('markdown_parser', len(articles))
-                    return articles
+        # Recette déclarative propre à la source (sources.yaml)
+        articles = self.rule_extractors.extract(email_content, source_name, html=html, links=links)
+        if articles:
+            recipe = self.rule_extractors.recipes[source_name].name
+            self.metrics.track_extraction_method('rule_extractor', len(articles), recipe=recipe)
+            return articles
+        
+        # Format détecté en une passe, puis parser sans IA correspondant
+        if descriptor is None:
+            descriptor = classify_content(email_content, source_name, html=html)
+        logger.info(f"  🔎 Format: {descriptor.kind} (confiance {descriptor.confidence:.2f})")
+        
+        # Parsers sans IA des formats candidats, du plus probable au moins probable
+        for kind in ranked_kinds(descriptor, source_name):
+            extractor = self.extractors.get(kind)
+            if not extractor:
+                continue
+            method, parse = extractor
+            logger.info(f"  🚀 Parsing sans IA pour {source_name} ({method})")
+            articles = parse(email_content, source_name, html)
+            if articles:
+                self.metrics.track_extraction_method(method, len(articles))
+                return articles
+        
+        if not allow_ai:
+            logger.info(f"  ⏭️  Extraction IA ignorée pour {source_name} (budget)")
+            return []
         
         # FALLBACK: Extraction IA classique
         logger.info(f"  🤖 Extraction IA pour {source_name}")
-        return self._extract_with_ai(email_content, source_name)
+        return self._extract_with_ai(email_content, source_name, links=links)
     
-    def _extract_with_ai(self, email_content: str, source_name: str) -> List[Dict]:
+    def _extract_with_ai(self, email_content: str, source_name: str,
+                         links: Optional[List[Dict]] = None) -> List[Dict]:
         """
         Méthode d'extraction IA (renommée de l'ancienne extract_articles_from_newsletter)
         
         Args:
             email_content: Contenu complet de l'email
             source_name: Nom de la source
+            links: Table des liens extraite du HTML de l'email
             
         Returns:
             Liste d'articles extraits par IA
         """
         
+        # Liens remplacés par des identifiants courts ([L7]) + table compacte
+        link_table = LinkTable(links)
+        compacted = link_table.compact(email_content)
+        excerpt = compacted[:10000]
+        table = link_table.table(excerpt)
+        logger.info(
+            f"  🔗 {len(link_table.urls)} lien(s) compacté(s): "
+            f"{len(email_content):,} → {len(compacted):,} caractères"
+        )
+        
         prompt = f"""Tu es un expert en analyse de newsletters de growth marketing.
 
 Analysez cette newsletter de \"{source_name}\" et extrayez tous les articles/news individuels qu'elle contient.
@@ -109,7 +296,7 @@ Analysez cette newsletter de \"{source_name}\" et extrayez tous les articles/new
 Pour chaque article, identifiez :
 1. Le titre de l'article (1 ligne maximum - 80 caractères max)
 2. Un résumé ULTRA COURT (2 lignes max = 160 caractères max)
-3. L'URL COMPLÈTE et PRÉCISE de l'article (CRITIQUE: cherchez attentivement dans le contenu)
+3. L'identifiant du lien de l'article (ex: L7), tel qu'il apparaît dans le contenu ou la table des liens
 4. Le niveau d'importance (critical, important, good_to_know)
 
 🔴 CONTRAINTE CRITIQUE - LONGUEUR DU RÉSUMÉ 🔴
@@ -118,22 +305,24 @@ Pour chaque article, identifiez :
 - Éliminez tout mot superflu
 - Allez à l'essentiel
 
-Newsletter à analyser :
-{email_content[:10000]}
+Newsletter à analyser (chaque lien est remplacé par un identifiant [Ln]) :
+{excerpt}
+
+Table des liens (identifiant: texte du lien (domaine)) :
+{table}
 
-IMPORTANT pour les URLs:
-- Cherchez les liens HTTP/HTTPS dans le contenu
-- Préférez les URLs complètes (https://example.com/article-title)
-- Si vous trouvez un lien court, utilisez-le
-- Si vraiment aucun lien n'existe, mettez null
+IMPORTANT pour les liens:
+- Utilisez UNIQUEMENT un identifiant de la table (ex: "L7"), jamais une URL
+- Choisissez le lien qui mène à l'article lui-même (pas désinscription, partage, sponsor)
+- Si aucun lien ne correspond à l'article, mettez null
 
-Réponds UNIQUEMENT avec un JSON valide :
+Réponds UNIQUEMENT via l'outil `enregistrer_articles`, avec cette structure :
 {{
   "articles": [
     {{
       "title": "Titre court (max 80 car.)",
       "summary": "Résumé ultra court max 160 caractères.",
-      "url": "https://example.com/article-complet",
+      "url": "L7",
       "category": "critical|important|good_to_know"
     }}
   ]
@@ -143,53 +332,207 @@ Classe les articles par importance (critical pour les plus importants).
 RAPPEL: summary MAX 160 caractères !
 """
         
-        try:
-            message = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4096,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+        def continuation(done: List[Dict]) -> str:
+            titles = "\n".join(f"- {art.get('title', '')}" for art in done)
+            return (
+                f"{prompt}\n\nTa réponse précédente a été interrompue. "
+                f"Articles DÉJÀ extraits (ne pas les répéter) :\n{titles}\n\n"
+                f"Extrais UNIQUEMENT les articles restants de la newsletter."
             )
+        
+        try:
+            models = self.router.chain('extraction', source_name)
+            for i, model in enumerate(models):
+                articles, complete = self._request_structured(
+                    prompt,
+                    EXTRACTION_TOOL,
+                    'articles',
+                    max_tokens=4096,
+                    purpose=f"Extraction: {source_name}",
+                    continuation=continuation,
+                    item_key=lambda art: (art.get('title') or '').strip().lower(),
+                    model=model
+                )
+                # Identifiants -> URLs complètes (inconnus ou inventés -> None, extraction non valide)
+                unresolved = 0
+                for art in articles:
+                    ref = art.get('url')
+                    art['url'] = link_table.resolve(ref)
+                    if ref and not art['url']:
+                        unresolved += 1
+                if self._validate_articles(articles, unresolved) or i == len(models) - 1:
+                    break
+                self.metrics.track_model_escalation('extraction', model, models[i + 1])
+            
+            articles = [art for art in articles if art.get('title')]
+            for art in articles:
+                art.setdefault('summary', '')
+                art.setdefault('url', None)
+                art.setdefault('category', 'important')
             
-            # Extraire le JSON de la réponse
-            response_text = message.content[0].text
-            
-            # Nettoyer la réponse (enlever les ``` si présents)
-            response_text = response_text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-            
-            # Parser le JSON
-            data = json.loads(response_text)
-            articles = data.get('articles', [])
-            
-            # Tracker les métriques API
-            self.metrics.track_anthropic_call(
-                input_tokens=message.usage.input_tokens,
-                output_tokens=message.usage.output_tokens,
-                purpose=f"Extraction: {source_name}"
-            )
             self.metrics.track_extraction_method('anthropic_ai', len(articles))
             
-            logger.info(f"  ✅ {len(articles)} article(s) extrait(s) par IA")
+            if complete:
+                logger.info(f"  ✅ {len(articles)} article(s) extrait(s) par IA")
+            else:
+                logger.warning(f"  ⚠️  {len(articles)} article(s) extrait(s) par IA (réponse incomplète)")
             return articles
             
         except Exception as e:
             logger.error(f"  ❌ Erreur lors de l'extraction: {e}")
             return []
     
-    def translate_to_french(self, text: str) -> str:
+    def _request_structured(self, prompt: str, tool: Dict, array_key: str, max_tokens: int,
+                            purpose: str, continuation: Callable[[List[Dict]], str],
+                            item_key: Callable[[Dict], object],
+                            model: str = ModelRouter.DEFAULT_MODEL) -> Tuple[List[Dict], bool]:
+        """
+        Appelle Claude avec une sortie contrainte par schéma (tool-use)
+        et récupère le maximum d'objets même si la réponse est tronquée
+        
+        Args:
+            prompt: Prompt initial
+            tool: Schéma tool-use à imposer
+            array_key: Clé du tableau d'objets attendu
+            max_tokens: Limite de tokens de sortie par appel
+            purpose: Description de l'appel (métriques)
+            continuation: Construit le prompt de suite à partir des objets déjà reçus
+            item_key: Clé de déduplication des objets entre deux appels
+            model: Modèle à utiliser
+            
+        Returns:
+            Tuple (objets récupérés, True si la réponse est complète)
+        """
+        items = []
+        seen = set()
+        current_prompt = prompt
+        complete = False
+        
+        for attempt in range(self.MAX_CONTINUATIONS + 1):
+            message = self._create_message(
+                model,
+                purpose if attempt == 0 else f"{purpose} (suite {attempt})",
+                max_tokens=max_tokens,
+                tools=[tool],
+                tool_choice={"type": "tool", "name": tool['name']},
+                messages=[
+                    {"role": "user", "content": current_prompt}
+                ]
+            )
+            
+            batch, complete = self._parse_structured_response(message, array_key)
+            
+            new_items = []
+            for item in batch:
+                key = item_key(item)
+                if key in seen:
+                    continue
+                seen.add(key)
+                new_items.append(item)
+            items.extend(new_items)
+            
+            if attempt > 0:
+                self.metrics.track_structured_output('rerequested_items', len(new_items))
+            elif not complete:
+                self.metrics.track_structured_output('salvaged_items', len(new_items))
+            
+            if complete:
+                break
+            
+            if attempt > 0 and not new_items:
+                # La suite n'apporte plus rien: inutile d'insister
+                break
+            
+            if attempt < self.MAX_CONTINUATIONS:
+                logger.warning(f"  ⚠️  Réponse incomplète ({len(items)} objet(s) récupéré(s)), demande de la suite...")
+                self.metrics.track_structured_output('continuation_calls')
+                current_prompt = continuation(items)
+        
+        if not items and not complete:
+            self.metrics.track_structured_output('parse_failures')
+        
+        return items, complete
+    
+    def _parse_structured_response(self, message, array_key: str) -> Tuple[List[Dict], bool]:
+        """
+        Lit la sortie tool-use d'une réponse, ou à défaut récupère les objets
+        complets du texte brut
+        
+        Args:
+            message: Réponse de l'API Anthropic
+            array_key: Clé du tableau d'objets attendu
+            
+        Returns:
+            Tuple (objets récupérés, True si la réponse est complète)
+        """
+        truncated = getattr(message, 'stop_reason', None) == 'max_tokens'
+        texts = []
+        
+        for block in message.content:
+            block_type = getattr(block, 'type', 'text')
+            if block_type == 'tool_use':
+                payload = block.input if isinstance(block.input, dict) else {}
+                value = payload.get(array_key)
+                if isinstance(value, list) and not truncated:
+                    self.metrics.track_structured_output('tool_use_parsed')
+                    return [item for item in value if isinstance(item, dict)], True
+                if isinstance(value, list):
+                    return [item for item in value if isinstance(item, dict)], False
+                if isinstance(value, str):
+                    # Le modèle a parfois sérialisé le tableau en chaîne
+                    texts.append(f'{{"{array_key}": {value}')
+            elif block_type == 'text':
+                texts.append(block.text)
+        
+        items, complete = salvage_json_array("\n".join(texts), array_key)
+        return items, complete and not truncated
+    
+    def _validate_articles(self, articles: List[Dict], unresolved: int = 0) -> bool:
+        """
+        Vérifie qu'une extraction est exploitable (sinon escalade de modèle)
+        
+        Args:
+            articles: Articles extraits
+            unresolved: Identifiants de lien renvoyés mais absents de la table
+            
+        Returns:
+            True si la majorité des articles ont titre, résumé et URL valide,
+            et aucun identifiant de lien n'est inventé
+        """
+        if not articles or unresolved:
+            return False
+        
+        valid = 0
+        for art in articles:
+            url = art.get('url')
+            if (art.get('title') and art.get('summary')
+                    and (url is None or (isinstance(url, str) and url.startswith('http')))):
+                valid += 1
+        
+        return valid * 2 >= len(articles)
+    
+    def _validate_translation(self, original: str, translated: str) -> bool:
+        """
+        Vérifie qu'une traduction est plausible (sinon escalade de modèle)
+        
+        Args:
+            original: Texte source
+            translated: Texte traduit
+            
+        Returns:
+            True si la traduction est non vide et de longueur cohérente
+        """
+        if not translated:
+            return False
+        return len(translated) <= max(3 * len(original), 200)
+    
+    def translate_to_french(self, text: str, source_name: Optional[str] = None) -> str:
         """
         Traduit un texte en français
         
         Args:
             text: Texte à traduire
+            source_name: Nom de la source (routage de modèle par source)
             
         Returns:
             Texte traduit
@@ -206,32 +549,139 @@ Texte à traduire :
 """
         
         try:
-            message = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=1024,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            models = self.router.chain('translation', source_name)
+            for i, model in enumerate(models):
+                message = self._create_message(
+                    model,
+                    f"Traduction: {source_name or text[:30]}",
+                    max_tokens=1024,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+                translated = message.content[0].text.strip()
+                if self._validate_translation(text, translated):
+                    return translated
+                if i < len(models) - 1:
+                    self.metrics.track_model_escalation('translation', model, models[i + 1])
             
-            return message.content[0].text.strip()
+            logger.warning("Traduction invalide, texte original conservé")
+            return text
             
         except Exception as e:
             logger.error(f"Erreur lors de la traduction: {e}")
             return text  # Retourner le texte original en cas d'erreur
     
-    def process_all_emails(self, emails_by_source: Dict[str, List[Dict]]) -> List[Dict]:
+    def extract_email(self, email: Dict, source_name: str, budget: RunBudget,
+                      journal: Optional[RunJournal] = None) -> List[Dict]:
+        """
+        Extrait les articles d'un email (ou d'un enregistrement flux/recherche/web)
+        
+        Args:
+            email: Enregistrement récupéré
+            source_name: Nom de la source
+            budget: Budget de la génération
+            journal: Journal de la génération (extraction rejouée si déjà faite)
+            
+        Returns:
+            Articles avec métadonnées de source, pas encore traduits
+        """
+        key = email_key(source_name, email) if journal else None
+        if journal:
+            replayed = journal.get(EXTRACTION, key)
+            if replayed is not None:
+                return replayed
+        
+        budget.checkpoint(self.metrics)
+        if email.get('articles') is not None:
+            # Flux RSS/Atom ou recherche: articles déjà structurés, aucune extraction
+            articles = [dict(article) for article in email['articles']]
+            method = 'search_enrichment' if email.get('content_type') == 'search' else 'feed_parser'
+            self.metrics.track_extraction_method(method, len(articles))
+        else:
+            articles = self.extract_articles_from_newsletter(
+                email['content'],
+                source_name,
+                allow_ai=not budget.is_degraded('ai_free_extraction'),
+                html=email.get('html'),
+                links=email.get('links'),
+                descriptor=classify_email(email, source_name)
+            )
+        
+        # Ajouter les métadonnées de source
+        for article in articles:
+            article['source'] = source_name
+            article['email_date'] = article.get('email_date') or email.get('date', '')
+        
+        if journal:
+            journal.record(EXTRACTION, key, articles)
+        return articles
+    
+    def finalize_article(self, article: Dict, budget: RunBudget,
+                         journal: Optional[RunJournal] = None) -> Dict:
+        """
+        Traduit un article si nécessaire puis réduit titre et résumé aux longueurs maximales
+        
+        Args:
+            article: Article issu de extract_email
+            budget: Budget de la génération
+            journal: Journal de la génération (traduction rejouée si déjà faite)
+            
+        Returns:
+            L'article traduit (modifié sur place, ou copie journalisée)
+        """
+        key = article_key(article) if journal else None
+        if journal:
+            replayed = journal.get(TRANSLATION, key)
+            if replayed is not None:
+                return replayed
+        
+        source_name = article['source']
+        priority = self._source_config(source_name).get('priority', 'medium')
+        skip_translation = (
+            budget.is_degraded('skip_low_priority_translation') and priority != 'high'
+        )
+        
+        # Traduire en français si nécessaire
+        if not skip_translation and not self._is_french(article['title']):
+            article['title'] = self.translate_to_french(article['title'], source_name)
+        
+        if not skip_translation and not self._is_french(article['summary']):
+            article['summary'] = self.translate_to_french(article['summary'], source_name)
+        
+        # VALIDATION: Tronquer le titre et le résumé s'ils sont trop longs
+        if len(article['title']) > 80:
+            article['title'] = article['title'][:77] + '...'
+            logger.warning(f"  ⚠️  Titre tronqué pour {source_name}")
+        
+        if len(article['summary']) > 160:
+            article['summary'] = article['summary'][:157] + '...'
+            logger.warning(f"  ⚠️  Résumé tronqué pour {source_name}")
+        
+        if journal:
+            journal.record(TRANSLATION, key, article)
+        return article
+    
+    def process_all_emails(self, emails_by_source: Dict[str, List[Dict]],
+                           budget: Optional[RunBudget] = None,
+                           journal: Optional[RunJournal] = None) -> List[Dict]:
         """
         Traite tous les emails et extrait les articles
         
         Args:
             emails_by_source: Dictionnaire {source: [emails]}
+            budget: Budget de la génération (dégradation progressive)
+            journal: Journal de la génération (éléments déjà traités rejoués)
             
         Returns:
             Liste consolidée d'articles traités
         """
         logger.info("🚀 Traitement de tous les emails avec l'IA...")
         
+        budget = budget or RunBudget()
+        budget.configure(self.config.get('budget'))
+        budget.preflight(self.estimate_run(emails_by_source), self.metrics)
+        
         all_articles = []
         
         for source_name, emails in emails_by_source.items():
@@ -242,33 +692,8 @@ Texte à traduire :
             
             # Traiter chaque email
             for email in emails:
-                articles = self.extract_articles_from_newsletter(
-                    email['content'],
-                    source_name
-                )
-                
-                # Ajouter les métadonnées de source
-                for article in articles:
-                    article['source'] = source_name
-                    article['email_date'] = email.get('date', '')
-                    
-                    # Traduire en français si nécessaire
-                    if not self._is_french(article['title']):
-                        article['title'] = self.translate_to_french(article['title'])
-                    
-                    if not self._is_french(article['summary']):
-                        article['summary'] = self.translate_to_french(article['summary'])
-                    
-                    # VALIDATION: Tronquer le titre et le résumé s'ils sont trop longs
-                    if len(article['title']) > 80:
-                        article['title'] = article['title'][:77] + '...'
-                        logger.warning(f"  ⚠️  Titre tronqué pour {source_name}")
-                    
-                    if len(article['summary']) > 160:
-                        article['summary'] = article['summary'][:157] + '...'
-                        logger.warning(f"  ⚠️  Résumé tronqué pour {source_name}")
-                    
-                    all_articles.append(article)
+                for article in self.extract_email(email, source_name, budget, journal):
+                    all_articles.append(self.finalize_article(article, budget, journal))
         
         logger.info(f"✅ Traitement terminé: {len(all_articles)} articles extraits au total")
         
@@ -293,18 +718,33 @@ Texte à traduire :
         # Si au moins 2 mots français trouvés, considérer comme français
         return french_count >= 2
     
-    def rank_and_categorize(self, articles: List[Dict]) -> List[Dict]:
+    def rank_and_categorize(self, articles: List[Dict], budget: Optional[RunBudget] = None,
+                            balancing: Optional[Dict] = None) -> List[Dict]:
         """
         Classe et catégorise les articles par importance
         
         Args:
-            articles: Liste des articles
+            articles: Liste des articles (dicts ou ArticleRecord)
+            budget: Budget de la génération (classement local si dégradé)
+            balancing: Règles de l'édition (min_articles_total, max_articles_per_source)
             
         Returns:
             Liste des articles classés avec rang
         """
         logger.info("🎯 Classement et catégorisation des articles...")
         
+        balancing = balancing or {}
+        min_total = balancing.get(
+            'min_articles_total', self.config.get('balancing', {}).get('min_articles_total', 25)
+        )
+        per_source = balancing.get('max_articles_per_source', 2)
+        
+        if budget:
+            budget.checkpoint(self.metrics)
+            if budget.is_degraded('local_ranking'):
+                logger.info("  ⏭️  Classement IA ignoré (budget), classement local")
+                return self._local_ranking(articles, min_total)
+        
         # Créer un prompt pour classer tous les articles
         articles_text = "\n\n".join([
             f"Article {i+1}:\n"
@@ -315,9 +755,6 @@ Texte à traduire :
             for i, art in enumerate(articles)
         ])
         
-        balancing_config = self.config.get('balancing', {})
-        min_total = balancing_config.get('min_articles_total', 25)
-        
         # Compter les articles par source
         source_articles = {}
         for i, art in enumerate(articles):
@@ -332,8 +769,7 @@ Texte à traduire :
         ])
         
         # Calculer le nombre cible d'articles à sélectionner
-        target_per_source = 2
-        expected_total = min(sum(min(len(indices), target_per_source) for indices in source_articles.values()), min_total)
+        expected_total = min(sum(min(len(indices), per_source) for indices in source_articles.values()), min_total)
         
         prompt = f"""Tu es un expert en growth marketing chargé de sélectionner et classer les actualités les plus importantes pour une newsletter hebdomadaire française.
 
@@ -346,12 +782,12 @@ PROCÉDURE OBLIGATOIRE (à suivre dans cet ordre précis):
 
 1️⃣ PHASE DE SÉLECTION PAR SOURCE:
    Pour CHAQUE source listée ci-dessus:
-   a) Identifie les 2 meilleurs articles de cette source
-   b) Si la source a moins de 2 articles, prends tous ses articles
+   a) Identifie les {per_source} meilleurs articles de cette source
+   b) Si la source a moins de {per_source} articles, prends tous ses articles
    c) AUCUNE source ne doit être exclue de la sélection
    
 2️⃣ PHASE DE CLASSEMENT GLOBAL:
-   Une fois que tu as exactement 2 articles par source (ou moins si impossible):
+   Une fois que tu as exactement {per_source} articles par source (ou moins si impossible):
    a) Classe TOUS ces articles par ordre d'importance (1 = le plus important)
    b) Assigne les catégories:
       - "critical" (rangs 1-8) : News critiques, game-changing
@@ -361,12 +797,12 @@ PROCÉDURE OBLIGATOIRE (à suivre dans cet ordre précis):
 ⚠️ VÉRIFICATIONS FINALES REQUISES:
 - Tu dois avoir sélectionné environ {expected_total} articles au total
 - TOUTES les {len(source_articles)} sources doivent être représentées
-- Chaque source doit avoir 2 articles (sauf si elle en a moins de 2)
+- Chaque source doit avoir {per_source} articles (sauf si elle en a moins de {per_source})
 
 Articles à classer :
 {articles_text[:15000]}
 
-Réponds UNIQUEMENT avec un JSON valide :
+Réponds UNIQUEMENT via l'outil `enregistrer_classement`, avec cette structure :
 {{
   "ranked_articles": [
     {{
@@ -382,53 +818,60 @@ Réponds UNIQUEMENT avec un JSON valide :
 ATTENTION: Si tu exclus une source de ta sélection, tu as échoué cette tâche.
 """
         
-        try:
-            message = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4096,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+        def continuation(done: List[Dict]) -> str:
+            ranked = ", ".join(str(info.get('article_index')) for info in done)
+            last_rank = max((info.get('rank', 0) for info in done), default=0)
+            return (
+                f"{prompt}\n\nTa réponse précédente a été interrompue. "
+                f"Articles DÉJÀ classés (article_index) : {ranked}.\n"
+                f"Complète UNIQUEMENT le classement restant, en commençant au rang {last_rank + 1}."
             )
+        
+        try:
+            models = self.router.chain('ranking')
+            for i, model in enumerate(models):
+                ranked_data, complete = self._request_structured(
+                    prompt,
+                    RANKING_TOOL,
+                    'ranked_articles',
+                    max_tokens=4096,
+                    purpose="Ranking",
+                    continuation=continuation,
+                    item_key=lambda info: info.get('article_index'),
+                    model=model
+                )
+                if ranked_data or i == len(models) - 1:
+                    break
+                self.metrics.track_model_escalation('ranking', model, models[i + 1])
             
-            # Parser la réponse
-            response_text = message.content[0].text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-            
-            data = json.loads(response_text)
-            ranked_data = data.get('ranked_articles', [])
+            if not ranked_data:
+                raise ValueError("Aucun classement exploitable dans la réponse")
             
             # Appliquer les rangs aux articles
             ranked_articles = []
             for rank_info in ranked_data:
-                idx = rank_info['article_index']
-                if 0 <= idx < len(articles):
+                idx = rank_info.get('article_index')
+                if isinstance(idx, int) and 0 <= idx < len(articles):
                     article = articles[idx].copy()
-                    article['rank'] = rank_info['rank']
-                    article['category'] = rank_info['category']
+                    article['rank'] = rank_info.get('rank', len(ranked_articles) + 1)
+                    article['category'] = rank_info.get('category', article.get('category', 'important'))
                     article['ranking_reason'] = rank_info.get('reason', '')
                     ranked_articles.append(article)
             
             # Trier par rang
             ranked_articles.sort(key=lambda x: x['rank'])
             
-            # VALIDATION: Forcer max 2 articles par source
+            # VALIDATION: Forcer max per_source articles par source
             source_count = {}
             final_articles = []
             for art in ranked_articles:
                 source = art['source']
                 count = source_count.get(source, 0)
-                if count < 2:  # Max 2 par source
+                if count < per_source:
                     final_articles.append(art)
                     source_count[source] = count + 1
                 else:
-                    logger.warning(f"  ⚠️  Article de {source} ignoré (déjà 2 articles)")
+                    logger.warning(f"  ⚠️  Article de {source} ignoré (déjà {per_source} articles)")
             
             # Si on a moins de min_total, compléter avec les articles ignorés
             if len(final_articles) < min_total:
@@ -442,16 +885,32 @@ ATTENTION: Si tu exclus une source de ta sélection, tu as échoué cette tâche
         except Exception as e:
             logger.error(f"❌ Erreur lors du classement: {e}")
             # Fallback: retourner les articles avec un classement basique
-            for i, article in enumerate(articles[:min_total]):
-                article['rank'] = i + 1
-                if i < 8:
-                    article['category'] = 'critical'
-                elif i < 16:
-                    article['category'] = 'important'
-                else:
-                    article['category'] = 'good_to_know'
+            return self._local_ranking(articles, min_total)
+    
+    def _local_ranking(self, articles: List[Dict], min_total: int) -> List[Dict]:
+        """
+        Classement basique sans IA (ordre d'extraction)
+        
+        Args:
+            articles: Liste des articles
+            min_total: Nombre d'articles à retenir
             
-            return articles[:min_total]
+        Returns:
+            Liste des articles classés avec rang
+        """
+        ranked = []
+        for i, article in enumerate(articles[:min_total]):
+            article = dict(article)
+            article['rank'] = i + 1
+            if i < 8:
+                article['category'] = 'critical'
+            elif i < 16:
+                article['category'] = 'important'
+            else:
+                article['category'] = 'good_to_know'
+            ranked.append(article)
+        
+        return ranked
 
 
 def main():
@@ -3,44 +3,93 @@
 API Metrics Tracker - Suivi des coûts et métriques d'optimisation
 """
 
+import sys
 import json
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 from pathlib import Path
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def peak_rss_mb() -> Optional[float]:
+    """Pic de mémoire résidente du processus en Mo (None si indisponible, ex: Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: octets sur macOS, kilo-octets sur Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
 class APIMetrics:
     """Tracker pour métriques API et coûts"""
     
-    # Coûts Anthropic Claude 3.5 Sonnet (par million de tokens)
-    ANTHROPIC_COST_PER_M_INPUT = 3.00  # $3 par 1M tokens input
-    ANTHROPIC_COST_PER_M_OUTPUT = 15.00  # $15 par 1M tokens output
+    # Coûts Anthropic par modèle ($ par million de tokens)
+    MODEL_PRICING = {
+        'claude-3-5-sonnet-20241022': {'input': 3.00, 'output': 15.00},
+        'claude-3-5-haiku-20241022': {'input': 0.80, 'output': 4.00},
+        'claude-3-haiku-20240307': {'input': 0.25, 'output': 1.25},
+    }
+    DEFAULT_MODEL = 'claude-3-5-sonnet-20241022'
     
-    def __init__(self, metrics_file: str = "metrics/api_costs.json"):
-        """Initialise le tracker de métriques"""
+    def __init__(self, metrics_file: str = "metrics/api_costs.json", pricing: Optional[Dict] = None):
+        """
+        Initialise le tracker de métriques
+        
+        Args:
+            metrics_file: Fichier d'historique des métriques
+            pricing: Surcharges de prix {modèle: {'input': $, 'output': $}} par million de tokens
+        """
         self.metrics_file = Path(metrics_file)
         self.metrics_file.parent.mkdir(exist_ok=True)
         
+        self.pricing = dict(self.MODEL_PRICING)
+        self.pricing.update(pricing or {})
+        
+        # Compteurs mis à jour depuis plusieurs workers (pipeline en flux)
+        self._lock = threading.RLock()
+        
         self.current_session = {
             'start_time': datetime.now().isoformat(),
             'anthropic_calls': 0,
             'anthropic_input_tokens': 0,
             'anthropic_output_tokens': 0,
+            'models': {},
+            'model_escalations': {},
+            'scheduler': {
+                'queue_wait_total': 0.0,
+                'queue_wait_max': 0.0,
+                'retries': 0
+            },
             'extraction_method_counts': {
                 'anthropic_ai': 0,
                 'markdown_parser': 0,
                 'substack_parser': 0,
+                'rule_extractor': 0,
+                'feed_parser': 0,
+                'search_enrichment': 0,
                 'firecrawl_direct': 0
             },
+            'recipe_counts': {},
+            'structured_output': {
+                'tool_use_parsed': 0,
+                'salvaged_items': 0,
+                'rerequested_items': 0,
+                'continuation_calls': 0,
+                'parse_failures': 0
+            },
             'sources_scraped': 0,
             'articles_extracted': 0
         }
     
-    def track_anthropic_call(self, input_tokens: int, output_tokens: int, purpose: str = ""):
+    def track_anthropic_call(self, input_tokens: int, output_tokens: int, purpose: str = "",
+                             model: Optional[str] = None, latency: float = 0.0,
+                             queue_wait: float = 0.0, retries: int = 0):
         """
         Track un appel API Anthropic
         
@@ -48,25 +97,129 @@ class APIMetrics:
             input_tokens: Nombre de tokens en input
             output_tokens: Nombre de tokens en output
             purpose: Description de l'appel (extraction, ranking, etc.)
+            model: Modèle utilisé (par défaut: DEFAULT_MODEL)
+            latency: Durée de l'appel en secondes
+            queue_wait: Temps d'attente dans l'ordonnanceur avant admission
+            retries: Nombre de nouveaux essais après erreur transitoire
         """
-        self.current_session['anthropic_calls'] += 1
-        self.current_session['anthropic_input_tokens'] += input_tokens
-        self.current_session['anthropic_output_tokens'] += output_tokens
+        model = model or self.DEFAULT_MODEL
+        
+        with self._lock:
+            self.current_session['anthropic_calls'] += 1
+            self.current_session['anthropic_input_tokens'] += input_tokens
+            self.current_session['anthropic_output_tokens'] += output_tokens
+            
+            stats = self.current_session['models'].setdefault(model, {
+                'calls': 0,
+                'input_tokens': 0,
+                'output_tokens': 0,
+                'latency_total': 0.0
+            })
+            stats['calls'] += 1
+            stats['input_tokens'] += input_tokens
+            stats['output_tokens'] += output_tokens
+            stats['latency_total'] += latency
+            
+            scheduler = self.current_session['scheduler']
+            scheduler['queue_wait_total'] += queue_wait
+            scheduler['queue_wait_max'] = max(scheduler['queue_wait_max'], queue_wait)
+            scheduler['retries'] += retries
         
         if purpose:
-            logger.info(f"📊 Anthropic call: {purpose} | In: {input_tokens} | Out: {output_tokens}")
+            logger.info(f"📊 Anthropic call: {purpose} | {model} | In: {input_tokens} | Out: {output_tokens} | {latency:.1f}s")
+    
+    def track_model_escalation(self, stage: str, from_model: str, to_model: str):
+        """
+        Track une escalade vers un modèle plus puissant
+        
+        Args:
+            stage: Étape concernée (extraction, translation, ranking)
+            from_model: Modèle dont la sortie a échoué à la validation
+            to_model: Modèle utilisé ensuite
+        """
+        with self._lock:
+            escalations = self.current_session['model_escalations']
+            escalations[stage] = escalations.get(stage, 0) + 1
+        logger.info(f"⬆️  Escalade {stage}: {from_model} → {to_model}")
+    
+    def _model_price(self, model: str) -> Dict[str, float]:
+        """Retourne le prix d'un modèle (prix du modèle par défaut si inconnu)"""
+        if model not in self.pricing:
+            logger.warning(f"⚠️  Prix inconnu pour {model}, utilisation du prix {self.DEFAULT_MODEL}")
+            return self.pricing[self.DEFAULT_MODEL]
+        return self.pricing[model]
     
-    def track_extraction_method(self, method: str, articles_count: int = 1):
+    def track_extraction_method(self, method: str, articles_count: int = 1, recipe: str = None):
         """
         Track la méthode d'extraction utilisée
         
         Args:
-            method: anthropic_ai, markdown_parser, substack_parser, firecrawl_direct
+            method: anthropic_ai, markdown_parser, substack_parser, rule_extractor, feed_parser,
+                    search_enrichment, firecrawl_direct
             articles_count: Nombre d'articles extraits
+            recipe: Nom de la recette (méthode rule_extractor)
+        """
+        with self._lock:
+            if method in self.current_session['extraction_method_counts']:
+                self.current_session['extraction_method_counts'][method] += articles_count
+                self.current_session['articles_extracted'] += articles_count
+            
+            if recipe:
+                recipes = self.current_session['recipe_counts']
+                recipes[recipe] = recipes.get(recipe, 0) + articles_count
+    
+    def track_structured_output(self, event: str, count: int = 1):
+        """
+        Track le parsing des sorties structurées (tool-use / JSON tolérant)
+        
+        Args:
+            event: tool_use_parsed, salvaged_items, rerequested_items,
+                   continuation_calls, parse_failures
+            count: Incrément à appliquer
         """
-        if method in self.current_session['extraction_method_counts']:
-            self.current_session['extraction_method_counts'][method] += articles_count
-            self.current_session['articles_extracted'] += articles_count
+        with self._lock:
+            counters = self.current_session['structured_output']
+            if event in counters:
+                counters[event] += count
+    
+    def estimate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """
+        Estime le coût d'un volume de tokens pour un modèle
+        
+        Args:
+            model: Modèle visé
+            input_tokens: Tokens input
+            output_tokens: Tokens output
+            
+        Returns:
+            Coût en dollars
+        """
+        price = self._model_price(model)
+        return (input_tokens / 1_000_000) * price['input'] + (output_tokens / 1_000_000) * price['output']
+    
+    def record_budget(self, report: Dict):
+        """
+        Enregistre le rapport de budget (limites et dégradations appliquées)
+        
+        Args:
+            report: Résultat de RunBudget.report()
+        """
+        self.current_session['budget'] = report
+    
+    def record_pipeline(self, report: Dict):
+        """
+        Enregistre le rapport du pipeline en flux (débit et profondeur des files par étape)
+        
+        Args:
+            report: Résultat de StreamingPipeline.report()
+        """
+        self.current_session['pipeline'] = report
+    
+    def record_peak_rss(self):
+        """Enregistre le pic de mémoire résidente de la génération"""
+        peak = peak_rss_mb()
+        if peak is not None:
+            self.current_session['peak_rss_mb'] = round(peak, 1)
     
     def calculate_costs(self) -> Dict[str, float]:
         """
@@ -75,13 +228,27 @@ class APIMetrics:
         Returns:
             Dict avec détail des coûts
         """
-        input_cost = (self.current_session['anthropic_input_tokens'] / 1_000_000) * self.ANTHROPIC_COST_PER_M_INPUT
-        output_cost = (self.current_session['anthropic_output_tokens'] / 1_000_000) * self.ANTHROPIC_COST_PER_M_OUTPUT
+        input_cost = 0.0
+        output_cost = 0.0
+        by_model = {}
+        
+        for model, stats in self.current_session['models'].items():
+            price = self._model_price(model)
+            model_input_cost = (stats['input_tokens'] / 1_000_000) * price['input']
+            model_output_cost = (stats['output_tokens'] / 1_000_000) * price['output']
+            input_cost += model_input_cost
+            output_cost += model_output_cost
+            by_model[model] = {
+                'calls': stats['calls'],
+                'cost': model_input_cost + model_output_cost,
+                'avg_latency': stats['latency_total'] / stats['calls'] if stats['calls'] else 0.0
+            }
         
         return {
             'input_cost': input_cost,
             'output_cost': output_cost,
             'total_cost': input_cost + output_cost,
+            'by_model': by_model,
             'input_tokens': self.current_session['anthropic_input_tokens'],
             'output_tokens': self.current_session['anthropic_output_tokens'],
             'total_tokens': self.current_session['anthropic_input_tokens'] + self.current_session['anthropic_output_tokens']
@@ -96,11 +263,14 @@ class APIMetrics:
         """
         total_articles = self.current_session['articles_extracted']
         if total_articles == 0:
-            return {'optimization_rate': 0, 'ai_free_count': 0}
+            return {'optimization_rate': 0, 'ai_free_count': 0, 'ai_required_count': 0}
         
         ai_free_count = (
             self.current_session['extraction_method_counts']['markdown_parser'] +
             self.current_session['extraction_method_counts']['substack_parser'] +
+            self.current_session['extraction_method_counts']['rule_extractor'] +
+            self.current_session['extraction_method_counts']['feed_parser'] +
+            self.current_session['extraction_method_counts']['search_enrichment'] +
             self.current_session['extraction_method_counts']['firecrawl_direct']
         )
         
@@ -129,6 +299,46 @@ class APIMetrics:
         print(f"   Coût output: ${costs['output_cost']:.4f}")
         print(f"   💵 COÛT TOTAL: ${costs['total_cost']:.4f}")
         
+        if costs['by_model']:
+            print(f"\n🧠 PAR MODÈLE:")
+            for model, stats in costs['by_model'].items():
+                print(f"   {model}: {stats['calls']} appel(s) | ${stats['cost']:.4f} | {stats['avg_latency']:.2f}s/appel")
+        
+        escalations = self.current_session['model_escalations']
+        if escalations:
+            print(f"   Escalades: " + ", ".join(f"{stage}={count}" for stage, count in escalations.items()))
+        
+        scheduler = self.current_session['scheduler']
+        calls = self.current_session['anthropic_calls']
+        avg_wait = scheduler['queue_wait_total'] / calls if calls else 0.0
+        budget = self.current_session.get('budget')
+        if budget:
+            print(f"\n🎚️  BUDGET:")
+            print(f"   Limites: coût={budget['max_cost']} | tokens={budget['max_tokens']} | deadline={budget['deadline']}s")
+            print(f"   Durée: {budget['elapsed']}s")
+            if budget['degradations']:
+                for event in budget['degradations']:
+                    print(f"   ⚠️  {event['degradation']} à {event['at']}s ({event['reason']})")
+            else:
+                print(f"   Aucune dégradation")
+        
+        pipeline = self.current_session.get('pipeline')
+        if pipeline:
+            print(f"\n🔀 PIPELINE EN FLUX ({pipeline['elapsed']}s):")
+            for name, stage in pipeline['stages'].items():
+                print(
+                    f"   {name}: {stage['items_in']} → {stage['items_out']} | {stage['workers']} worker(s) | "
+                    f"{stage['throughput']:.2f}/s | file moy. {stage['queue_depth_avg']:.1f}, max {stage['queue_depth_max']}"
+                    + (f" | {stage['errors']} erreur(s)" if stage['errors'] else "")
+                )
+        
+        if self.current_session.get('peak_rss_mb') is not None:
+            print(f"\n🧠 MÉMOIRE: pic RSS {self.current_session['peak_rss_mb']} Mo")
+        
+        print(f"\n⏳ ORDONNANCEUR:")
+        print(f"   Attente en file: {scheduler['queue_wait_total']:.1f}s (moy. {avg_wait:.2f}s, max {scheduler['queue_wait_max']:.2f}s)")
+        print(f"   Nouveaux essais: {scheduler['retries']}")
+        
         print(f"\n🚀 OPTIMISATION:")
         print(f"   Articles extraits: {self.current_session['articles_extracted']}")
         print(f"   Sans IA: {opt_stats['ai_free_count']} ({opt_stats['optimization_rate']:.1f}%)")
@@ -137,6 +347,16 @@ class APIMetrics:
         print(f"\n📈 MÉTHODES D'EXTRACTION:")
         for method, count in self.current_session['extraction_method_counts'].items():
             print(f"   {method}: {count}")
+        for recipe, count in self.current_session['recipe_counts'].items():
+            print(f"      recette {recipe}: {count}")
+        
+        structured = self.current_session['structured_output']
+        print(f"\n🧩 SORTIES STRUCTURÉES:")
+        print(f"   Réponses tool-use valides: {structured['tool_use_parsed']}")
+        print(f"   Objets récupérés (réponses tronquées): {structured['salvaged_items']}")
+        print(f"   Objets re-demandés (suite): {structured['rerequested_items']}")
+        print(f"   Appels de continuation: {structured['continuation_calls']}")
+        print(f"   Échecs de parsing: {structured['parse_failures']}")
         
         print("\n" + "="*70)
     
@@ -167,8 +387,8 @@ def main():
     metrics = APIMetrics()
     
     # Simuler des appels
-    metrics.track_anthropic_call(1500, 800, "Extraction articles")
-    metrics.track_anthropic_call(2000, 1200, "Ranking")
+    metrics.track_anthropic_call(1500, 800, "Extraction articles", model='claude-3-5-haiku-20241022', latency=2.1)
+    metrics.track_anthropic_call(2000, 1200, "Ranking", latency=6.4)
     
     metrics.track_extraction_method('markdown_parser', 15)
     metrics.track_extraction_method('anthropic_ai', 10)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Article Index - Historique des articles publiés, toutes éditions confondues (SQLite + FTS5)
+Alimenté après chaque génération; écarte avant classement les URLs et titres déjà
+publiés (recherche par index) et permet de retrouver la couverture passée d'un sujet
+
+Usage:
+    python scripts/article_index.py search "pricing IA"
+    python scripts/article_index.py search "PLG" --edition plg-digest --limit 10
+    python scripts/article_index.py stats
+"""
+
+import os
+import re
+import sys
+import sqlite3
+import logging
+import threading
+import unicodedata
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.tavily_searcher import normalize_url
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = 'metrics/article_index.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    edition TEXT NOT NULL,
+    issue TEXT NOT NULL,
+    url TEXT,
+    url_key TEXT,
+    title TEXT,
+    title_key TEXT,
+    summary TEXT,
+    source TEXT,
+    category TEXT,
+    rank INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_articles_url_key ON articles(url_key);
+CREATE INDEX IF NOT EXISTS idx_articles_title_key ON articles(title_key);
+CREATE INDEX IF NOT EXISTS idx_articles_issue ON articles(edition, issue);
+"""
+
+# Index plein texte synchronisé par triggers (table de contenu externe)
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, source, content='articles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, summary, source) VALUES (new.id, new.title, new.summary, new.source);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, source)
+    VALUES ('delete', old.id, old.title, old.summary, old.source);
+END;
+"""
+
+# Taille des lots de clés par requête IN (limite de variables SQLite)
+LOOKUP_BATCH = 500
+
+
+def title_key(title: str) -> str:
+    """Titre comparable: sans accents, casse, ponctuation ni '...' de troncature"""
+    text = unicodedata.normalize('NFKD', title or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return ' '.join(re.findall(r'\w+', text.replace('...', ' ')))
+
+
+def issue_date() -> str:
+    """Numéro de l'édition du jour (même date que le fichier HTML généré)"""
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+class ArticleIndex:
+    """Index persistant des articles publiés (une ligne par article et par numéro)"""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Ouvre (ou crée) l'index
+
+        Args:
+            path: Fichier SQLite
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Connexion partagée entre les éditions générées en parallèle (sérialisée par le verrou)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            try:
+                self._conn.executescript(FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError as e:
+                # SQLite compilé sans FTS5: recherche par LIKE
+                logger.warning(f"⚠️  FTS5 indisponible ({e}), recherche plein texte dégradée")
+                self.fts = False
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional['ArticleIndex']:
+        """Index configuré (section article_index), None si désactivé"""
+        config = config or {}
+        if not config.get('enabled', True):
+            return None
+        return cls(config.get('path', DEFAULT_PATH))
+
+    def record_issue(self, edition: str, articles: Iterable[Dict], issue: Optional[str] = None) -> int:
+        """
+        Enregistre les articles publiés d'un numéro (remplace une génération du même jour)
+
+        Args:
+            edition: Nom de l'édition
+            articles: Articles classés publiés (dicts ou ArticleRecord)
+            issue: Date du numéro (défaut: aujourd'hui)
+
+        Returns:
+            Nombre d'articles enregistrés
+        """
+        issue = issue or issue_date()
+        rows = [
+            (
+                edition, issue, article.get('url'),
+                normalize_url(article['url']) if article.get('url') else None,
+                article.get('title'), title_key(article.get('title')) or None,
+                article.get('summary'), article.get('source'), article.get('category'), article.get('rank')
+            )
+            for article in articles
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM articles WHERE edition = ? AND issue = ?", (edition, issue))
+            self._conn.executemany(
+                "INSERT INTO articles (edition, issue, url, url_key, title, title_key, summary, source, category, rank) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        logger.info(f"🗂️  {len(rows)} article(s) ajouté(s) à l'historique ({edition} {issue})")
+        return len(rows)
+
+    def _published_keys(self, column: str, keys: List[str], edition: Optional[str], issue: str) -> set:
+        """Clés publiées dans un numéro antérieur (recherche par index, par lots)"""
+        found = set()
+        for start in range(0, len(keys), LOOKUP_BATCH):
+            batch = keys[start:start + LOOKUP_BATCH]
+            query = (
+                f"SELECT DISTINCT {column} FROM articles WHERE {column} IN ({','.join('?' * len(batch))}) "
+                "AND issue < ?"
+            )
+            params = batch + [issue]
+            if edition:
+                query += " AND edition = ?"
+                params.append(edition)
+            with self._lock:
+                found.update(row[0] for row in self._conn.execute(query, params))
+        return found
+
+    def filter_published(self, articles: List[Dict], edition: Optional[str] = None,
+                         issue: Optional[str] = None) -> List[Dict]:
+        """
+        Écarte les articles déjà publiés (même URL normalisée ou titre quasi identique)
+
+        Args:
+            articles: Articles candidats au classement
+            edition: Historique de cette édition seulement (toutes les éditions si None)
+            issue: Numéro en cours: seuls les numéros antérieurs comptent
+                   (régénération du jour et éditions générées en parallèle)
+
+        Returns:
+            Articles jamais publiés (ordre conservé)
+        """
+        issue = issue or issue_date()
+        url_keys = [normalize_url(a['url']) if a.get('url') else None for a in articles]
+        title_keys = [title_key(a.get('title')) or None for a in articles]
+
+        published_urls = self._published_keys('url_key', sorted({k for k in url_keys if k}), edition, issue)
+        published_titles = self._published_keys('title_key', sorted({k for k in title_keys if k}), edition, issue)
+
+        kept = [
+            article for article, url, title in zip(articles, url_keys, title_keys)
+            if url not in published_urls and title not in published_titles
+        ]
+        if len(kept) < len(articles):
+            logger.info(f"🗂️  {len(articles) - len(kept)} article(s) déjà publié(s) écarté(s) avant classement")
+        return kept
+
+    def search(self, query: str, edition: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """
+        Couverture passée d'un sujet
+
+        Args:
+            query: Mots recherchés (titre, résumé, source)
+            edition: Restreindre à une édition
+            limit: Nombre maximum de résultats
+
+        Returns:
+            Articles publiés, les plus pertinents d'abord (les plus récents sans FTS5)
+        """
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return []
+        edition_filter = " AND a.edition = ?" if edition else ""
+        extra = [edition] if edition else []
+
+        if self.fts:
+            # Chaque terme entre guillemets: pas d'interprétation de la syntaxe FTS5
+            match = ' '.join(f'"{term}"' for term in terms)
+            sql = (
+                "SELECT a.* FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+                f"WHERE articles_fts MATCH ?{edition_filter} ORDER BY bm25(articles_fts), a.issue DESC LIMIT ?"
+            )
+            params = [match] + extra + [limit]
+        else:
+            clauses = ' AND '.join("(a.title LIKE ? OR a.summary LIKE ?)" for _ in terms)
+            sql = f"SELECT a.* FROM articles a WHERE {clauses}{edition_filter} ORDER BY a.issue DESC LIMIT ?"
+            params = [value for term in terms for value in (f"%{term}%", f"%{term}%")] + extra + [limit]
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def stats(self) -> List[Dict]:
+        """Nombre de numéros et d'articles par édition"""
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(
+                "SELECT edition, COUNT(DISTINCT issue) AS issues, COUNT(*) AS articles, "
+                "MIN(issue) AS first_issue, MAX(issue) AS last_issue FROM articles GROUP BY edition ORDER BY edition"
+            )]
+
+    def close(self):
+        """Ferme la connexion"""
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    """Recherche dans l'historique des articles publiés"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Historique des articles publiés')
+    parser.add_argument('--db', default=DEFAULT_PATH, help='Fichier SQLite de l\'index')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    search_parser = subparsers.add_parser('search', help='Couverture passée d\'un sujet')
+    search_parser.add_argument('query', help='Mots recherchés')
+    search_parser.add_argument('--edition', default=None, help='Restreindre à une édition')
+    search_parser.add_argument('--limit', type=int, default=20, help='Nombre maximum de résultats')
+    subparsers.add_parser('stats', help='Numéros et articles par édition')
+    args = parser.parse_args()
+
+    index = ArticleIndex(args.db)
+    if args.command == 'search':
+        results = index.search(args.query, edition=args.edition, limit=args.limit)
+        print(f"\n🔎 {len(results)} article(s) publié(s) pour \"{args.query}\"")
+        for article in results:
+            print(f"   {article['issue']} [{article['edition']}] #{article['rank']} {article['title']}")
+            print(f"      {article['source']} - {article['url']}")
+    else:
+        for row in index.stats():
+            print(f"📚 {row['edition']}: {row['issues']} numéro(s), {row['articles']} article(s) "
+                  f"({row['first_issue']} → {row['last_issue']})")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
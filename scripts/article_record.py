@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Article Record - Représentation compacte d'un article (__slots__)
+Utilisée en mode mémoire bornée entre la traduction et le classement;
+se lit comme un dict (article['title'], article.get(...), dict(article))
+"""
+
+import logging
+from typing import Any, Dict, Iterator, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Champ absent (distinct d'une valeur None)
+_MISSING = object()
+
+
+class ArticleRecord:
+    """Article sans dictionnaire par instance; les champs rares vont dans `extra`"""
+
+    FIELDS = (
+        'title', 'summary', 'url', 'category', 'source', 'email_date',
+        'extraction_method', 'rank', 'ranking_reason'
+    )
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, **fields):
+        self.extra = None
+        for name in self.FIELDS:
+            setattr(self, name, _MISSING)
+        for name, value in fields.items():
+            self[name] = value
+
+    @classmethod
+    def from_dict(cls, article: Dict) -> 'ArticleRecord':
+        """Convertit un article dict"""
+        return cls(**article)
+
+    def _names(self) -> Iterator[str]:
+        """Champs définis, dans l'ordre"""
+        for name in self.FIELDS:
+            if getattr(self, name) is not _MISSING:
+                yield name
+        if self.extra:
+            yield from self.extra
+
+    def keys(self):
+        return list(self._names())
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not _MISSING:
+                return value
+        elif self.extra and name in self.extra:
+            return self.extra[name]
+        raise KeyError(name)
+
+    def __setitem__(self, name: str, value: Any):
+        if name in self.FIELDS:
+            setattr(self, name, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[name] = value
+
+    def __contains__(self, name: str) -> bool:
+        try:
+            self[name]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, name: str, default: Optional[Any] = None) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict:
+        """Article dict (sorties JSON, HTML)"""
+        return {name: self[name] for name in self._names()}
+
+    def copy(self) -> Dict:
+        """Copie sous forme de dict (comme dict.copy pour le classement)"""
+        return self.to_dict()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ArticleRecord, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord({self.to_dict()!r})"
+
+
+def main():
+    """Comparaison de taille dict / ArticleRecord"""
+    import sys
+
+    article = {
+        'title': 'Tarification des produits IA', 'summary': 'Comment les éditeurs facturent...',
+        'url': 'https://www.growthunhinged.com/p/pricing', 'category': 'important',
+        'source': 'Kyle Poyar', 'email_date': '2025-10-20', 'extraction_method': 'feed_parser'
+    }
+    record = ArticleRecord.from_dict(article)
+    print(f"\n✅ dict: {sys.getsizeof(article)} octets | ArticleRecord: {sys.getsizeof(record)} octets")
+    print(f"   {record['title']} | {record.get('rank', '-')} | {dict(record) == article}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark du découpage markdown - Vérifie le passage à l'échelle linéaire
+Compare le splitter par titres à l'ancienne regex DOTALL sur des documents de plusieurs Mo
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.markdown_parser import MarkdownParser
+
+# Ancienne implémentation (regex paresseuse + lookahead sur tout le document)
+LEGACY_PATTERN = r'#####\s+(.+?)\n\n_Insight from.+?\n\n(.+?)(?=\n\n#####|\n\n##|\Z)'
+
+ARTICLE_TEMPLATE = """##### Growth tactic number {i} for subscription businesses
+
+_Insight from Company {i}._
+
+Most content on ecommerce email marketing focuses on DTC: retention, maximizing lifetime value.
+See the [full breakdown](https://www.example.com/articles/{i}?utm_source=newsletter&utm_medium=email).
+
+But what should you do if you're a store selling $1,000+ products? {filler}
+
+"""
+
+
+# Titres sans marqueur "_Insight from": cas pathologique pour la regex legacy
+UNMARKED_TEMPLATE = """##### Section {i}
+
+{filler}
+
+"""
+
+
+def build_document(size_bytes: int, template: str = ARTICLE_TEMPLATE) -> str:
+    """Génère un document markdown d'environ `size_bytes` octets"""
+    parts = []
+    total = 0
+    i = 0
+    while total < size_bytes:
+        part = template.format(i=i, filler="Lorem ipsum dolor sit amet. " * 10)
+        parts.append(part)
+        total += len(part)
+        i += 1
+    return ''.join(parts)
+
+
+def time_it(fn, *args) -> float:
+    """Durée d'exécution (meilleur de 3)"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Benchmark sur 1, 2, 4 et 8 Mo, puis cas pathologique sans marqueur"""
+    logging.disable(logging.INFO)
+    parser = MarkdownParser()
+
+    print(f"{'Taille':>8} | {'Articles':>8} | {'Splitter':>10} | {'µs/Ko':>7} | {'Regex legacy':>12}")
+    print("-" * 60)
+    for megabytes in (1, 2, 4, 8):
+        document = build_document(megabytes * 1024 * 1024)
+        articles = parser.extract_articles_from_markdown(document, "Bench")
+        splitter = time_it(parser.extract_articles_from_markdown, document, "Bench")
+        legacy = time_it(re.findall, LEGACY_PATTERN, document, re.DOTALL)
+        per_kb = splitter * 1e6 / (len(document) / 1024)
+        print(f"{megabytes:>6}Mo | {len(articles):>8} | {splitter:>9.3f}s | {per_kb:>7.1f} | {legacy:>11.3f}s")
+
+    # Sans marqueur, la regex legacy retente .+? jusqu'à la fin du document pour chaque titre
+    print(f"\nTitres sans marqueur (regex legacy quadratique):")
+    print(f"{'Taille':>8} | {'Splitter':>10} | {'Regex legacy':>12}")
+    print("-" * 38)
+    for kilobytes in (32, 64, 128):
+        document = build_document(kilobytes * 1024, UNMARKED_TEMPLATE)
+        splitter = time_it(parser.extract_articles_from_markdown, document, "Bench")
+        legacy = time_it(re.findall, LEGACY_PATTERN, document, re.DOTALL)
+        print(f"{kilobytes:>6}Ko | {splitter:>9.4f}s | {legacy:>11.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Cassette - Enregistrement/rejeu des appels réseau (Anthropic, Gmail, Firecrawl)
+Permet de rejouer une génération de production hors ligne, de façon déterministe,
+avec latence et taux d'erreur injectables pour les benchmarks
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Any, Callable, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class CassetteMiss(LookupError):
+    """Aucune interaction enregistrée ne correspond à la requête rejouée"""
+
+
+class InjectedError(Exception):
+    """Erreur transitoire injectée en mode rejeu (simule une surcharge API)"""
+
+    status_code = 529
+
+
+def _request_key(service: str, operation: str, request: Dict) -> str:
+    """Clé stable d'une requête (hash du JSON canonique)"""
+    canonical = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{service}:{operation}:{canonical}".encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    """Magasin d'interactions requête/réponse enregistrées"""
+
+    MODES = ('off', 'record', 'replay')
+
+    def __init__(self, mode: str = 'off', path: str = 'cassettes/default',
+                 latency: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 0, strict: bool = False):
+        """
+        Initialise la cassette
+
+        Args:
+            mode: off (appels réels), record (réels + enregistrement) ou replay
+            path: Dossier de la cassette
+            latency: Latence injectée par appel rejoué (secondes)
+            error_rate: Probabilité d'erreur transitoire injectée par appel rejoué
+            seed: Graine du générateur aléatoire (rejeu déterministe)
+            strict: En rejeu, exiger une correspondance exacte de la requête
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Mode cassette inconnu: {mode} (attendu: {', '.join(self.MODES)})")
+
+        self.mode = mode
+        self.path = Path(path)
+        self.file = self.path / 'interactions.jsonl'
+        self.latency = latency
+        self.error_rate = error_rate
+        self.strict = strict
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._by_key = defaultdict(deque)
+        self._by_operation = defaultdict(deque)
+        self._consumed = set()
+        self.stats = {'recorded': 0, 'replayed': 0, 'fuzzy_matches': 0, 'injected_errors': 0}
+
+        if mode == 'record':
+            self.path.mkdir(parents=True, exist_ok=True)
+            logger.info(f"📼 Cassette en enregistrement: {self.file}")
+        elif mode == 'replay':
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> 'Cassette':
+        """Construit la cassette depuis les variables CASSETTE_*"""
+        return cls(
+            mode=os.getenv('CASSETTE_MODE', 'off'),
+            path=os.getenv('CASSETTE_DIR', 'cassettes/default'),
+            latency=float(os.getenv('CASSETTE_LATENCY', '0')),
+            error_rate=float(os.getenv('CASSETTE_ERROR_RATE', '0')),
+            seed=int(os.getenv('CASSETTE_SEED', '0')),
+            strict=os.getenv('CASSETTE_STRICT', 'false').lower() == 'true'
+        )
+
+    @property
+    def replaying(self) -> bool:
+        """True en mode rejeu"""
+        return self.mode == 'replay'
+
+    def _load(self):
+        """Charge les interactions enregistrées"""
+        if not self.file.exists():
+            raise FileNotFoundError(f"Cassette introuvable: {self.file}")
+
+        with open(self.file, 'r', encoding='utf-8') as f:
+            for index, line in enumerate(f):
+                if not line.strip():
+                    continue
+                interaction = json.loads(line)
+                interaction['index'] = index
+                self._by_key[interaction['key']].append(interaction)
+                self._by_operation[(interaction['service'], interaction['operation'])].append(interaction)
+
+        total = sum(len(items) for items in self._by_key.values())
+        logger.info(f"📼 Cassette chargée: {total} interaction(s) depuis {self.file}")
+
+    def _next(self, queue: deque) -> Optional[Dict]:
+        """Retourne la prochaine interaction non consommée d'une file"""
+        while queue:
+            interaction = queue.popleft()
+            if interaction['index'] not in self._consumed:
+                self._consumed.add(interaction['index'])
+                return interaction
+        return None
+
+    def _replay(self, service: str, operation: str, key: str) -> Any:
+        """Retourne la réponse enregistrée correspondant à une requête"""
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.stats['injected_errors'] += 1
+                raise InjectedError(f"Erreur injectée ({service}.{operation})")
+
+            interaction = self._next(self._by_key.get(key, deque()))
+            if interaction is None and not self.strict:
+                # Requête différente (ex: date dans la requête Gmail): rejeu dans l'ordre d'enregistrement
+                interaction = self._next(self._by_operation.get((service, operation), deque()))
+                if interaction is not None:
+                    self.stats['fuzzy_matches'] += 1
+            if interaction is None:
+                raise CassetteMiss(f"Aucune interaction enregistrée pour {service}.{operation}")
+
+            self.stats['replayed'] += 1
+            return interaction['response']
+
+    def _record(self, service: str, operation: str, key: str, request: Dict, response: Any):
+        """Ajoute une interaction à la cassette"""
+        line = json.dumps({
+            'service': service,
+            'operation': operation,
+            'key': key,
+            'request': request,
+            'response': response,
+            'recorded_at': datetime.now().isoformat()
+        }, ensure_ascii=False, default=str)
+
+        with self._lock:
+            with open(self.file, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+            self.stats['recorded'] += 1
+
+    def call(self, service: str, operation: str, request: Dict, fn: Callable[[], Any],
+             serialize: Callable[[Any], Any] = lambda value: value,
+             deserialize: Callable[[Any], Any] = lambda value: value) -> Any:
+        """
+        Exécute (ou rejoue) un appel réseau
+
+        Args:
+            service: anthropic, gmail, firecrawl...
+            operation: Nom de l'opération (ex: messages.create)
+            request: Paramètres de la requête (clé de correspondance)
+            fn: Appel réel
+            serialize: Conversion de la réponse réelle en JSON
+            deserialize: Conversion du JSON enregistré en réponse
+
+        Returns:
+            Réponse réelle ou rejouée
+        """
+        if self.mode == 'off':
+            return fn()
+
+        key = _request_key(service, operation, request)
+
+        if self.mode == 'replay':
+            return deserialize(self._replay(service, operation, key))
+
+        result = fn()
+        self._record(service, operation, key, request, serialize(result))
+        return result
+
+    def wrap_anthropic(self, client) -> Any:
+        """
+        Enveloppe un client Anthropic (client peut être None en rejeu)
+
+        Args:
+            client: Client Anthropic réel
+
+        Returns:
+            Objet exposant messages.create
+        """
+        if self.mode == 'off':
+            return client
+        return _CassetteAnthropic(self, client)
+
+
+def _dump_message(message) -> Dict:
+    """Sérialise une réponse Anthropic"""
+    if hasattr(message, 'model_dump'):
+        return message.model_dump(mode='json')
+    return message
+
+
+def _load_message(data: Dict) -> SimpleNamespace:
+    """Reconstruit une réponse Anthropic avec accès par attributs"""
+    content = []
+    for block in data.get('content', []):
+        # `input` reste un dict, comme dans le SDK
+        content.append(SimpleNamespace(**block))
+    usage = data.get('usage', {}) or {}
+    return SimpleNamespace(
+        id=data.get('id'),
+        model=data.get('model'),
+        role=data.get('role', 'assistant'),
+        stop_reason=data.get('stop_reason'),
+        content=content,
+        usage=SimpleNamespace(
+            input_tokens=usage.get('input_tokens', 0),
+            output_tokens=usage.get('output_tokens', 0)
+        )
+    )
+
+
+class _CassetteAnthropic:
+    """Client Anthropic enregistré/rejoué (sous-ensemble messages.create)"""
+
+    def __init__(self, cassette: Cassette, client):
+        self.messages = SimpleNamespace(
+            create=lambda **kwargs: cassette.call(
+                'anthropic',
+                'messages.create',
+                kwargs,
+                lambda: client.messages.create(**kwargs),
+                serialize=_dump_message,
+                deserialize=_load_message
+            )
+        )
+
+
+_shared_cassette = None
+_shared_lock = threading.Lock()
+
+
+def get_cassette() -> Cassette:
+    """Retourne la cassette partagée du processus (configurée par l'environnement)"""
+    global _shared_cassette
+    with _shared_lock:
+        if _shared_cassette is None:
+            _shared_cassette = Cassette.from_env()
+        return _shared_cassette
+
+
+def set_cassette(cassette: Cassette):
+    """Remplace la cassette partagée (CLI, benchmarks)"""
+    global _shared_cassette
+    with _shared_lock:
+        _shared_cassette = cassette
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Content Classifier - Détecte une seule fois le format d'un contenu
+Produit un descripteur typé (format + confiance) mis en cache sur l'email,
+utilisé pour choisir l'extracteur sans rescanner le contenu
+"""
+
+import re
+import logging
+from typing import Dict, List, Optional, NamedTuple
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# Formats reconnus
+MARKDOWN_HEADINGS = 'markdown-headings'
+SUBSTACK_HTML = 'substack-html'
+PLAIN_DIGEST = 'plain-digest'
+UNKNOWN = 'unknown'
+
+KINDS = (MARKDOWN_HEADINGS, SUBSTACK_HTML, PLAIN_DIGEST, UNKNOWN)
+
+# Formats extractibles sans IA par un parser générique
+AI_FREE_KINDS = (MARKDOWN_HEADINGS, SUBSTACK_HTML)
+
+# Tous les signaux dans une seule alternance: une passe par document
+SIGNAL_RE = re.compile(
+    r'(?P<heading>^#{4,6}[ \t])'
+    r'|(?P<substack_class>class="[^"]*\bpost-(?:preview-)?title\b)'
+    r'|(?P<link_ref>^\[\d+\][ \t]+https?://)'
+    r'|(?P<read_time>\(\d+ minutes? read\))',
+    re.MULTILINE | re.IGNORECASE
+)
+
+# Clé du descripteur mis en cache sur l'enregistrement email
+CACHE_KEY = 'content_class'
+
+
+class ContentDescriptor(NamedTuple):
+    """Format détecté d'un contenu"""
+    kind: str
+    confidence: float
+    signals: Dict[str, int]
+
+    @property
+    def ai_free(self) -> bool:
+        """True si un parser sans IA correspond à ce format"""
+        return self.kind in AI_FREE_KINDS
+
+
+def _count_signals(text: str, signals: Dict[str, int]):
+    """Compte les signaux de format d'un texte (une passe)"""
+    for match in SIGNAL_RE.finditer(text):
+        signals[match.lastgroup] = signals.get(match.lastgroup, 0) + 1
+
+
+def _scores(signals: Dict[str, int], source_name: str = '') -> Dict[str, float]:
+    """Score de chaque format d'après les signaux comptés"""
+    headings = signals.get('heading', 0)
+    substack_classes = signals.get('substack_class', 0)
+    digest_markers = signals.get('link_ref', 0) + signals.get('read_time', 0)
+
+    scores = {
+        MARKDOWN_HEADINGS: min(1.0, 0.6 + 0.1 * headings) if headings else 0.0,
+        SUBSTACK_HTML: min(1.0, 0.7 + 0.05 * substack_classes) if substack_classes else 0.0,
+        PLAIN_DIGEST: min(1.0, 0.5 + 0.1 * digest_markers) if digest_markers >= 2 else 0.0,
+    }
+    # Source Substack sans marqueur HTML: tentative à faible confiance
+    if not scores[SUBSTACK_HTML] and 'substack' in (source_name or '').lower():
+        scores[SUBSTACK_HTML] = 0.5
+    return scores
+
+
+def _ranked(scores: Dict[str, float]) -> List[str]:
+    """Formats de score non nul, du plus probable au moins probable (égalité: ordre de KINDS)"""
+    kinds = [kind for kind, score in scores.items() if score]
+    return sorted(kinds, key=lambda name: (-scores[name], KINDS.index(name)))
+
+
+def ranked_kinds(descriptor: ContentDescriptor, source_name: str = '') -> List[str]:
+    """
+    Formats candidats d'un contenu, dans l'ordre où tenter leurs extracteurs
+
+    Args:
+        descriptor: Descripteur (signaux comptés, éventuellement lu du cache)
+        source_name: Nom de la source (indice Substack)
+
+    Returns:
+        Formats de score non nul, le plus probable d'abord
+    """
+    return _ranked(_scores(descriptor.signals, source_name))
+
+
+def classify_content(content: str, source_name: str = '', html: Optional[str] = None) -> ContentDescriptor:
+    """
+    Classe un contenu d'après ses signaux de format
+
+    Args:
+        content: Contenu texte/markdown de l'email ou de la page
+        source_name: Nom de la source (indice Substack)
+        html: HTML brut de l'email si disponible
+
+    Returns:
+        ContentDescriptor (format, confiance, signaux comptés)
+    """
+    signals = {}
+    _count_signals(content or '', signals)
+    if html and html is not content:
+        _count_signals(html, signals)
+
+    scores = _scores(signals, source_name)
+
+    # Égalité: ordre de KINDS (le markdown reste prioritaire)
+    ranked = _ranked(scores)
+    if not ranked:
+        return ContentDescriptor(UNKNOWN, 0.0, signals)
+    return ContentDescriptor(ranked[0], round(scores[ranked[0]], 2), signals)
+
+
+def classify_email(email: Dict, source_name: str = '') -> ContentDescriptor:
+    """
+    Classe un email et met le descripteur en cache sur l'enregistrement
+
+    Args:
+        email: Enregistrement email ({'content', 'html', ...})
+        source_name: Nom de la source
+
+    Returns:
+        ContentDescriptor (lu depuis le cache s'il existe)
+    """
+    cached = email.get(CACHE_KEY)
+    if isinstance(cached, dict) and cached.get('kind') in KINDS:
+        return ContentDescriptor(cached['kind'], cached.get('confidence', 0.0), cached.get('signals', {}))
+
+    descriptor = classify_content(email.get('content', ''), source_name, html=email.get('html'))
+    # Stocké en dict: survit au cache JSON des emails
+    email[CACHE_KEY] = descriptor._asdict()
+    return descriptor
+
+
+def main():
+    """Test du classifieur"""
+    samples = {
+        'Demand Curve': "##### Titre A\n\n_Insight from X._\n\nTexte\n\n##### Titre B\n\nTexte",
+        'Lenny (substack)': '<div class="post-preview-title">A</div><div class="post-preview-title">B</div>',
+        'TLDR Marketing': "TITLE (3 minute read) [1]\n\nTexte\n\n[1] https://a.com\n[2] https://b.com",
+        'Autre': "Bonjour, voici les nouvelles de la semaine.",
+    }
+    for source_name, content in samples.items():
+        descriptor = classify_content(content, source_name)
+        print(f"  - {source_name}: {descriptor.kind} ({descriptor.confidence:.2f}) {descriptor.signals}")
+
+
+if __name__ == "__main__":
+    main()
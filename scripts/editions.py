@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Editions - Plusieurs newsletters (sous-ensembles de sources, équilibrage, titre)
+produites à partir d'un même scraping et d'une même extraction
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Édition utilisée sans section `editions` (comportement historique)
+DEFAULT_EDITION = {
+    'name': 'growth-weekly',
+    'title': 'Growth Weekly',
+    'subtitle': 'by Dagorsey & Claude'
+}
+
+
+def load_editions(config: Dict, selected: Optional[Iterable[str]] = None) -> List[Dict]:
+    """
+    Éditions à produire
+
+    Args:
+        config: Configuration complète (sources.yaml)
+        selected: Noms d'éditions demandés (toutes si None)
+
+    Returns:
+        Éditions complétées (title/subtitle par défaut)
+
+    Raises:
+        ValueError: Édition demandée inconnue
+    """
+    editions = [dict(DEFAULT_EDITION, **edition) for edition in config.get('editions') or [DEFAULT_EDITION]]
+
+    if selected:
+        selected = list(selected)
+        known = {edition['name'] for edition in editions}
+        unknown = [name for name in selected if name not in known]
+        if unknown:
+            raise ValueError(f"Édition(s) inconnue(s): {', '.join(unknown)} (disponibles: {', '.join(sorted(known))})")
+        editions = [edition for edition in editions if edition['name'] in selected]
+    return editions
+
+
+def edition_sources(edition: Dict, sources: List[Dict]) -> Set[str]:
+    """
+    Noms des sources d'une édition
+
+    Filtre `sources` de l'édition (toutes les sources si absent):
+        names: sources retenues explicitement
+        priorities: priorités retenues (ex: [high])
+        exclude: sources écartées
+
+    Args:
+        edition: Configuration de l'édition
+        sources: Sources configurées
+
+    Returns:
+        Ensemble des noms de sources
+    """
+    source_filter = edition.get('sources') or {}
+    names = set(source_filter.get('names') or [])
+    priorities = set(source_filter.get('priorities') or [])
+    exclude = set(source_filter.get('exclude') or [])
+
+    selected = set()
+    for source in sources:
+        name = source['name']
+        if name in exclude:
+            continue
+        if names or priorities:
+            if name in names or source.get('priority', 'medium') in priorities:
+                selected.add(name)
+        else:
+            selected.add(name)
+    return selected
+
+
+def sources_union(editions: List[Dict], sources: List[Dict]) -> Set[str]:
+    """Sources à scraper une seule fois pour l'ensemble des éditions"""
+    union = set()
+    for edition in editions:
+        union |= edition_sources(edition, sources)
+    return union
+
+
+def edition_articles(edition: Dict, articles: List[Dict], sources: List[Dict]) -> List[Dict]:
+    """Articles du pool partagé appartenant aux sources de l'édition (ordre conservé)"""
+    names = edition_sources(edition, sources)
+    return [article for article in articles if article['source'] in names]
+
+
+def main():
+    """Test de la sélection des sources par édition"""
+    sources = [
+        {'name': 'Elena Verna', 'priority': 'high'},
+        {'name': 'Kyle Poyar', 'priority': 'high'},
+        {'name': 'Demand Curve', 'priority': 'medium'},
+    ]
+    config = {'editions': [
+        {'name': 'growth-weekly'},
+        {'name': 'plg-digest', 'title': 'PLG Digest', 'sources': {'priorities': ['high'], 'exclude': ['Kyle Poyar']}},
+    ]}
+    for edition in load_editions(config):
+        print(f"✅ {edition['name']} ({edition['title']}): {sorted(edition_sources(edition, sources))}")
+
+
+if __name__ == "__main__":
+    main()
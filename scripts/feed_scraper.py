@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Feed Scraper - Sources RSS/Atom (récupération de premier niveau, SANS IA)
+Les flux donnent déjà titre, lien, date et résumé: les articles sont émis
+pré-structurés et ne passent jamais par l'extraction IA
+"""
+
+import os
+import re
+import html
+import logging
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional, Iterable, Tuple
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+import requests
+
+from scripts.fetch_pool import FetchPool
+from scripts.http_cache import HTTPCache, HIT, REVALIDATE, MISS
+from scripts.run_journal import _digest
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Nombre d'entrées consécutives hors période avant d'arrêter la lecture du flux
+STOP_AFTER_OLD_ITEMS = 3
+CHUNK_SIZE = 16384
+
+
+def _local(tag: str) -> str:
+    """Nom d'élément sans espace de noms"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _clean(text: Optional[str]) -> str:
+    """Texte brut d'un fragment HTML de flux"""
+    if not text:
+        return ''
+    return WHITESPACE_RE.sub(' ', html.unescape(TAG_RE.sub(' ', text))).strip()
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Date RFC 822 (RSS) ou ISO 8601 (Atom), en UTC"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _item_fields(elem) -> Dict:
+    """Champs d'un <item> RSS ou <entry> Atom"""
+    fields = {'title': '', 'url': None, 'summary': '', 'published': None}
+    for child in elem:
+        name = _local(child.tag)
+        if name == 'title':
+            fields['title'] = _clean(child.text)
+        elif name == 'link':
+            # RSS: texte; Atom: attribut href (rel="alternate" par défaut)
+            href = child.get('href')
+            if href and child.get('rel', 'alternate') == 'alternate':
+                fields['url'] = href
+            elif child.text and child.text.strip():
+                fields['url'] = child.text.strip()
+        elif name in ('description', 'summary') and not fields['summary']:
+            fields['summary'] = _clean(child.text)
+        elif name in ('pubDate', 'published', 'updated', 'date') and not fields['published']:
+            fields['published'] = _parse_date(child.text)
+    return fields
+
+
+def parse_feed(chunks: Iterable[bytes], since: Optional[datetime] = None) -> Tuple[str, List[Dict]]:
+    """
+    Parse un flux RSS/Atom au fil de l'eau
+
+    Chaque entrée est libérée dès sa lecture; la lecture s'arrête après
+    quelques entrées consécutives antérieures à `since` (flux triés).
+
+    Args:
+        chunks: Morceaux du document (ex: response.iter_content)
+        since: Date minimale des entrées conservées
+
+    Returns:
+        Tuple (titre du flux, entrées {'title', 'url', 'summary', 'published'})
+    """
+    parser = XMLPullParser(events=('end',))
+    feed_title = ''
+    items = []
+    old_in_a_row = 0
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            name = _local(elem.tag)
+            if name == 'title' and not feed_title and not items:
+                # Premier <title> terminé avant toute entrée: titre du flux
+                feed_title = _clean(elem.text)
+            if name not in ('item', 'entry'):
+                continue
+
+            fields = _item_fields(elem)
+            elem.clear()
+
+            if since and fields['published'] and fields['published'] < since:
+                old_in_a_row += 1
+                if old_in_a_row >= STOP_AFTER_OLD_ITEMS:
+                    return feed_title, items
+                continue
+            old_in_a_row = 0
+            if fields['title'] and fields['url']:
+                items.append(fields)
+
+    parser.close()
+    return feed_title, items
+
+
+class FeedScraper:
+    """Récupère les flux RSS/Atom des sources (GET conditionnel, en parallèle)"""
+
+    def __init__(self, pool: Optional[FetchPool] = None, cache: Optional[HTTPCache] = None,
+                 lookback_days: int = 7):
+        """
+        Initialise le scraper de flux
+
+        Args:
+            pool: Pool de récupération partagé (limites de concurrence)
+            cache: Cache HTTP conditionnel (défaut: $CACHE_DIR/feeds)
+            lookback_days: Période par défaut (surchargeable par source)
+        """
+        self.pool = pool or FetchPool()
+        self.cache = cache or HTTPCache(os.path.join(os.getenv('CACHE_DIR', 'cache'), 'feeds'))
+        self.lookback_days = lookback_days
+
+    def _fetch(self, url: str, source_name: str, since: datetime) -> Optional[Dict]:
+        """Flux parsé (depuis le cache si non modifié)"""
+        entry = self.cache.lookup(url)
+        if entry and self.cache.is_fresh(entry):
+            self.cache.count(source_name, HIT)
+            return entry
+
+        response = self.pool.get(url, headers=self.cache.conditional_headers(entry), stream=True)
+        try:
+            if response.status_code == 304 and entry:
+                self.cache.count(source_name, REVALIDATE)
+                self.cache.revalidated(entry, response.headers)
+                return entry
+
+            response.raise_for_status()
+            feed_title, items = parse_feed(response.iter_content(CHUNK_SIZE), since)
+        finally:
+            response.close()
+
+        self.cache.count(source_name, MISS)
+        data = {
+            'title': feed_title,
+            'items': [
+                dict(item, published=item['published'].isoformat() if item['published'] else None)
+                for item in items
+            ]
+        }
+        return self.cache.store(url, response.headers, data) or data
+
+    def scrape_url(self, url: str, source_name: str, lookback_days: Optional[int] = None) -> Optional[Dict]:
+        """
+        Récupère un flux et le convertit en enregistrement pré-structuré
+
+        Args:
+            url: URL du flux
+            source_name: Nom de la source
+            lookback_days: Période à conserver
+
+        Returns:
+            Enregistrement {'content', 'articles', 'content_type': 'feed', ...} ou None
+        """
+        logger.info(f"📡 Flux: {url}")
+        since = datetime.now(timezone.utc) - timedelta(days=lookback_days or self.lookback_days)
+
+        try:
+            feed = self._fetch(url, source_name, since)
+        except (requests.exceptions.RequestException, ParseError) as e:
+            logger.error(f"  ❌ Erreur flux pour {url}: {e}")
+            return None
+
+        articles = []
+        for item in feed.get('items', []):
+            published = _parse_date(item.get('published'))
+            # Filtre appliqué à la lecture: valable aussi pour les entrées en cache
+            if published and published < since:
+                continue
+
+            title = item['title']
+            summary = item['summary']
+            if len(title) > 80:
+                title = title[:77] + '...'
+            if len(summary) > 160:
+                summary = summary[:157] + '...'
+
+            articles.append({
+                'title': title,
+                'summary': summary,
+                'url': item['url'],
+                'category': 'important',
+                'source': source_name,
+                'email_date': published.strftime('%Y-%m-%d') if published else '',
+                'extraction_method': 'feed_parser'
+            })
+
+        if not articles:
+            logger.info(f"  ℹ️  Aucune entrée récente dans le flux de {source_name}")
+            return None
+
+        logger.info(f"  ✅ {len(articles)} article(s) dans le flux de {source_name}")
+        return {
+            'source': source_name,
+            'subject': f"Flux: {feed.get('title') or source_name}",
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'from': url,
+            'content': "\n\n".join(f"{a['title']}\n{a['summary']}\n{a['url']}" for a in articles),
+            'articles': articles,
+            'content_type': 'feed',
+            'message_id': f'feed_{_digest(url)}'
+        }
+
+    def scrape_sources(self, sources: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Récupère en parallèle les flux de plusieurs sources
+
+        Args:
+            sources: Configurations des sources avec feed_url
+
+        Returns:
+            Dictionnaire {nom_source: [enregistrements]}
+        """
+        results = {source['name']: [] for source in sources}
+        jobs = [source for source in sources if source.get('feed_url')]
+
+        records = self.pool.map(
+            jobs,
+            lambda source: self.scrape_url(source['feed_url'], source['name'], source.get('lookback_days')),
+            url_of=lambda source: source['feed_url']
+        )
+        for source, record in zip(jobs, records):
+            if record:
+                results[source['name']].append(record)
+
+        self.cache.log_summary()
+        return results
+
+
+def main():
+    """Test du parser de flux"""
+    sample = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Growth Unhinged</title>
+<item><title>Pricing in the AI era</title><link>https://www.growthunhinged.com/p/pricing</link>
+<pubDate>Mon, 20 Oct 2025 10:00:00 GMT</pubDate><description>&lt;p&gt;How AI products price.&lt;/p&gt;</description></item>
+<item><title>PLG benchmarks</title><link>https://www.growthunhinged.com/p/plg</link>
+<pubDate>Mon, 13 Oct 2025 10:00:00 GMT</pubDate><description>Benchmarks 2025.</description></item>
+</channel></rss>"""
+    title, items = parse_feed([sample[:150], sample[150:]])
+    print(f"\n✅ {title}: {len(items)} entrée(s)")
+    for item in items:
+        print(f"  - {item['title']} ({item['published']:%Y-%m-%d}) -> {item['url']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Fetch Pool - Récupération concurrente des URLs fallback
+Session HTTP keep-alive partagée, limite globale et limite par hôte
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Callable, Any, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
+
+class FetchPool:
+    """Pool de récupération concurrente avec limites globale et par hôte"""
+
+    def __init__(self, max_workers: int = 5, per_host: int = 2, timeout: float = 10.0,
+                 headers: Optional[Dict] = None):
+        """
+        Initialise le pool
+
+        Args:
+            max_workers: Nombre maximum de récupérations simultanées (toutes sources)
+            per_host: Nombre maximum de récupérations simultanées par hôte
+            timeout: Timeout HTTP (secondes)
+            headers: En-têtes HTTP par défaut
+        """
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self.timeout = timeout
+        self.headers = dict(headers or DEFAULT_HEADERS)
+
+        self._global = threading.BoundedSemaphore(self.max_workers)
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._session = None
+
+    @classmethod
+    def from_config(cls, fetch_config: Optional[Dict] = None) -> 'FetchPool':
+        """
+        Construit le pool depuis la section `fallback_fetch` de sources.yaml
+
+        Les variables SCRAPING_MAX_WORKERS / SCRAPING_TIMEOUT servent de valeurs par défaut.
+        """
+        fetch_config = fetch_config or {}
+        return cls(
+            max_workers=int(fetch_config.get('max_workers', os.getenv('SCRAPING_MAX_WORKERS', 5))),
+            per_host=int(fetch_config.get('per_host', 2)),
+            timeout=float(fetch_config.get('timeout', os.getenv('SCRAPING_TIMEOUT', 10)))
+        )
+
+    @property
+    def session(self) -> requests.Session:
+        """Session keep-alive partagée (connexions réutilisées entre URLs d'un même hôte)"""
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Sémaphore de l'hôte d'une URL"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET via la session partagée"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def _run(self, item: Any, fn: Callable[[Any], Any], url_of: Callable[[Any], str]) -> Any:
+        """Exécute fn(item) dans les limites globale et par hôte"""
+        # Hôte d'abord: une tâche en attente de son hôte ne bloque pas un slot global
+        with self._host_slot(url_of(item)), self._global:
+            return fn(item)
+
+    def map(self, items: List[Any], fn: Callable[[Any], Any],
+            url_of: Callable[[Any], str] = lambda item: item) -> List[Any]:
+        """
+        Applique fn à chaque élément en parallèle
+
+        Args:
+            items: URLs (ou tâches) à traiter
+            fn: Fonction de récupération (ne doit pas lever d'exception)
+            url_of: URL d'un élément, pour la limite par hôte
+
+        Returns:
+            Résultats dans l'ordre des éléments
+        """
+        if len(items) <= 1:
+            return [self._run(item, fn, url_of) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(lambda item: self._run(item, fn, url_of), items))
+
+    def close(self):
+        """Ferme la session HTTP"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+def fallback_urls(source: Dict) -> List[str]:
+    """URLs fallback d'une source (fallback_url puis fallback_urls)"""
+    urls = []
+    if source.get('fallback_url'):
+        urls.append(source['fallback_url'])
+    if source.get('fallback_urls'):
+        urls.extend(source['fallback_urls'])
+    return urls
@@ -8,6 +8,11 @@ import os
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime
+from scripts.cassette import get_cassette
+from scripts.fetch_pool import FetchPool, fallback_urls
+from scripts.result_cache import ResultCache
+from scripts.run_journal import _digest
+from warp_mcp_helper import call_mcp
 
 # Configuration du logging
 logging.basicConfig(
@@ -20,10 +25,51 @@ logger = logging.getLogger(__name__)
 class FirecrawlScraper:
     """Scraper utilisant Firecrawl MCP pour un contenu web structuré"""
     
-    def __init__(self):
-        """Initialise le scraper Firecrawl"""
+    # Fraîcheur acceptée (ms): transmise à Firecrawl et utilisée comme TTL local
+    MAX_AGE_MS = 172800000  # 48h
+    
+    def __init__(self, pool: Optional[FetchPool] = None, cache: Optional[ResultCache] = None):
+        """
+        Initialise le scraper Firecrawl
+        
+        Args:
+            pool: Pool de récupération partagé (limites de concurrence globale et par hôte)
+            cache: Cache local des résultats (défaut: $CACHE_DIR/firecrawl)
+        """
+        self.pool = pool or FetchPool()
+        self.cache = cache or ResultCache()
         logger.info("✅ Firecrawl MCP Scraper initialisé")
     
+    def _call_tool(self, tool_name: str, params: Dict, key_params: Dict,
+                   is_valid=lambda result: bool(result)) -> Optional[Dict]:
+        """
+        Appelle un outil Firecrawl via le cache local
+        
+        Args:
+            tool_name: firecrawl_scrape ou firecrawl_search
+            params: Paramètres de l'appel MCP
+            key_params: Paramètres formant la clé du cache
+            is_valid: Seuls les résultats valides sont mis en cache
+            
+        Returns:
+            Résultat de l'outil (frais, en cache ou périmé en cours de rafraîchissement)
+        """
+        def fetch():
+            result = get_cassette().call(
+                'firecrawl',
+                tool_name,
+                params,
+                lambda: call_mcp(tool_name, params)
+            )
+            return result if is_valid(result) else None
+        
+        # En rejeu, la cassette est la seule source de vérité
+        if get_cassette().replaying:
+            return fetch()
+        
+        ttl = params.get('maxAge', self.MAX_AGE_MS) / 1000
+        return self.cache.get_or_fetch(tool_name, key_params, ttl, fetch)
+    
     def scrape_url(self, url: str, source_name: str) -> Optional[Dict]:
         """
         Scrape une URL avec Firecrawl MCP
@@ -38,17 +84,19 @@ class FirecrawlScraper:
         logger.info(f"🔥 Firecrawl scraping: {url}")
         
         try:
-            # Appel MCP Firecrawl activé
-            import sys
-            sys.path.append('/Users/lopato/Documents/DAGORSEY/Geek/test-new-stuff/Revue de presse growth fr')
-            from warp_mcp_helper import call_mcp
-            
-            result = call_mcp("firecrawl_scrape", {
+            # Appel MCP Firecrawl (session persistante partagée)
+            params = {
                 "url": url,
                 "formats": ["markdown"],
                 "onlyMainContent": True,
-                "maxAge": 172800000  # 48h cache pour performance
-            })
+                "maxAge": self.MAX_AGE_MS  # 48h cache pour performance
+            }
+            result = self._call_tool(
+                "firecrawl_scrape",
+                params,
+                key_params={key: params[key] for key in ("url", "formats", "onlyMainContent")},
+                is_valid=lambda result: bool(result) and "markdown" in result
+            )
             
             if result and "markdown" in result:
                 content = result["markdown"]
@@ -63,7 +111,7 @@ class FirecrawlScraper:
                     'from': url,
                     'content': content,
                     'content_type': 'markdown',
-                    'message_id': f'firecrawl_{hash(url)}'
+                    'message_id': f'firecrawl_{_digest(url)}'
                 }
             
             return None
@@ -72,37 +120,48 @@ class FirecrawlScraper:
             logger.error(f"  ❌ Erreur Firecrawl pour {url}: {e}")
             return None
     
-    def scrape_source(self, source: Dict) -> List[Dict]:
+    def scrape_sources(self, sources: List[Dict]) -> Dict[str, List[Dict]]:
         """
-        Scrape les URLs fallback d'une source avec Firecrawl
+        Scrape en parallèle les URLs fallback de plusieurs sources avec Firecrawl
+        
+        Les appels partagent la session MCP persistante (requêtes multiplexées).
         
         Args:
-            source: Configuration de la source
+            sources: Configurations des sources
             
         Returns:
-            Liste des contenus scrapés en markdown structuré
+            Dictionnaire {nom_source: [contenus scrapés en markdown structuré]}
         """
-        results = []
+        results = {source['name']: [] for source in sources}
         
-        # Récupérer les URLs
-        urls = []
-        if 'fallback_url' in source and source['fallback_url']:
-            urls.append(source['fallback_url'])
-        if 'fallback_urls' in source and source['fallback_urls']:
-            urls.extend(source['fallback_urls'])
+        # Toutes les URLs de toutes les sources dans un seul lot concurrent
+        jobs = []
+        for source in sources:
+            urls = fallback_urls(source)
+            if not urls:
+                logger.warning(f"  ⚠️  Aucune URL fallback pour {source['name']}")
+            jobs.extend((url, source['name']) for url in urls)
         
-        if not urls:
-            logger.warning(f"  ⚠️  Aucune URL fallback pour {source['name']}")
-            return results
+        contents = self.pool.map(jobs, lambda job: self.scrape_url(*job), url_of=lambda job: job[0])
         
-        # Scraper chaque URL avec Firecrawl
-        for url in urls:
-            content = self.scrape_url(url, source['name'])
+        for (url, source_name), content in zip(jobs, contents):
             if content:
-                results.append(content)
+                results[source_name].append(content)
         
         return results
     
+    def scrape_source(self, source: Dict) -> List[Dict]:
+        """
+        Scrape les URLs fallback d'une source avec Firecrawl
+        
+        Args:
+            source: Configuration de la source
+            
+        Returns:
+            Liste des contenus scrapés en markdown structuré
+        """
+        return self.scrape_sources([source])[source['name']]
+    
     def search_recent_articles(self, source: Dict, days: int = 7) -> List[Dict]:
         """
         Recherche active des derniers articles d'une source (nouveau!)
@@ -129,18 +188,36 @@ class FirecrawlScraper:
             # Requête ciblée
             query = f"site:{domain} growth marketing"
             
-            # NOTE: Appel MCP à activer
-            # results = call_mcp_tool("firecrawl_search", {
-            #     "query": query,
-            #     "limit": 5,
-            #     "scrapeOptions": {
-            #         "formats": ["markdown"],
-            #         "onlyMainContent": True
-            #     }
-            # })
+            params = {
+                "query": query,
+                "limit": 5,
+                "tbs": f"qdr:d{days}" if days > 1 else "qdr:d",
+                "scrapeOptions": {
+                    "formats": ["markdown"],
+                    "onlyMainContent": True,
+                    "maxAge": self.MAX_AGE_MS
+                }
+            }
+            response = self._call_tool(
+                "firecrawl_search",
+                params,
+                key_params={key: params[key] for key in ("query", "limit", "tbs")}
+            ) or {}
             
-            # PLACEHOLDER
+            items = response.get("results") or response.get("data") or []
             results = []
+            for item in items:
+                if not item.get("url"):
+                    continue
+                results.append({
+                    'source': source['name'],
+                    'subject': f"Firecrawl: {item.get('title', source['name'])}",
+                    'date': datetime.now().strftime('%Y-%m-%d'),
+                    'from': item['url'],
+                    'content': item.get('markdown') or item.get('description') or item.get('content', ''),
+                    'content_type': 'markdown',
+                    'message_id': f"firecrawl_{_digest(item['url'])}"
+                })
             
             logger.info(f"  ✅ {len(results)} articles récents trouvés")
             return results
@@ -8,7 +8,8 @@ import pickle
 import base64
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple, Callable
 from email.mime.text import MIMEText
 import re
 
@@ -20,6 +21,12 @@ from googleapiclient.errors import HttpError
 from bs4 import BeautifulSoup
 import yaml
 from scripts.firecrawl_scraper import FirecrawlScraper
+from scripts.fetch_pool import FetchPool
+from scripts.result_cache import ResultCache
+from scripts.feed_scraper import FeedScraper
+from scripts.tavily_searcher import TavilySearcher
+from scripts.source_history import SourceHistory
+from scripts.cassette import get_cassette, InjectedError
 
 # Configuration du logging
 logging.basicConfig(
@@ -35,17 +42,42 @@ SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 class GmailScraper:
     """Scraper pour récupérer les newsletters depuis Gmail"""
     
-    def __init__(self, config_path: str = "config/sources.yaml"):
+    def __init__(self, config_path: str = "config/sources.yaml", config: Optional[Dict] = None):
         """
         Initialise le scraper Gmail
         
         Args:
             config_path: Chemin vers le fichier de configuration YAML
+            config: Configuration déjà chargée (prioritaire sur config_path)
         """
-        self.config = self._load_config(config_path)
+        self.config = config if config is not None else self._load_config(config_path)
         self.service = None
-        self.web_scraper = FirecrawlScraper()  # Scraper Firecrawl MCP pour les fallbacks
-        self._authenticate()
+        # Scraper Firecrawl MCP pour les fallbacks (récupérés en parallèle)
+        fetch_pool = FetchPool.from_config(self.config.get('fallback_fetch'))
+        self.web_scraper = FirecrawlScraper(
+            fetch_pool,
+            ResultCache.from_config(self.config.get('firecrawl_cache'))
+        )
+        # Flux RSS/Atom: premier niveau avant le scraping web
+        self.feed_scraper = FeedScraper(
+            fetch_pool,
+            lookback_days=self.config.get('gmail_search', {}).get('lookback_days', 7)
+        )
+        # Recherche Tavily pour les sources sous-alimentées
+        self.searcher = TavilySearcher.from_config(self.config.get('search_enrichment'), fetch_pool)
+        # Historique Gmail par source (fallback spéculatif des sources souvent vides)
+        self.speculative_config = self.config.get('speculative_fallback', {}) or {}
+        self.source_history = SourceHistory(window=self.speculative_config.get('window', 10))
+        # Sources dont la recherche Gmail a échoué (non comptées comme vides dans l'historique)
+        self.query_errors = set()
+        self.fetch_pool = fetch_pool
+        self.cassette = get_cassette()
+        
+        # En rejeu, aucune authentification OAuth n'est nécessaire
+        if self.cassette.replaying:
+            logger.info("📼 Gmail en mode rejeu (pas d'authentification)")
+        else:
+            self._authenticate()
     
     def _load_config(self, config_path: str) -> Dict:
         """Charge la configuration depuis le fichier YAML"""
@@ -93,6 +125,24 @@ class GmailScraper:
         self.service = build('gmail', 'v1', credentials=creds)
         logger.info("✅ Authentification Gmail réussie")
     
+    def _gmail_call(self, operation: str, **params) -> Dict:
+        """
+        Exécute un appel users().messages() Gmail (enregistré/rejoué par la cassette)
+        
+        Args:
+            operation: list ou get
+            **params: Paramètres de l'appel
+            
+        Returns:
+            Réponse JSON de l'API
+        """
+        return self.cassette.call(
+            'gmail',
+            f"messages.{operation}",
+            params,
+            lambda: getattr(self.service.users().messages(), operation)(**params).execute()
+        )
+    
     def _build_search_query(self, source: Dict, lookback_days: int) -> str:
         """
         Construit la requête de recherche Gmail pour une source
@@ -129,15 +179,15 @@ class GmailScraper:
         
         return " ".join(query_parts)
     
-    def _extract_text_from_html(self, html_content: str) -> str:
+    def _parse_html(self, html_content: str) -> Tuple[str, List[Dict]]:
         """
-        Extrait le texte d'un contenu HTML
+        Extrait en une seule passe le texte et la table des liens d'un HTML
         
         Args:
             html_content: Contenu HTML
             
         Returns:
-            Texte extrait
+            Tuple (texte extrait, liens [{'text': ancre, 'href': url}])
         """
         soup = BeautifulSoup(html_content, 'html.parser')
         
@@ -145,6 +195,14 @@ class GmailScraper:
         for script in soup(["script", "style"]):
             script.decompose()
         
+        # Table des liens (texte d'ancre -> URL)
+        links = []
+        for anchor in soup.find_all('a', href=True):
+            href = anchor['href'].strip()
+            if not href.startswith('http'):
+                continue
+            links.append({'text': anchor.get_text(' ', strip=True), 'href': href})
+        
         # Récupérer le texte
         text = soup.get_text()
         
@@ -153,9 +211,9 @@ class GmailScraper:
         chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
         text = '\n'.join(chunk for chunk in chunks if chunk)
         
-        return text
+        return text, links
     
-    def _get_message_content(self, message_id: str) -> Optional[str]:
+    def _get_message_content(self, message_id: str) -> Optional[Dict]:
         """
         Récupère le contenu d'un message Gmail
         
@@ -163,57 +221,70 @@ class GmailScraper:
             message_id: ID du message Gmail
             
         Returns:
-            Contenu du message (texte ou HTML converti en texte)
+            Dict {'content': texte, 'html': HTML brut ou None,
+            'links': table des liens, 'content_type': 'html' ou 'text'}
         """
         try:
-            message = self.service.users().messages().get(
+            message = self._gmail_call(
+                'get',
                 userId='me',
                 id=message_id,
                 format='full'
-            ).execute()
+            )
             
             # Récupérer le payload
             payload = message.get('payload', {})
             
-            # Fonction récursive pour extraire le contenu
-            def extract_parts(parts, mime_type='text/plain'):
+            # Parcours récursif: première partie de chaque type MIME
+            parts_by_type = {}
+            
+            def collect_parts(parts):
                 for part in parts:
-                    if part.get('mimeType') == mime_type:
-                        data = part.get('body', {}).get('data')
-                        if data:
-                            return base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
+                    mime_type = part.get('mimeType')
+                    data = part.get('body', {}).get('data')
+                    if data and mime_type in ('text/plain', 'text/html') and mime_type not in parts_by_type:
+                        parts_by_type[mime_type] = base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
                     
                     # Si le part a des sous-parties, les explorer
                     if 'parts' in part:
-                        result = extract_parts(part['parts'], mime_type)
-                        if result:
-                            return result
-                return None
+                        collect_parts(part['parts'])
             
-            # Essayer d'abord text/plain
-            content = extract_parts([payload], 'text/plain')
+            collect_parts([payload])
             
-            # Si pas de text/plain, essayer text/html
-            if not content:
-                html_content = extract_parts([payload], 'text/html')
-                if html_content:
-                    content = self._extract_text_from_html(html_content)
+            text = parts_by_type.get('text/plain')
+            html = parts_by_type.get('text/html')
+            links = []
             
-            return content
+            # Une seule analyse du HTML: texte (si pas de text/plain) + table des liens
+            if html:
+                html_text, links = self._parse_html(html)
+                text = text or html_text
+            
+            if not text:
+                return None
             
-        except HttpError as error:
+            return {
+                'content': text,
+                'html': html,
+                'links': links,
+                'content_type': 'html' if html else 'text'
+            }
+            
+        except (HttpError, InjectedError) as error:
             logger.error(f"Erreur lors de la récupération du message {message_id}: {error}")
             return None
     
-    def scrape_source(self, source: Dict) -> List[Dict]:
+    def scrape_source(self, source: Dict, fallback: bool = True) -> Optional[List[Dict]]:
         """
         Scrape une source de newsletter
         
         Args:
             source: Configuration de la source
+            fallback: False pour différer le scraping web (voir scrape_all_sources)
             
         Returns:
-            Liste des emails trouvés avec leur contenu
+            Liste des emails trouvés avec leur contenu, ou None si aucun
+            message et fallback différé
         """
         logger.info(f"📧 Scraping source: {source['name']}")
         
@@ -227,16 +298,24 @@ class GmailScraper:
         
         try:
             # Rechercher les messages
-            results = self.service.users().messages().list(
+            results = self._gmail_call(
+                'list',
                 userId='me',
                 q=query,
                 maxResults=max_results
-            ).execute()
+            )
             
             messages = results.get('messages', [])
             
             if not messages:
                 logger.info(f"  ⚠️  Aucun message trouvé pour {source['name']}")
+                if not fallback:
+                    return None
+                # Flux RSS/Atom d'abord (articles déjà structurés)
+                if source.get('feed_url'):
+                    feed_results = self.feed_scraper.scrape_sources([source])[source['name']]
+                    if feed_results:
+                        return feed_results
                 # Essayer le fallback web
                 logger.info(f"  🌐 Tentative de scraping web...")
                 web_results = self.web_scraper.scrape_source(source)
@@ -250,15 +329,16 @@ class GmailScraper:
             # Récupérer le contenu de chaque message
             emails = []
             for msg in messages:
-                content = self._get_message_content(msg['id'])
-                if content:
+                body = self._get_message_content(msg['id'])
+                if body:
                     # Récupérer les métadonnées
-                    message = self.service.users().messages().get(
+                    message = self._gmail_call(
+                        'get',
                         userId='me',
                         id=msg['id'],
                         format='metadata',
                         metadataHeaders=['Subject', 'Date', 'From']
-                    ).execute()
+                    )
                     
                     headers = {h['name']: h['value'] for h in message.get('payload', {}).get('headers', [])}
                     
@@ -267,31 +347,158 @@ class GmailScraper:
                         'subject': headers.get('Subject', ''),
                         'date': headers.get('Date', ''),
                         'from': headers.get('From', ''),
-                        'content': content,
+                        'content': body['content'],
+                        'html': body['html'],
+                        'links': body['links'],
+                        'content_type': body['content_type'],
                         'message_id': msg['id']
                     })
             
             return emails
             
-        except HttpError as error:
+        except (HttpError, InjectedError) as error:
             logger.error(f"Erreur lors du scraping de {source['name']}: {error}")
+            self.query_errors.add(source['name'])
             return []
     
-    def scrape_all_sources(self) -> Dict[str, List[Dict]]:
+    def _fallback_records(self, source: Dict) -> List[Dict]:
+        """Fallback complet d'une source: flux RSS/Atom puis scraping web"""
+        if source.get('feed_url'):
+            records = self.feed_scraper.scrape_sources([source])[source['name']]
+            if records:
+                return records
+        return self.web_scraper.scrape_sources([source])[source['name']]
+    
+    def _start_speculative_fallbacks(self, sources: List[Dict]) -> Tuple[Optional[ThreadPoolExecutor], Dict]:
+        """
+        Lance le fallback des sources probablement vides, en parallèle des recherches Gmail
+        
+        Args:
+            sources: Sources configurées
+            
+        Returns:
+            Tuple (exécuteur ou None, {nom_source: future})
+        """
+        if not self.speculative_config.get('enabled', False):
+            return None, {}
+        
+        candidates = [
+            source for source in sources
+            if source.get('type') != 'feed'
+            and (source.get('feed_url') or source.get('fallback_url') or source.get('fallback_urls'))
+            and self.source_history.likely_empty(
+                source,
+                threshold=self.speculative_config.get('empty_rate_threshold', 0.6),
+                min_runs=self.speculative_config.get('min_runs', 3)
+            )
+        ]
+        if not candidates:
+            return None, {}
+        
+        logger.info(f"⚡ Fallback spéculatif pour {len(candidates)} source(s) souvent vide(s)")
+        executor = ThreadPoolExecutor(max_workers=min(len(candidates), self.fetch_pool.max_workers))
+        futures = {source['name']: executor.submit(self._fallback_records, source) for source in candidates}
+        return executor, futures
+    
+    def scrape_all_sources(self, on_records: Optional[Callable[[str, List[Dict]], None]] = None,
+                           only: Optional[set] = None) -> Dict[str, List[Dict]]:
         """
         Scrape toutes les sources configurées
         
+        Args:
+            on_records: Appelée avec (nom_source, enregistrements) dès que des
+                        enregistrements d'une source sont définitifs (pipeline en flux)
+            only: Noms des sources à scraper (toutes si None)
+        
         Returns:
             Dictionnaire {nom_source: [emails]}
         """
         logger.info("🚀 Démarrage du scraping de toutes les sources...")
         
+        def emit(source_name: str, records: List[Dict]):
+            if on_records and records:
+                on_records(source_name, records)
+        
         results = {}
-        sources = self.config.get('sources', [])
+        self.query_errors = set()
+        # Un rejeu ne modifie pas l'historique (mêmes fallbacks spéculatifs que l'exécution rejouée)
+        update_history = not self.cassette.replaying
+        sources = [
+            source for source in self.config.get('sources', [])
+            if only is None or source['name'] in only
+        ]
+        pending_feed = []
+        pending_fallback = []
+        speculative = {'used': 0, 'discarded': 0}
+        
+        executor, futures = self._start_speculative_fallbacks(sources)
         
         for source in sources:
-            emails = self.scrape_source(source)
+            # Source de type flux: pas de recherche Gmail
+            if source.get('type') == 'feed':
+                pending_feed.append(source)
+                results[source['name']] = []
+                continue
+            
+            emails = self.scrape_source(source, fallback=False)
+            if update_history and source['name'] not in self.query_errors:
+                self.source_history.record(source['name'], bool(emails))
+            future = futures.get(source['name'])
+            
+            if emails is None and future is not None:
+                # Fallback déjà lancé: son résultat remplace l'attente
+                try:
+                    emails = future.result()
+                    speculative['used'] += 1
+                except Exception as e:
+                    # Échec isolé: la source repasse par le fallback classique
+                    logger.warning(f"⚠️  Fallback spéculatif de {source['name']} en échec: {e}")
+            elif future is not None:
+                # Emails trouvés: fallback annulé s'il n'a pas démarré, sinon ignoré
+                future.cancel()
+                speculative['discarded'] += 1
+            if emails is None:
+                (pending_feed if source.get('feed_url') else pending_fallback).append(source)
+                emails = []
             results[source['name']] = emails
+            emit(source['name'], emails)
+        
+        if executor is not None:
+            executor.shutdown(wait=False)
+            logger.info(
+                f"⚡ Fallback spéculatif: {speculative['used']} utilisé(s), "
+                f"{speculative['discarded']} ignoré(s)"
+            )
+        if update_history:
+            self.source_history.save()
+        
+        # Flux RSS/Atom de toutes les sources en un seul lot concurrent
+        if pending_feed:
+            logger.info(f"📡 Lecture des flux de {len(pending_feed)} source(s)...")
+            feed_results = self.feed_scraper.scrape_sources(pending_feed)
+            for source in pending_feed:
+                if feed_results[source['name']]:
+                    results[source['name']] = feed_results[source['name']]
+                    emit(source['name'], results[source['name']])
+                elif source.get('type') != 'feed':
+                    pending_fallback.append(source)
+        
+        # Fallbacks web de toutes les sources en un seul lot concurrent
+        if pending_fallback:
+            logger.info(f"🌐 Scraping web pour {len(pending_fallback)} source(s) sans email...")
+            web_results = self.web_scraper.scrape_sources(pending_fallback)
+            for source_name, contents in web_results.items():
+                if contents:
+                    logger.info(f"  ✅ {source_name}: {len(contents)} contenu(s) récupéré(s) via web scraping")
+                results[source_name] = contents
+                emit(source_name, contents)
+        
+        # Enrichissement par recherche des sources avec peu de contenu
+        if self.config.get('search_enrichment', {}).get('enabled', False):
+            counts = {name: len(records) for name, records in results.items()}
+            self.searcher.enrich_sources(results, sources)
+            for source_name, records in results.items():
+                emit(source_name, records[counts.get(source_name, 0):])
         
         total_emails = sum(len(emails) for emails in results.values())
         logger.info(f"✅ Scraping terminé: {total_emails} emails récupérés de {len(results)} sources")
@@ -46,9 +46,19 @@ class HTMLBuilder:
         
         return date_range
     
-    def generate_html(self, articles: List[Dict], output_path: str = None) -> str:
-        """Génère le fichier HTML de la newsletter"""
-        logger.info("🎨 Génération du HTML de la newsletter...")
+    def generate_html(self, articles: List[Dict], output_path: str = None, title: str = "Growth Weekly",
+                      subtitle: str = "by Dagorsey & Claude", slug: str = "growth-weekly") -> str:
+        """
+        Génère le fichier HTML de la newsletter
+        
+        Args:
+            articles: Articles classés
+            output_path: Fichier de sortie (défaut: output/newsletters/{slug}-AAAA-MM-JJ.html)
+            title: Titre de l'édition
+            subtitle: Sous-titre de l'édition
+            slug: Préfixe du fichier de sortie
+        """
+        logger.info(f"🎨 Génération du HTML de la newsletter ({title})...")
         
         # Organiser par catégorie
         by_cat = {'critical': [], 'important': [], 'good_to_know': []}
@@ -69,7 +79,7 @@ class HTMLBuilder:
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Growth Weekly Newsletter</title>
+    <title>{title} Newsletter</title>
     <style>
         body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; max-width: 900px; margin: 0 auto; padding: 40px 20px; line-height: 1.6; color: #111827; background: white; }}
         h1 {{ text-align: center; font-size: 2.8em; font-weight: 300; margin-bottom: 10px; }}
@@ -109,8 +119,8 @@ class HTMLBuilder:
     </style>
 </head>
 <body>
-    <h1>Growth Weekly</h1>
-    <p class="subtitle">by Dagorsey & Claude</p>
+    <h1>{title}</h1>
+    <p class="subtitle">{subtitle}</p>
     <div class="divider"></div>
     <p class="date">{date_range}</p>
 """
@@ -174,7 +184,7 @@ class HTMLBuilder:
         # Déterminer le chemin de sortie
         if not output_path:
             os.makedirs('output/newsletters', exist_ok=True)
-            filename = f"growth-weekly-{datetime.now().strftime('%Y-%m-%d')}.html"
+            filename = f"{slug}-{datetime.now().strftime('%Y-%m-%d')}.html"
             output_path = os.path.join('output/newsletters', filename)
         
         # Sauvegarder
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+HTTP Cache - Cache disque à GET conditionnel pour les pages fallback
+Conserve ETag/Last-Modified et le texte extrait: une réponse 304 évite
+le téléchargement ET le parsing BeautifulSoup
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+# Issues d'une consultation du cache
+HIT = 'hit'                # Entrée encore fraîche, aucune requête
+REVALIDATE = 'revalidate'  # 304 Not Modified: entrée réutilisée
+MISS = 'miss'              # Téléchargement et parsing complets
+
+
+class HTTPCache:
+    """Cache disque des pages scrapées (une entrée JSON par URL)"""
+
+    def __init__(self, directory: Optional[str] = None, fresh_for: float = 0.0):
+        """
+        Initialise le cache
+
+        Args:
+            directory: Dossier du cache (défaut: $CACHE_DIR/http)
+            fresh_for: Durée (secondes) pendant laquelle une entrée est servie
+                       sans revalidation, si le serveur n'indique pas de max-age
+        """
+        self.directory = directory or os.path.join(os.getenv('CACHE_DIR', 'cache'), 'http')
+        self.fresh_for = fresh_for
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.counts = defaultdict(lambda: {HIT: 0, REVALIDATE: 0, MISS: 0})
+
+    def _path(self, url: str) -> str:
+        """Fichier de l'entrée d'une URL"""
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Retourne l'entrée en cache d'une URL, ou None"""
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """True si l'entrée peut être servie sans revalidation"""
+        max_age = entry.get('max_age')
+        if max_age is None:
+            max_age = self.fresh_for
+        return time.time() - entry.get('validated_at', 0) < max_age
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """En-têtes If-None-Match / If-Modified-Since d'une entrée"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _write(self, entry: Dict):
+        """Écriture atomique d'une entrée"""
+        path = self._path(entry['url'])
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def store(self, url: str, headers: Dict, data: Dict) -> Optional[Dict]:
+        """
+        Enregistre une réponse 200 et son contenu extrait
+
+        Args:
+            url: URL demandée
+            headers: En-têtes de la réponse
+            data: Contenu extrait ({'text', 'title', 'html'})
+
+        Returns:
+            Entrée enregistrée, ou None si la réponse n'est pas cacheable
+        """
+        cache_control = (headers.get('Cache-Control') or '').lower()
+        if 'no-store' in cache_control:
+            return None
+
+        max_age_match = MAX_AGE_RE.search(cache_control)
+        entry = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'max_age': 0 if 'no-cache' in cache_control else (
+                int(max_age_match.group(1)) if max_age_match else None
+            ),
+            'validated_at': time.time(),
+            **data
+        }
+        self._write(entry)
+        return entry
+
+    def revalidated(self, entry: Dict, headers: Dict):
+        """Met à jour une entrée après un 304 (nouveaux validateurs éventuels)"""
+        entry['validated_at'] = time.time()
+        entry['etag'] = headers.get('ETag') or entry.get('etag')
+        entry['last_modified'] = headers.get('Last-Modified') or entry.get('last_modified')
+        self._write(entry)
+
+    def count(self, source_name: str, outcome: str):
+        """Comptabilise une issue (hit/revalidate/miss) pour une source"""
+        with self._lock:
+            self.counts[source_name][outcome] += 1
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Compteurs hit/revalidate/miss par source"""
+        with self._lock:
+            return {source: dict(counts) for source, counts in self.counts.items()}
+
+    def log_summary(self):
+        """Affiche les compteurs par source"""
+        for source, counts in self.report().items():
+            logger.info(
+                f"  🗄️  Cache HTTP {source}: {counts[HIT]} hit, "
+                f"{counts[REVALIDATE]} revalidé(s), {counts[MISS]} miss"
+            )
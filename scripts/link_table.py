@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Link Table - Remplace les liens d'un contenu par des identifiants courts ([L7])
+Réduit les tokens envoyés au modèle et garantit des URLs exactes après extraction
+"""
+
+import re
+import logging
+from typing import List, Dict, Optional
+from urllib.parse import urlparse
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MD_LINK_RE = re.compile(r'\[([^\]\n]*)\]\((https?://[^)\s]+)\)')
+RAW_URL_RE = re.compile(r'https?://[^\s<>()\[\]"\']+')
+REF_RE = re.compile(r'^\[?(L\d+)\]?$')
+INLINE_REF_RE = re.compile(r'\[(L\d+)\]')
+
+
+class LinkTable:
+    """Table identifiant court -> URL complète pour un contenu"""
+
+    # Texte d'ancre minimal pour placer un lien HTML dans le texte (évite "ici", "lire")
+    MIN_ANCHOR_LENGTH = 12
+
+    def __init__(self, links: Optional[List[Dict]] = None):
+        """
+        Initialise la table
+
+        Args:
+            links: Table des liens de l'email [{'text', 'href'}] (textes d'ancre)
+        """
+        self.urls = {}      # id -> URL
+        self.ids = {}       # URL -> id
+        self.anchors = {}   # URL -> texte d'ancre
+        self.inline = set() # ids présents dans le contenu compacté
+        for link in links or []:
+            if link.get('text') and link['href'] not in self.anchors:
+                self.anchors[link['href']] = link['text']
+
+    def add(self, url: str, anchor: str = '') -> str:
+        """
+        Enregistre une URL et retourne son identifiant
+
+        Args:
+            url: URL complète
+            anchor: Texte d'ancre associé
+
+        Returns:
+            Identifiant court (ex: L7)
+        """
+        if url not in self.ids:
+            ref = f"L{len(self.ids) + 1}"
+            self.ids[url] = ref
+            self.urls[ref] = url
+        if anchor and url not in self.anchors:
+            self.anchors[url] = anchor
+        return self.ids[url]
+
+    def compact(self, content: str) -> str:
+        """
+        Remplace tous les liens du contenu par leur identifiant
+
+        Args:
+            content: Texte ou markdown contenant des URLs
+
+        Returns:
+            Contenu compacté
+        """
+        def replace_markdown(match):
+            anchor, url = match.group(1), match.group(2)
+            ref = self.add(url, anchor.strip())
+            self.inline.add(ref)
+            return f"{anchor} [{ref}]"
+
+        def replace_raw(match):
+            url = match.group(0)
+            trailing = ''
+            while url and url[-1] in '.,;:!?':
+                trailing = url[-1] + trailing
+                url = url[:-1]
+            ref = self.add(url)
+            self.inline.add(ref)
+            return f"[{ref}]{trailing}"
+
+        compacted = MD_LINK_RE.sub(replace_markdown, content)
+        compacted = RAW_URL_RE.sub(replace_raw, compacted)
+
+        # Liens présents uniquement dans le HTML (texte aplati sans URL):
+        # identifiant inséré après la première occurrence du texte d'ancre
+        for url, anchor in list(self.anchors.items()):
+            anchor = ' '.join(anchor.split())
+            if url in self.ids or len(anchor) < self.MIN_ANCHOR_LENGTH:
+                continue
+            position = compacted.find(anchor)
+            if position < 0:
+                continue
+            ref = self.add(url)
+            self.inline.add(ref)
+            end = position + len(anchor)
+            compacted = f"{compacted[:end]} [{ref}]{compacted[end:]}"
+
+        return compacted
+
+    def table(self, visible_text: Optional[str] = None, limit: int = 150) -> str:
+        """
+        Table compacte identifiant -> texte d'ancre (domaine)
+
+        Args:
+            visible_text: Extrait effectivement envoyé au modèle; seuls les
+                          identifiants qu'il contient sont listés
+            limit: Nombre maximum d'entrées
+
+        Returns:
+            Une ligne par lien
+        """
+        visible = set(INLINE_REF_RE.findall(visible_text)) if visible_text is not None else None
+        lines = []
+        for ref, url in self.urls.items():
+            if visible is not None and ref not in visible:
+                continue
+            if len(lines) >= limit:
+                break
+            anchor = ' '.join(self.anchors.get(url, '').split())[:60]
+            domain = urlparse(url).netloc
+            lines.append(f"{ref}: {anchor} ({domain})" if anchor else f"{ref}: ({domain})")
+        return "\n".join(lines)
+
+    def resolve(self, value: Optional[str]) -> Optional[str]:
+        """
+        Convertit un identifiant renvoyé par le modèle en URL complète
+
+        Args:
+            value: Identifiant (L7, [L7]) ou URL
+
+        Returns:
+            URL complète, ou None si l'identifiant/URL est inconnu
+        """
+        if not value or not isinstance(value, str):
+            return None
+        value = value.strip()
+        match = REF_RE.match(value)
+        if match:
+            return self.urls.get(match.group(1))
+        # URL recopiée telle quelle: acceptée seulement si elle existe dans le contenu
+        return value if value in self.ids else None
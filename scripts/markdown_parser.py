@@ -6,7 +6,10 @@ Markdown Parser - Extrait articles du markdown structuré (Firecrawl) SANS IA
 
 import re
 import logging
-from typing import List, Dict
+from html.parser import HTMLParser
+from typing import List, Dict, Optional, Iterable, NamedTuple
+
+from scripts.content_classifier import classify_content
 
 logging.basicConfig(
     level=logging.INFO,
@@ -15,9 +18,184 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Patterns précompilés (une seule compilation par processus)
+HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t#]*$', re.MULTILINE)
+MD_LINK_RE = re.compile(r'\[[^\]\n]*\]\((https?://[^)\s]+)\)')
+PARAGRAPH_SPLIT_RE = re.compile(r'\n\s*\n')
+
+# Découpage par défaut: format Demand Curve (##### Titre + _Insight from ..._)
+DEFAULT_SECTION_RULES = {
+    'heading_levels': [5],
+    'section_marker': '_Insight from',
+}
+
+
+class Section(NamedTuple):
+    """Section markdown délimitée par un titre (offsets dans le document)"""
+    level: int
+    title: str
+    start: int       # Début de la ligne de titre
+    body_start: int  # Début du contenu (après le titre)
+    end: int         # Fin du contenu (début du titre suivant ou fin du document)
+
+
+def split_sections(markdown_content: str, heading_levels: Iterable[int] = (5,)) -> List[Section]:
+    """
+    Découpe un document markdown en sections en une seule passe
+
+    Chaque titre dont le niveau est dans `heading_levels` ouvre une section,
+    qui se termine au titre suivant (quel que soit son niveau).
+
+    Args:
+        markdown_content: Document markdown
+        heading_levels: Niveaux de titres (nombre de #) qui délimitent les articles
+
+    Returns:
+        Liste de sections avec offsets
+    """
+    levels = set(heading_levels)
+    sections = []
+    current = None
+
+    for match in HEADING_RE.finditer(markdown_content):
+        if current is not None:
+            sections.append(current._replace(end=match.start()))
+            current = None
+
+        level = len(match.group(1))
+        if level in levels:
+            current = Section(level, match.group(2).strip(), match.start(), match.end(), len(markdown_content))
+
+    if current is not None:
+        sections.append(current)
+
+    return sections
+
+
+class SubstackPostWalker(HTMLParser):
+    """
+    Parcours en flux du HTML Substack (emails et pages d'archive)
+
+    Chaque élément titre (post-title, post-preview-title) ouvre un nouveau post;
+    le sous-titre et le premier lien /p/ rencontrés ensuite lui sont rattachés,
+    ce qui garde titre, sous-titre et URL alignés même si un champ manque.
+    """
+
+    TITLE_CLASSES = ('post-title', 'post-preview-title')
+    SUBTITLE_CLASSES = ('subtitle', 'post-preview-description')
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.posts = []
+        self._current = None
+        self._capture = None        # 'title' ou 'subtitle'
+        self._capture_tag = None
+        self._capture_depth = 0
+        self._buffer = []
+
+    @staticmethod
+    def _has_class(attrs: Dict, names: Iterable[str]) -> bool:
+        classes = (attrs.get('class') or '').split()
+        return any(name in classes for name in names)
+
+    @staticmethod
+    def _post_url(href: Optional[str]) -> Optional[str]:
+        if href and href.startswith('http') and '/p/' in href:
+            return href
+        return None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+
+        if self._capture is not None:
+            if tag == self._capture_tag:
+                self._capture_depth += 1
+            # Lien à l'intérieur du titre: URL du post
+            if tag == 'a' and self._current is not None and not self._current['url']:
+                self._current['url'] = self._post_url(attrs.get('href'))
+            return
+
+        if self._has_class(attrs, self.TITLE_CLASSES):
+            self._current = {'title': '', 'subtitle': '', 'url': None}
+            self.posts.append(self._current)
+            self._start_capture('title', tag)
+            if tag == 'a':
+                self._current['url'] = self._post_url(attrs.get('href'))
+            return
+
+        if self._current is None:
+            return
+
+        if self._has_class(attrs, self.SUBTITLE_CLASSES) and not self._current['subtitle']:
+            self._start_capture('subtitle', tag)
+        elif tag == 'a' and not self._current['url']:
+            self._current['url'] = self._post_url(attrs.get('href'))
+
+    def handle_endtag(self, tag):
+        if self._capture is None or tag != self._capture_tag:
+            return
+        self._capture_depth -= 1
+        if self._capture_depth == 0:
+            self._current[self._capture] = ' '.join(''.join(self._buffer).split())
+            self._capture = None
+            self._capture_tag = None
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._buffer.append(data)
+
+    def _start_capture(self, field: str, tag: str):
+        self._capture = field
+        self._capture_tag = tag
+        self._capture_depth = 1
+        self._buffer = []
+
+
+def walk_substack_posts(html_content: str) -> List[Dict]:
+    """
+    Extrait les posts Substack en une passe linéaire
+
+    Args:
+        html_content: HTML d'un email ou d'une page d'archive Substack
+
+    Returns:
+        Liste de {'title', 'subtitle', 'url'} (dédupliquée par URL)
+    """
+    walker = SubstackPostWalker()
+    walker.feed(html_content)
+    walker.close()
+
+    posts = []
+    seen_urls = set()
+    for post in walker.posts:
+        if not post['title']:
+            continue
+        if post['url']:
+            if post['url'] in seen_urls:
+                continue
+            seen_urls.add(post['url'])
+        posts.append(post)
+    return posts
+
+
 class MarkdownParser:
     """Parse le markdown structuré pour extraire articles sans IA"""
     
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialise le parser
+        
+        Args:
+            config: Configuration (sources.yaml); chaque source peut définir
+                    `markdown_sections: {heading_levels: [...], section_marker: "..."}`
+        """
+        self.section_rules = {}
+        for source in (config or {}).get('sources', []) or []:
+            if source.get('markdown_sections'):
+                rules = dict(DEFAULT_SECTION_RULES)
+                rules.update(source['markdown_sections'])
+                self.section_rules[source['name']] = rules
+    
     def extract_articles_from_markdown(self, markdown_content: str, source_name: str) -> List[Dict]:
         """
         Extrait articles du markdown Firecrawl
@@ -31,32 +209,38 @@ class MarkdownParser:
         """
         logger.info(f"📝 Extraction markdown pour {source_name}")
         
+        rules = self.section_rules.get(source_name, DEFAULT_SECTION_RULES)
+        marker = rules.get('section_marker')
+        
         articles = []
         
-        # Pattern pour articles Demand Curve
         # Ex: ##### Email customer acquisition for big, once-in-a-lifetime purchases
-        pattern = r'#####\s+(.+?)\n\n_Insight from.+?\n\n(.+?)(?=\n\n#####|\n\n##|\Z)'
-        
-        matches = re.findall(pattern, markdown_content, re.DOTALL)
-        
-        for title, description in matches:
-            # Nettoyer le titre
-            title = title.strip()
+        for section in split_sections(markdown_content, rules['heading_levels']):
+            body = markdown_content[section.body_start:section.end].strip()
+            paragraphs = [p.strip() for p in PARAGRAPH_SPLIT_RE.split(body) if p.strip()]
             
-            # Nettoyer la description (garder 2-3 premiers paragraphes)
-            desc_lines = description.split('\n\n')
-            summary = ' '.join(desc_lines[:2]).strip()
+            # Marqueur de section (ex: "_Insight from Rejoiner._") requis s'il est configuré
+            if marker:
+                if not paragraphs or not paragraphs[0].startswith(marker):
+                    continue
+                paragraphs = paragraphs[1:]
+            
+            if not paragraphs:
+                continue
+            
+            # Garder les 2 premiers paragraphes
+            summary = ' '.join(paragraphs[:2]).strip()
             
             # Limiter à 160 caractères
             if len(summary) > 160:
                 summary = summary[:157] + '...'
             
-            # Extraire URLs si présentes
-            url_match = re.search(r'\[.+?\]\((https?://[^\)]+)\)', description)
+            # Extraire URLs si présentes (recherche bornée à la section)
+            url_match = MD_LINK_RE.search(markdown_content, section.body_start, section.end)
             url = url_match.group(1) if url_match else None
             
             articles.append({
-                'title': title,
+                'title': section.title,
                 'summary': summary,
                 'url': url,
                 'category': 'important',  # Par défaut, sera reclassé après
@@ -71,6 +255,9 @@ class MarkdownParser:
         """
         Extrait articles des newsletters Substack (structure HTML prévisible)
         
+        Fonctionne sur les emails Substack comme sur les pages d'archive
+        (post-preview) récupérées par le fallback web.
+        
         Args:
             html_content: HTML de la newsletter Substack
             source_name: Nom de la source
@@ -82,23 +269,10 @@ class MarkdownParser:
         
         articles = []
         
-        # Pattern Substack pour les titres de posts
-        # <h2 class="post-title">...</h2>
-        title_pattern = r'<h2[^>]*class="[^"]*post-title[^"]*"[^>]*>(.*?)</h2>'
-        titles = re.findall(title_pattern, html_content, re.DOTALL)
-        
-        # Pattern pour les subtitles/descriptions
-        subtitle_pattern = r'<p[^>]*class="[^"]*subtitle[^"]*"[^>]*>(.*?)</p>'
-        subtitles = re.findall(subtitle_pattern, html_content, re.DOTALL)
-        
-        # Pattern pour les URLs d'articles
-        url_pattern = r'<a[^>]*href="(https://[^"]+/p/[^"]+)"'
-        urls = re.findall(url_pattern, html_content)
-        
-        # Combiner les données
-        for i in range(min(len(titles), len(subtitles), len(urls))):
-            title = re.sub(r'<[^>]+>', '', titles[i]).strip()
-            summary = re.sub(r'<[^>]+>', '', subtitles[i]).strip()
+        # Une seule passe: chaque bloc de post donne un enregistrement aligné
+        for post in walk_substack_posts(html_content):
+            title = post['title']
+            summary = post['subtitle']
             
             # Limiter la longueur
             if len(title) > 80:
@@ -109,7 +283,7 @@ class MarkdownParser:
             articles.append({
                 'title': title,
                 'summary': summary,
-                'url': urls[i],
+                'url': post['url'],
                 'category': 'important',
                 'source': source_name,
                 'extraction_method': 'substack_parser'
@@ -129,15 +303,7 @@ class MarkdownParser:
         Returns:
             True si parsing sans IA possible
         """
-        # Vérifier si c'est du markdown Firecrawl
-        if '####' in content or '#####' in content:
-            return True
-        
-        # Vérifier si c'est Substack
-        if 'substack.com' in source_name.lower() or 'class="post-title"' in content:
-            return True
-        
-        return False
+        return classify_content(content, source_name).ai_free
 
 
 def main():
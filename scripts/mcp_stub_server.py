@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Serveur MCP stub - Réponses locales déterministes pour firecrawl_scrape,
+firecrawl_search et tavily-search (tests et développement hors ligne)
+
+Usage:
+    python scripts/mcp_stub_server.py                 # stdio
+    python scripts/mcp_stub_server.py --http 8765     # HTTP (POST /mcp)
+    python scripts/mcp_stub_server.py --delay 0.5     # latence simulée par appel
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+
+SERVER_INFO = {"name": "growth-newsletter-stub", "version": "1.0"}
+
+TOOLS = [
+    {"name": "firecrawl_scrape", "description": "Scrape une URL en markdown",
+     "inputSchema": {"type": "object", "properties": {"url": {"type": "string"}}, "required": ["url"]}},
+    {"name": "firecrawl_search", "description": "Recherche web",
+     "inputSchema": {"type": "object", "properties": {"query": {"type": "string"}}, "required": ["query"]}},
+    {"name": "tavily-search", "description": "Recherche web Tavily",
+     "inputSchema": {"type": "object", "properties": {"query": {"type": "string"}}, "required": ["query"]}},
+]
+
+
+def _scrape_markdown(url: str) -> str:
+    """Markdown simulé d'une page de newsletter"""
+    return f"""# Growth Marketing Article
+
+## Recent News from {url}
+
+#### Article 1: Product-Led Growth Strategies
+
+New insights on PLG implementation for B2B SaaS companies.
+
+[Read more]({url}/article1)
+
+#### Article 2: AI-Powered Marketing Automation
+
+How AI is transforming growth marketing workflows.
+
+[Read more]({url}/article2)
+
+#### Article 3: Community-Led Growth Framework
+
+Building sustainable growth through community engagement.
+
+[Read more]({url}/article3)
+"""
+
+
+def call_tool(name: str, arguments: Dict[str, Any]) -> Dict:
+    """Résultat tools/call simulé"""
+    if name == "firecrawl_scrape":
+        url = arguments.get("url", "")
+        if "fail" in url:
+            return {"content": [{"type": "text", "text": f"Scrape impossible: {url}"}], "isError": True}
+        return {"content": [{"type": "text", "text": _scrape_markdown(url)}], "isError": False}
+
+    if name in ("firecrawl_search", "tavily-search"):
+        query = arguments.get("query", "")
+        site = re.search(r'site:(\S+)', query)
+        host = site.group(1) if site else "example.com"
+        results = [
+            {
+                "title": f"Search result {i} for: {query}",
+                "url": f"https://{host}/p/stub-{i}",
+                "content": "Growth marketing insights from recent research..."
+            }
+            for i in range(1, int(arguments.get("limit", arguments.get("max_results", 3))) + 1)
+        ]
+        return {"content": [{"type": "text", "text": json.dumps({"results": results})}], "isError": False}
+
+    raise KeyError(name)
+
+
+def handle(message: Dict, delay: float = 0.0) -> Optional[Dict]:
+    """Traite un message JSON-RPC; None pour une notification"""
+    if 'id' not in message:
+        return None
+
+    method = message.get('method')
+    params = message.get('params') or {}
+    reply = {"jsonrpc": "2.0", "id": message['id']}
+
+    if method == 'initialize':
+        reply['result'] = {
+            "protocolVersion": params.get('protocolVersion', "2024-11-05"),
+            "capabilities": {"tools": {}},
+            "serverInfo": SERVER_INFO
+        }
+    elif method == 'tools/list':
+        reply['result'] = {"tools": TOOLS}
+    elif method == 'ping':
+        reply['result'] = {}
+    elif method == 'tools/call':
+        if delay:
+            time.sleep(delay)
+        try:
+            reply['result'] = call_tool(params.get('name'), params.get('arguments') or {})
+        except KeyError:
+            reply['error'] = {"code": -32602, "message": f"Outil inconnu: {params.get('name')}"}
+    else:
+        reply['error'] = {"code": -32601, "message": f"Méthode inconnue: {method}"}
+    return reply
+
+
+def serve_stdio(delay: float):
+    """Boucle stdio: chaque requête traitée dans son thread (réponses dans le désordre)"""
+    write_lock = threading.Lock()
+
+    def process(message):
+        reply = handle(message, delay)
+        if reply is not None:
+            with write_lock:
+                sys.stdout.write(json.dumps(reply) + "\n")
+                sys.stdout.flush()
+
+    for line in sys.stdin:
+        if line.strip():
+            threading.Thread(target=process, args=(json.loads(line),), daemon=True).start()
+
+
+def serve_http(port: int, delay: float):
+    """Serveur HTTP: POST /mcp, réponse JSON"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            reply = handle(json.loads(body), delay)
+            if reply is None:
+                self.send_response(202)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            data = json.dumps(reply).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('Mcp-Session-Id', 'stub-session')
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    print(f"🧪 Serveur MCP stub sur http://127.0.0.1:{port}/mcp", file=sys.stderr)
+    server.serve_forever()
+
+
+def main():
+    """Point d'entrée"""
+    parser = argparse.ArgumentParser(description="Serveur MCP stub (firecrawl/tavily)")
+    parser.add_argument('--http', type=int, metavar='PORT', help="Servir en HTTP au lieu de stdio")
+    parser.add_argument('--delay', type=float, default=0.0, help="Latence simulée par appel d'outil (s)")
+    args = parser.parse_args()
+
+    if args.http:
+        serve_http(args.http, args.delay)
+    else:
+        serve_stdio(args.delay)
+
+
+if __name__ == "__main__":
+    main()
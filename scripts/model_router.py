@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Model Router - Choisit le modèle Claude par étape (et par source)
+Utilise un modèle rapide/économique quand c'est possible, avec escalade
+vers le grand modèle si la sortie ne passe pas la validation
+"""
+
+import logging
+from typing import List, Dict, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class ModelRouter:
+    """Table de routage des modèles par étape du pipeline"""
+
+    DEFAULT_MODEL = "claude-3-5-sonnet-20241022"
+    STAGES = ('extraction', 'translation', 'ranking')
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialise le routeur
+
+        Args:
+            config: Configuration complète (sources.yaml), section `models` et
+                    clés `models` éventuelles de chaque source
+        """
+        config = config or {}
+        models_config = config.get('models', {}) or {}
+
+        self.default_model = models_config.get('default', self.DEFAULT_MODEL)
+        self.stage_models = models_config.get('stages', {}) or {}
+        self.escalation_model = models_config.get('escalation', self.default_model)
+
+        # Surcharges par source: {nom_source: {étape: modèle}}
+        self.source_models = {
+            source['name']: source['models']
+            for source in config.get('sources', []) or []
+            if source.get('models')
+        }
+
+    def model_for(self, stage: str, source_name: Optional[str] = None) -> str:
+        """
+        Retourne le modèle principal d'une étape
+
+        Args:
+            stage: extraction, translation ou ranking
+            source_name: Nom de la source (surcharge optionnelle)
+
+        Returns:
+            Identifiant du modèle
+        """
+        if source_name and stage in self.source_models.get(source_name, {}):
+            return self.source_models[source_name][stage]
+        return self.stage_models.get(stage, self.default_model)
+
+    def chain(self, stage: str, source_name: Optional[str] = None) -> List[str]:
+        """
+        Retourne la chaîne de modèles à essayer (principal puis escalade)
+
+        Args:
+            stage: extraction, translation ou ranking
+            source_name: Nom de la source
+
+        Returns:
+            Liste ordonnée de modèles, sans doublon
+        """
+        primary = self.model_for(stage, source_name)
+        if primary == self.escalation_model:
+            return [primary]
+        return [primary, self.escalation_model]
+
+
+def main():
+    """Test du routeur"""
+    router = ModelRouter({
+        'models': {
+            'stages': {'translation': 'claude-3-5-haiku-20241022'},
+        },
+        'sources': [
+            {'name': 'TLDR Marketing', 'models': {'extraction': 'claude-3-5-haiku-20241022'}}
+        ]
+    })
+    for stage in ModelRouter.STAGES:
+        print(f"{stage}: {router.chain(stage, 'TLDR Marketing')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Newsletter Daemon - Mode service de longue durée
+Configuration lue une fois, clients Gmail/Anthropic/HTTP gardés chauds entre les
+générations, génération planifiée et API locale de déclenchement (HTTP ou socket Unix)
+
+Usage:
+    python scripts/newsletter_daemon.py                      # API sur 127.0.0.1:8787 + planification
+    python scripts/newsletter_daemon.py --socket /tmp/gw.sock
+    curl -X POST localhost:8787/run -H 'Content-Type: application/json' -d '{"editions": ["plg-digest"]}'
+    curl -X POST localhost:8787/rerank -H 'Content-Type: application/json'
+    curl localhost:8787/status
+
+Les POST exigent Content-Type: application/json (pré-vérification CORS: une page web
+ne peut pas déclencher de génération) et, si NEWSLETTER_DAEMON_TOKEN est défini,
+l'en-tête Authorization: Bearer <jeton>
+"""
+
+import os
+import sys
+import json
+import time
+import hmac
+import signal
+import logging
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Dict, List, Optional
+
+import yaml
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.newsletter_generator import NewsletterGenerator
+from scripts.editions import load_editions
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+# Options de génération acceptées par l'API (paramètres de NewsletterGenerator.run)
+RUN_OPTIONS = {'use_cache', 'max_cost', 'max_tokens', 'deadline', 'streaming', 'low_memory', 'skip_published'}
+
+
+def next_scheduled(schedule: Dict, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Prochaine génération planifiée
+
+    Args:
+        schedule: {weekday: monday..sunday (tous les jours si absent), time: "HH:MM"}
+        now: Instant de référence (défaut: maintenant)
+
+    Returns:
+        Date de la prochaine génération, None sans planification
+    """
+    if not schedule or not schedule.get('time'):
+        return None
+    now = now or datetime.now()
+    hour, minute = (int(part) for part in str(schedule['time']).split(':'))
+    candidate = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    weekday = schedule.get('weekday')
+    if weekday:
+        days_ahead = (WEEKDAYS.index(weekday.lower()) - now.weekday()) % 7
+        candidate += timedelta(days=days_ahead)
+        if candidate <= now:
+            candidate += timedelta(days=7)
+    elif candidate <= now:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+class ServiceBusy(Exception):
+    """Une génération est déjà en cours"""
+
+
+class NewsletterService:
+    """Générateur gardé en mémoire; une génération à la fois (cache et journal partagés)"""
+
+    def __init__(self, config_path: str = "config/sources.yaml"):
+        """
+        Initialise le service
+
+        Args:
+            config_path: Chemin vers le fichier de configuration (lu une seule fois)
+        """
+        with open(config_path, 'r', encoding='utf-8') as f:
+            self.config = yaml.safe_load(f)
+        self.daemon_config = self.config.get('daemon', {}) or {}
+        self.generator = NewsletterGenerator(config=self.config)
+
+        self._run_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._scheduler = None
+        self.started_at = time.time()
+        self.current = None
+        self.last = None
+        self.runs = 0
+        self.next_run = None
+
+    def start_run(self, kind: str = 'run', editions: Optional[List[str]] = None,
+                  options: Optional[Dict] = None, wait: bool = False) -> Dict:
+        """
+        Lance une génération en arrière-plan
+
+        Args:
+            kind: 'run' (génération complète) ou 'rerank' (reclassement depuis le cache)
+            editions: Éditions à produire (toutes si None)
+            options: Options de NewsletterGenerator.run (complètent daemon.run)
+            wait: Attendre la fin de la génération
+
+        Returns:
+            Description de la génération lancée (ou terminée si wait)
+
+        Raises:
+            ValueError: Édition ou option inconnue
+            ServiceBusy: Génération déjà en cours
+        """
+        options = dict(options or {})
+        unknown = set(options) - RUN_OPTIONS
+        if unknown:
+            raise ValueError(f"Option(s) inconnue(s): {', '.join(sorted(unknown))}")
+        load_editions(self.config, editions)
+
+        run_options = {
+            key: value for key, value in (self.daemon_config.get('run', {}) or {}).items()
+            if key in RUN_OPTIONS and value is not None
+        }
+        run_options.update(options)
+
+        if not self._run_lock.acquire(blocking=False):
+            raise ServiceBusy(f"Génération en cours: {self.current}")
+
+        with self._state_lock:
+            self.current = {
+                'kind': kind,
+                'editions': editions,
+                'options': run_options,
+                'started_at': datetime.now().isoformat()
+            }
+            run = dict(self.current)
+
+        thread = threading.Thread(
+            target=self._execute, args=(kind, editions, run_options), name=f"newsletter-{kind}", daemon=True
+        )
+        thread.start()
+        if wait:
+            thread.join()
+            return self.last
+        return run
+
+    def _execute(self, kind: str, editions: Optional[List[str]], options: Dict):
+        """Exécute une génération avec le générateur chaud (verrou libéré à la fin)"""
+        started = time.monotonic()
+        result = {'kind': kind, 'editions': editions}
+        try:
+            logger.info(f"▶️  Génération déclenchée ({kind}, éditions: {', '.join(editions or ['toutes'])})")
+            outputs = self.generator.run(editions=editions, rerank=kind == 'rerank', **options)
+            result.update(status='success', outputs=outputs)
+        except Exception as e:
+            logger.error(f"❌ Génération {kind} échouée: {e}")
+            result.update(status='error', error=str(e))
+        finally:
+            result.update(
+                finished_at=datetime.now().isoformat(),
+                duration=round(time.monotonic() - started, 1)
+            )
+            with self._state_lock:
+                self.current = None
+                self.last = result
+                self.runs += 1
+            self._run_lock.release()
+
+    def status(self) -> Dict:
+        """État du service (génération en cours, dernière génération, planification)"""
+        with self._state_lock:
+            return {
+                'state': 'running' if self.current else 'idle',
+                'current': self.current,
+                'last': self.last,
+                'runs': self.runs,
+                'next_scheduled': self.next_run.isoformat() if self.next_run else None,
+                'editions': [edition['name'] for edition in load_editions(self.config)],
+                'uptime': round(time.time() - self.started_at)
+            }
+
+    def start_scheduler(self):
+        """Démarre la génération planifiée (daemon.schedule)"""
+        schedule = self.daemon_config.get('schedule')
+        if not next_scheduled(schedule):
+            logger.info("ℹ️  Pas de planification (daemon.schedule absent)")
+            return
+        self._scheduler = threading.Thread(target=self._schedule_loop, args=(schedule,),
+                                           name="newsletter-scheduler", daemon=True)
+        self._scheduler.start()
+
+    def _schedule_loop(self, schedule: Dict):
+        """Attend chaque échéance puis lance une génération complète"""
+        while not self._stop.is_set():
+            self.next_run = next_scheduled(schedule)
+            logger.info(f"⏰ Prochaine génération planifiée: {self.next_run:%Y-%m-%d %H:%M}")
+            if self._stop.wait(max(0.0, (self.next_run - datetime.now()).total_seconds())):
+                break
+            try:
+                self.start_run('run')
+            except ServiceBusy:
+                logger.warning("⚠️  Génération planifiée ignorée: une génération est déjà en cours")
+
+    def stop(self):
+        """Arrête la planification (une génération en cours se termine)"""
+        self._stop.set()
+
+
+class UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """Serveur HTTP sur socket Unix (accès limité par les permissions du fichier)"""
+    daemon_threads = True
+
+
+def make_handler(service: NewsletterService, token: Optional[str] = None):
+    """
+    Handler HTTP de l'API locale
+
+    Args:
+        service: Service à exposer
+        token: Jeton exigé sur les POST (Authorization: Bearer), aucun si None
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _reply(self, code: int, payload: Dict):
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip('/') == '/status':
+                self._reply(200, service.status())
+            else:
+                self._reply(404, {'error': f"Route inconnue: {self.path}"})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0) or 0))
+            kind = self.path.strip('/')
+            if kind not in ('run', 'rerank'):
+                self._reply(404, {'error': f"Route inconnue: {self.path}"})
+                return
+            # Type non "simple": un navigateur refuse l'envoi cross-origin sans pré-vérification
+            content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if content_type != 'application/json':
+                self._reply(415, {'error': "Content-Type: application/json requis"})
+                return
+            if token and not hmac.compare_digest(self.headers.get('Authorization', ''), f"Bearer {token}"):
+                self._reply(401, {'error': "Jeton invalide ou absent"})
+                return
+            try:
+                request = json.loads(body) if body else {}
+                if not isinstance(request, dict):
+                    raise ValueError("Le corps doit être un objet JSON")
+                editions = request.pop('editions', None)
+                wait = bool(request.pop('wait', False))
+                run = service.start_run(kind, editions, request, wait=wait)
+            except ServiceBusy as e:
+                self._reply(409, {'error': str(e)})
+            except (ValueError, AttributeError) as e:
+                self._reply(400, {'error': str(e)})
+            else:
+                self._reply(200 if wait else 202, run)
+
+        def log_message(self, format, *args):
+            logger.debug(f"API: {format % args}")
+
+    return Handler
+
+
+def make_server(service: NewsletterService, host: Optional[str] = None, port: Optional[int] = None,
+                socket_path: Optional[str] = None):
+    """
+    Crée le serveur de l'API locale
+
+    Args:
+        service: Service à exposer
+        host/port: Adresse HTTP (défaut: daemon.host/daemon.port)
+        socket_path: Socket Unix (prioritaire sur host/port)
+
+    Returns:
+        Serveur prêt pour serve_forever()
+    """
+    handler = make_handler(service, token=os.getenv('NEWSLETTER_DAEMON_TOKEN') or None)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # Socket d'une exécution précédente
+        server = UnixHTTPServer(socket_path, handler)
+        os.chmod(socket_path, 0o600)
+        logger.info(f"🔌 API locale sur le socket {socket_path}")
+        return server
+
+    host = host or service.daemon_config.get('host', '127.0.0.1')
+    port = port if port is not None else service.daemon_config.get('port', 8787)
+    server = ThreadingHTTPServer((host, port), handler)
+    logger.info(f"🔌 API locale sur http://{host}:{server.server_address[1]}")
+    return server
+
+
+def main():
+    """Point d'entrée du service"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Service de génération de la newsletter (clients gardés chauds)')
+    parser.add_argument('--config', default='config/sources.yaml', help='Fichier de configuration')
+    parser.add_argument('--host', default=None, help='Adresse de l\'API (défaut: daemon.host)')
+    parser.add_argument('--port', type=int, default=None, help='Port de l\'API (défaut: daemon.port)')
+    parser.add_argument('--socket', metavar='CHEMIN', default=None, help='Servir l\'API sur un socket Unix')
+    parser.add_argument('--no-schedule', action='store_true', help='Désactiver la génération planifiée')
+    parser.add_argument('--run-now', action='store_true', help='Lancer une génération au démarrage')
+    args = parser.parse_args()
+
+    service = NewsletterService(args.config)
+    server = make_server(service, args.host, args.port, args.socket)
+
+    if not args.no_schedule:
+        service.start_scheduler()
+    if args.run_now:
+        service.start_run('run')
+
+    # SIGTERM: arrêt propre (shutdown depuis un autre thread que serve_forever)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+        logger.info("👋 Service arrêté")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,9 @@ import os
 import sys
 import logging
 import json
+import yaml
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Ajouter le répertoire parent au path pour les imports
@@ -17,6 +19,14 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scripts.gmail_scraper import GmailScraper
 from scripts.ai_processor import AIProcessor
 from scripts.html_builder import HTMLBuilder
+from scripts.run_budget import RunBudget
+from scripts.cassette import Cassette, get_cassette, set_cassette
+from scripts.pipeline import Stage, StreamingPipeline
+from scripts.run_journal import RunJournal, FETCH, FETCH_COMPLETE, RANKING, ranking_key
+from scripts.record_store import RecordWriter, load_cached, save_list, save_source_map
+from scripts.article_record import ArticleRecord
+from scripts.editions import DEFAULT_EDITION, load_editions, sources_union, edition_articles
+from scripts.article_index import ArticleIndex
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -41,8 +51,14 @@ logger = logging.getLogger(__name__)
 class NewsletterGenerator:
     """Générateur de newsletter Growth Weekly"""
     
-    def __init__(self):
-        """Initialise le générateur"""
+    def __init__(self, config_path: str = 'config/sources.yaml', config: dict = None):
+        """
+        Initialise le générateur
+        
+        Args:
+            config_path: Chemin vers le fichier de configuration
+            config: Configuration déjà chargée (prioritaire sur config_path)
+        """
         logger.info("=" * 80)
         logger.info("🚀 DÉMARRAGE DU GÉNÉRATEUR DE NEWSLETTER GROWTH WEEKLY")
         logger.info("=" * 80)
@@ -50,43 +66,172 @@ class NewsletterGenerator:
         self.scraper = None
         self.ai_processor = None
         self.html_builder = None
+        self.budget = None
+        self.journal = None
+        self.low_memory = False
+        self.editions = []
+        self.scrape_sources = None
+        self.article_index = None
+        self.skip_published = True
+        self.record_published = False
+        
+        if config is None:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f)
+        self.config = config
         
         # Créer le dossier cache si nécessaire
         cache_dir = os.getenv('CACHE_DIR', 'cache')
         os.makedirs(cache_dir, exist_ok=True)
     
-    def run(self, use_cache: bool = False):
+    def run(self, use_cache: bool = False, max_cost: float = None, max_tokens: int = None,
+            deadline: float = None, streaming: bool = True, resume: bool = False,
+            low_memory: bool = False, editions: list = None, rerank: bool = False,
+            skip_published: bool = True) -> list:
         """
         Exécute le workflow complet de génération
         
         Args:
             use_cache: Utiliser les données en cache si disponibles
+            max_cost: Budget maximum en dollars (dégradation progressive au-delà)
+            max_tokens: Budget maximum en tokens Anthropic
+            deadline: Durée maximale de la génération en secondes
+            streaming: Enchaîner scraping, extraction et traduction en flux
+                       (sinon étapes successives; ignoré avec use_cache)
+            resume: Reprendre la génération précédente depuis son journal
+            low_memory: Mémoire bornée: corps des emails libérés après extraction,
+                        articles compacts jusqu'au classement (implique streaming)
+            editions: Noms des éditions à produire (toutes celles de `editions` si None)
+            rerank: Reclasser seulement: articles repris du cache, classement refait
+                    (ni cache ni journal de classement)
+            skip_published: Écarter avant classement les articles des numéros précédents
+            
+        Returns:
+            Chemins des fichiers HTML générés, un par édition
         """
+        self.budget = RunBudget(max_cost=max_cost, max_tokens=max_tokens, deadline=deadline)
+        if self.ai_processor:
+            # Processeur réutilisé (mode service): métriques propres à cette génération
+            self.ai_processor.reset_metrics()
+        self.editions = load_editions(self.config, editions)
+        
+        # Union des sources des éditions, scrapée et extraite une seule fois
+        sources = self.config.get('sources', [])
+        union = sources_union(self.editions, sources)
+        self.scrape_sources = None if len(union) == len(sources) else union
+        if len(self.editions) > 1 or self.editions[0]['name'] != DEFAULT_EDITION['name']:
+            logger.info(
+                f"📚 Éditions: {', '.join(e['name'] for e in self.editions)} "
+                f"({len(union)} source(s) partagée(s))"
+            )
+        self.low_memory = low_memory
+        self.skip_published = skip_published
+        # Historique alimenté par les seules vraies générations (ni rejeu, ni cache, ni reclassement)
+        self.record_published = not (get_cassette().replaying or use_cache or rerank)
+        if not self.record_published:
+            logger.info("🗂️  Génération non enregistrée dans l'historique (rejeu, cache ou reclassement)")
+        if not self.article_index:
+            # Historique ouvert une fois (réutilisé en mode service)
+            self.article_index = ArticleIndex.from_config(self.config.get('article_index'))
+        # Reclassement: journal repris sans être tronqué (une génération interrompue reste reprenable)
+        self.journal = RunJournal(resume=resume or rerank, retain=not low_memory)
+        
+        if low_memory and not streaming:
+            logger.info("🧠 Mode mémoire bornée: traitement en flux activé")
+            streaming = True
+        
+        if rerank:
+            logger.info("🔁 Reclassement seul: articles repris du cache")
+        
         try:
-            # Étape 1: Scraping Gmail
-            emails_by_source = self._step_1_scrape_emails(use_cache)
+            if streaming and not use_cache and not rerank:
+                # Étapes 1-2: chaque email est traité dès sa récupération
+                all_articles = self._step_1_2_stream()
+            else:
+                # Étape 1: Scraping Gmail
+                emails_by_source = self._step_1_scrape_emails(use_cache or rerank)
+                
+                # Étape 2: Traitement IA
+                all_articles = self._step_2_process_with_ai(emails_by_source, use_cache or rerank)
             
-            # Étape 2: Traitement IA
-            all_articles = self._step_2_process_with_ai(emails_by_source, use_cache)
+            # Étapes 3-4 par édition, en parallèle, depuis le pool d'articles partagé
+            self._get_processor()
+            if not self.html_builder:
+                self.html_builder = HTMLBuilder()
             
-            # Étape 3: Classement et catégorisation
-            ranked_articles = self._step_3_rank_and_categorize(all_articles, use_cache)
-            
-            # Étape 4: Génération HTML
-            output_path = self._step_4_generate_html(ranked_articles)
+            with ThreadPoolExecutor(max_workers=len(self.editions)) as executor:
+                outputs = list(executor.map(
+                    lambda edition: self._rank_and_render(edition, all_articles, use_cache, rerank),
+                    self.editions
+                ))
             
             # Résumé final
-            self._print_summary(ranked_articles, output_path)
+            for edition, (ranked_articles, output_path) in zip(self.editions, outputs):
+                self._print_summary(ranked_articles, output_path, edition)
+            self._print_metrics()
             
             logger.info("=" * 80)
             logger.info("✅ GÉNÉRATION TERMINÉE AVEC SUCCÈS")
             logger.info("=" * 80)
             
-            return output_path
+            return [output_path for _, output_path in outputs]
             
         except Exception as e:
             logger.error(f"❌ ERREUR LORS DE LA GÉNÉRATION: {e}", exc_info=True)
+            logger.info("💡 Relancer avec --resume pour reprendre au premier élément non terminé")
             raise
+        finally:
+            self.journal.log_summary()
+            self.journal.close()
+    
+    def _get_scraper(self) -> GmailScraper:
+        """Scraper Gmail, authentifié une seule fois (réutilisé d'une génération à l'autre)"""
+        if not self.scraper:
+            self.scraper = GmailScraper(config=self.config)
+        return self.scraper
+    
+    def _get_processor(self) -> AIProcessor:
+        """Processeur IA, client Anthropic et ordonnanceur créés une seule fois"""
+        if not self.ai_processor:
+            self.ai_processor = AIProcessor(config=self.config)
+        return self.ai_processor
+    
+    def _scrape_or_replay(self, on_records=None) -> dict:
+        """
+        Récupère les emails, ou les rejoue si le journal contient une récupération complète
+        
+        Args:
+            on_records: Appelée avec (nom_source, enregistrements) au fil de la récupération
+            
+        Returns:
+            Dictionnaire {nom_source: [emails]}
+        """
+        if self.journal.fetch_complete:
+            logger.info("♻️  Emails repris depuis le journal")
+            emails_by_source = self.journal.fetched()
+            if on_records:
+                for source_name, records in emails_by_source.items():
+                    if records:
+                        on_records(source_name, records)
+            return emails_by_source
+        
+        def journal_records(source_name, records):
+            self.journal.record(FETCH, source_name, records)
+            if on_records:
+                on_records(source_name, records)
+        
+        self.journal.restart_fetch()
+        emails_by_source = self._get_scraper().scrape_all_sources(on_records=journal_records, only=self.scrape_sources)
+        self.journal.record(FETCH_COMPLETE, 'all', True)
+        return emails_by_source
+    
+    def _load_legacy_cache(self, cache_file: str):
+        """Lit un ancien cache JSON (avant le format compact), None s'il n'existe pas"""
+        if not os.path.exists(cache_file):
+            return None
+        logger.info(f"📦 Chargement depuis l'ancien cache JSON: {cache_file}")
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
     
     def _step_1_scrape_emails(self, use_cache: bool = False) -> dict:
         """Étape 1: Scraping des emails depuis Gmail"""
@@ -94,23 +239,24 @@ class NewsletterGenerator:
         logger.info("ÉTAPE 1/4: SCRAPING DES EMAILS GMAIL")
         logger.info("=" * 80)
         
-        cache_file = 'cache/emails.json'
-        
-        if use_cache and os.path.exists(cache_file):
-            logger.info(f"📦 Chargement des emails depuis le cache: {cache_file}")
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        cache_path = 'cache/emails'
         
-        # Initialiser le scraper
-        self.scraper = GmailScraper()
+        if use_cache:
+            store = load_cached(cache_path)
+            if store:
+                # Corps des emails décompressés à la demande, source par source
+                logger.info(f"📦 Chargement des emails depuis le cache: {cache_path} ({len(store)} email(s))")
+                return store.as_source_map()
+            emails_by_source = self._load_legacy_cache('cache/emails.json')
+            if emails_by_source is not None:
+                return emails_by_source
         
-        # Scraper toutes les sources
-        emails_by_source = self.scraper.scrape_all_sources()
+        # Scraper toutes les sources (chaque source journalisée dès sa récupération)
+        emails_by_source = self._scrape_or_replay()
         
         # Sauvegarder en cache
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(emails_by_source, f, ensure_ascii=False, indent=2)
-        logger.info(f"💾 Emails sauvegardés en cache: {cache_file}")
+        save_source_map(cache_path, emails_by_source)
+        logger.info(f"💾 Emails sauvegardés en cache: {cache_path}")
         
         return emails_by_source
     
@@ -120,71 +266,168 @@ class NewsletterGenerator:
         logger.info("ÉTAPE 2/4: TRAITEMENT AVEC L'IA (EXTRACTION & TRADUCTION)")
         logger.info("=" * 80)
         
-        cache_file = 'cache/articles.json'
-        
-        if use_cache and os.path.exists(cache_file):
-            logger.info(f"📦 Chargement des articles depuis le cache: {cache_file}")
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        cache_path = 'cache/articles'
         
-        # Initialiser le processeur IA
-        self.ai_processor = AIProcessor()
+        if use_cache:
+            store = load_cached(cache_path)
+            if store:
+                logger.info(f"📦 Chargement des articles depuis le cache: {cache_path}")
+                return list(store)
+            all_articles = self._load_legacy_cache('cache/articles.json')
+            if all_articles is not None:
+                return all_articles
         
         # Traiter tous les emails
-        all_articles = self.ai_processor.process_all_emails(emails_by_source)
+        all_articles = self._get_processor().process_all_emails(
+            emails_by_source, budget=self.budget, journal=self.journal
+        )
         
         # Sauvegarder en cache
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(all_articles, f, ensure_ascii=False, indent=2)
-        logger.info(f"💾 Articles sauvegardés en cache: {cache_file}")
+        save_list(cache_path, all_articles)
+        logger.info(f"💾 Articles sauvegardés en cache: {cache_path}")
         
         return all_articles
     
-    def _step_3_rank_and_categorize(self, all_articles: list, use_cache: bool = False) -> list:
-        """Étape 3: Classement et catégorisation"""
+    def _step_1_2_stream(self) -> list:
+        """Étapes 1-2 en flux: scraping, extraction et traduction reliés par des files bornées"""
         logger.info("\n" + "=" * 80)
-        logger.info("ÉTAPE 3/4: CLASSEMENT ET CATÉGORISATION")
+        logger.info("ÉTAPES 1-2/4: SCRAPING ET TRAITEMENT IA EN FLUX")
         logger.info("=" * 80)
         
-        cache_file = 'cache/ranked_articles.json'
+        self._get_processor()
         
-        if use_cache and os.path.exists(cache_file):
-            logger.info(f"📦 Chargement des articles classés depuis le cache: {cache_file}")
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        # Pas d'estimation préalable: les emails ne sont pas encore connus
+        self.budget.configure(self.ai_processor.config.get('budget'))
+        if self.budget.enabled:
+            logger.info("📐 Budget contrôlé au fil de l'eau (pas d'estimation préalable en flux)")
         
-        # Utiliser le même processeur IA pour le classement
-        if not self.ai_processor:
-            self.ai_processor = AIProcessor()
+        pipeline_config = self.ai_processor.config.get('pipeline', {}) or {}
+        workers = pipeline_config.get('workers', {}) or {}
+        queue_size = pipeline_config.get('queue_size', 20)
+        
+        pipeline = StreamingPipeline([
+            Stage('extraction', self._extract_streamed, workers=workers.get('extraction', 3), queue_size=queue_size),
+            Stage('translation', self._finalize_streamed, workers=workers.get('translation', 4), queue_size=queue_size),
+        ])
+        pipeline.start()
+        
+        # Cache des emails écrit au fil de l'eau (les corps peuvent être libérés ensuite)
+        emails_cache = RecordWriter('cache/emails')
+        
+        def on_records(source_name, records):
+            for record in records:
+                emails_cache.append(source_name, record)
+                pipeline.put((source_name, record))
+        
+        try:
+            self._scrape_or_replay(on_records=on_records)
+        finally:
+            # Vidange des étapes (y compris si le scraping échoue)
+            all_articles = pipeline.close()
+        
+        pipeline.log_report('fetch')
+        self.ai_processor.metrics.record_pipeline(pipeline.report('fetch'))
+        logger.info(f"✅ Traitement terminé: {len(all_articles)} articles extraits au total")
         
-        # Classer les articles
-        ranked_articles = self.ai_processor.rank_and_categorize(all_articles)
+        # Sauvegarder en cache (reprise via --use-cache)
+        emails_cache.close()
+        save_list('cache/articles', all_articles)
+        logger.info("💾 Emails et articles sauvegardés en cache: cache/emails, cache/articles")
+        
+        return all_articles
+    
+    def _extract_streamed(self, job: tuple) -> list:
+        """Étape extraction du flux: (source, email) -> articles"""
+        source_name, email = job
+        articles = self.ai_processor.extract_email(email, source_name, self.budget, self.journal)
+        if self.low_memory:
+            # Corps inutiles une fois les articles extraits (déjà en cache et au journal)
+            for field in ('content', 'html', 'content_class'):
+                email.pop(field, None)
+        return articles
+    
+    def _finalize_streamed(self, article: dict) -> list:
+        """Étape traduction du flux: article -> article final (compact en mode mémoire bornée)"""
+        article = self.ai_processor.finalize_article(article, self.budget, self.journal)
+        return [ArticleRecord.from_dict(article) if self.low_memory else article]
+    
+    def _rank_and_render(self, edition: dict, all_articles: list, use_cache: bool = False,
+                         rerank: bool = False) -> tuple:
+        """Étapes 3-4 d'une édition: (articles classés, fichier HTML)"""
+        articles = edition_articles(edition, all_articles, self.config.get('sources', []))
+        if self.article_index and self.skip_published:
+            across_editions = (self.config.get('article_index', {}) or {}).get('scope') == 'all'
+            articles = self.article_index.filter_published(
+                articles, edition=None if across_editions else edition['name']
+            )
+        ranked_articles = self._step_3_rank_and_categorize(articles, use_cache, edition, rerank)
+        output_path = self._step_4_generate_html(ranked_articles, edition)
+        if self.article_index and self.record_published:
+            self.article_index.record_issue(edition['name'], ranked_articles)
+        return ranked_articles, output_path
+    
+    def _step_3_rank_and_categorize(self, all_articles: list, use_cache: bool = False,
+                                    edition: dict = None, rerank: bool = False) -> list:
+        """Étape 3: Classement et catégorisation (d'une édition, refait si rerank)"""
+        edition = edition or DEFAULT_EDITION
+        logger.info("\n" + "=" * 80)
+        logger.info(f"ÉTAPE 3/4: CLASSEMENT ET CATÉGORISATION ({edition['name']})")
+        logger.info("=" * 80)
+        
+        # Édition historique: cache inchangé; autres éditions: un cache chacune
+        default = edition['name'] == DEFAULT_EDITION['name']
+        cache_path = 'cache/ranked_articles' if default else f"cache/ranked_articles-{edition['name']}"
+        
+        if use_cache and not rerank:
+            store = load_cached(cache_path)
+            if store:
+                logger.info(f"📦 Chargement des articles classés depuis le cache: {cache_path}")
+                return list(store)
+            ranked_articles = self._load_legacy_cache('cache/ranked_articles.json') if default else None
+            if ranked_articles is not None:
+                return ranked_articles
+        
+        # Classer les articles (repris du journal si déjà fait pour cette édition et ces articles)
+        key = f"{edition['name']}:{ranking_key(all_articles)}"
+        ranked_articles = None if rerank else self.journal.get(RANKING, key)
+        if ranked_articles is None:
+            ranked_articles = self._get_processor().rank_and_categorize(
+                all_articles, budget=self.budget, balancing=edition.get('balancing')
+            )
+            self.journal.record(RANKING, key, ranked_articles)
         
         # Sauvegarder en cache
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(ranked_articles, f, ensure_ascii=False, indent=2)
-        logger.info(f"💾 Articles classés sauvegardés en cache: {cache_file}")
+        save_list(cache_path, ranked_articles)
+        logger.info(f"💾 Articles classés sauvegardés en cache: {cache_path}")
         
         return ranked_articles
     
-    def _step_4_generate_html(self, ranked_articles: list) -> str:
-        """Étape 4: Génération du HTML"""
+    def _step_4_generate_html(self, ranked_articles: list, edition: dict = None) -> str:
+        """Étape 4: Génération du HTML (d'une édition)"""
+        edition = edition or DEFAULT_EDITION
         logger.info("\n" + "=" * 80)
-        logger.info("ÉTAPE 4/4: GÉNÉRATION DU HTML")
+        logger.info(f"ÉTAPE 4/4: GÉNÉRATION DU HTML ({edition['name']})")
         logger.info("=" * 80)
         
-        # Initialiser le builder HTML
-        self.html_builder = HTMLBuilder()
+        # Initialiser le builder HTML (une fois)
+        if not self.html_builder:
+            self.html_builder = HTMLBuilder()
         
         # Générer le HTML
-        output_path = self.html_builder.generate_html(ranked_articles)
+        output_path = self.html_builder.generate_html(
+            ranked_articles,
+            title=edition['title'],
+            subtitle=edition['subtitle'],
+            slug=edition['name']
+        )
         
         return output_path
     
-    def _print_summary(self, ranked_articles: list, output_path: str):
-        """Affiche un résumé de la génération"""
+    def _print_summary(self, ranked_articles: list, output_path: str, edition: dict = None):
+        """Affiche un résumé de la génération (d'une édition)"""
+        edition = edition or DEFAULT_EDITION
         logger.info("\n" + "=" * 80)
-        logger.info("📊 RÉSUMÉ DE LA GÉNÉRATION")
+        logger.info(f"📊 RÉSUMÉ DE LA GÉNÉRATION: {edition['title']}")
         logger.info("=" * 80)
         
         # Compter les articles par catégorie
@@ -213,16 +456,21 @@ class NewsletterGenerator:
         for source, count in sorted(sources_count.items(), key=lambda x: x[1], reverse=True):
             logger.info(f"   {source}: {count} article(s)")
         
+        logger.info(f"\n📄 Fichier généré: {output_path}")
+        logger.info(f"🌐 Ouvrir dans le navigateur: file://{os.path.abspath(output_path)}")
+    
+    def _print_metrics(self):
+        """Affiche et sauvegarde les métriques de la génération (toutes éditions)"""
         # Afficher les métriques API si disponibles
         if self.ai_processor and hasattr(self.ai_processor, 'metrics'):
             logger.info("\n" + "=" * 80)
             logger.info("📊 MÉTRIQUES API & OPTIMISATIONS")
             logger.info("=" * 80)
+            if self.budget and self.budget.enabled:
+                self.ai_processor.metrics.record_budget(self.budget.report())
+            self.ai_processor.metrics.record_peak_rss()
             self.ai_processor.metrics.print_summary()
             self.ai_processor.metrics.save_metrics()
-        
-        logger.info(f"\n📄 Fichier généré: {output_path}")
-        logger.info(f"🌐 Ouvrir dans le navigateur: file://{os.path.abspath(output_path)}")
 
 
 def main():
@@ -234,9 +482,51 @@ def main():
                        help='Utiliser les données en cache si disponibles')
     parser.add_argument('--clear-cache', action='store_true',
                        help='Effacer le cache avant de commencer')
+    parser.add_argument('--max-cost', type=float, default=None,
+                       help='Budget maximum en dollars (dégradation progressive au-delà)')
+    parser.add_argument('--max-tokens', type=int, default=None,
+                       help='Budget maximum en tokens Anthropic')
+    parser.add_argument('--deadline', type=float, default=None,
+                       help='Durée maximale de la génération en secondes')
+    parser.add_argument('--resume', action='store_true',
+                       help='Reprendre la génération interrompue depuis son journal (cache/journal.jsonl)')
+    parser.add_argument('--edition', action='append', metavar='NOM', default=None,
+                       help="Édition à produire (répétable; toutes les éditions configurées par défaut)")
+    parser.add_argument('--rerank', action='store_true',
+                       help='Reclasser seulement (articles du cache, classement refait)')
+    parser.add_argument('--include-published', action='store_true',
+                       help='Ne pas écarter les articles déjà publiés (historique metrics/article_index.db)')
+    parser.add_argument('--low-memory', action='store_true',
+                       help='Mémoire bornée (gros volumes): corps des emails libérés après extraction')
+    parser.add_argument('--no-streaming', action='store_true',
+                       help='Étapes successives (scraping complet avant tout traitement IA)')
+    parser.add_argument('--record', metavar='DIR', default=None,
+                       help='Enregistrer les appels Anthropic/Gmail/Firecrawl dans une cassette')
+    parser.add_argument('--replay', metavar='DIR', default=None,
+                       help='Rejouer une cassette enregistrée (sans réseau)')
+    parser.add_argument('--replay-latency', type=float, default=0.0,
+                       help='Latence injectée par appel rejoué (secondes)')
+    parser.add_argument('--replay-error-rate', type=float, default=0.0,
+                       help="Taux d'erreurs transitoires injectées en rejeu (0-1)")
+    parser.add_argument('--replay-seed', type=int, default=0,
+                       help='Graine pour un rejeu déterministe')
     
     args = parser.parse_args()
     
+    # Cassette record/replay
+    if args.record and args.replay:
+        parser.error("--record et --replay sont incompatibles")
+    if args.record:
+        set_cassette(Cassette(mode='record', path=args.record))
+    elif args.replay:
+        set_cassette(Cassette(
+            mode='replay',
+            path=args.replay,
+            latency=args.replay_latency,
+            error_rate=args.replay_error_rate,
+            seed=args.replay_seed
+        ))
+    
     # Effacer le cache si demandé
     if args.clear_cache:
         import shutil
@@ -248,11 +538,23 @@ def main():
     
     # Générer la newsletter
     generator = NewsletterGenerator()
-    output_path = generator.run(use_cache=args.use_cache)
+    output_paths = generator.run(
+        use_cache=args.use_cache,
+        max_cost=args.max_cost,
+        max_tokens=args.max_tokens,
+        deadline=args.deadline,
+        streaming=not args.no_streaming,
+        resume=args.resume,
+        low_memory=args.low_memory,
+        editions=args.edition,
+        rerank=args.rerank,
+        skip_published=not args.include_published
+    )
     
     print(f"\n✅ Newsletter générée avec succès!")
-    print(f"📄 Fichier: {output_path}")
-    print(f"🌐 Ouvrir: file://{os.path.abspath(output_path)}")
+    for output_path in output_paths:
+        print(f"📄 Fichier: {output_path}")
+        print(f"🌐 Ouvrir: file://{os.path.abspath(output_path)}")
 
 
 if __name__ == "__main__":
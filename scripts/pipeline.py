@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Pipeline en flux - Étapes producteur/consommateur reliées par des files bornées
+Chaque élément passe à l'étape suivante dès qu'il est prêt (pas de barrière entre étapes)
+"""
+
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Marqueur de fin de flux (un par worker)
+_DONE = object()
+
+
+class Stage:
+    """Étape du pipeline: fonction élément -> éléments suivants, exécutée par N workers"""
+
+    def __init__(self, name: str, fn: Callable[[Any], Iterable[Any]], workers: int = 1,
+                 queue_size: int = 20):
+        """
+        Initialise l'étape
+
+        Args:
+            name: Nom de l'étape (rapport)
+            fn: Traitement d'un élément, retourne les éléments transmis à l'étape suivante
+            workers: Nombre de workers
+            queue_size: Taille de la file d'entrée (pression arrière au-delà)
+        """
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.queue = queue.Queue(maxsize=max(1, queue_size))
+
+        self._lock = threading.Lock()
+        self._alive = self.workers
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.first_start = None
+        self.last_end = None
+        self.depth_total = 0
+        self.depth_max = 0
+
+    def _put(self, entry: Any):
+        """
+        Ajoute à la file (bloquant si pleine)
+
+        Raises:
+            RuntimeError: Tous les workers de l'étape sont arrêtés (file plus jamais vidée)
+        """
+        while True:
+            if self._alive == 0:
+                raise RuntimeError(f"Étape {self.name} arrêtée")
+            try:
+                self.queue.put(entry, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def put(self, key: tuple, item: Any):
+        """Ajoute un élément (bloquant si la file est pleine) et mesure la profondeur"""
+        self._put((key, item))
+        depth = self.queue.qsize()
+        with self._lock:
+            self.items_in += 1
+            self.depth_total += depth
+            self.depth_max = max(self.depth_max, depth)
+
+    def report(self) -> Dict:
+        """Débit et profondeur de file de l'étape"""
+        active = (self.last_end - self.first_start) if self.first_start and self.last_end else 0.0
+        return {
+            'workers': self.workers,
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'errors': self.errors,
+            'busy_seconds': round(self.busy, 2),
+            'active_seconds': round(active, 2),
+            'throughput': self.items_in / active if active else 0.0,
+            'queue_depth_avg': self.depth_total / self.items_in if self.items_in else 0.0,
+            'queue_depth_max': self.depth_max
+        }
+
+
+class StreamingPipeline:
+    """Enchaîne des étapes; les sorties de la dernière sont collectées dans l'ordre d'entrée"""
+
+    def __init__(self, stages: List[Stage]):
+        """
+        Initialise le pipeline
+
+        Args:
+            stages: Étapes dans l'ordre de passage
+        """
+        self.stages = stages
+        self.results = []
+        self._results_lock = threading.Lock()
+        self._threads = []
+        self._produced = 0
+        self._start_time = None
+        self._end_time = None
+
+    def start(self):
+        """Démarre les workers de toutes les étapes"""
+        self._start_time = time.monotonic()
+        for index, stage in enumerate(self.stages):
+            for i in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work, args=(index,), name=f"{stage.name}-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def put(self, item: Any):
+        """Injecte un élément en tête du pipeline (bloquant si la première file est pleine)"""
+        self.stages[0].put((self._produced,), item)
+        self._produced += 1
+
+    def _emit(self, index: int, key: tuple, outputs: Iterable[Any]) -> int:
+        """Transmet les sorties d'un élément à l'étape suivante (ou aux résultats)"""
+        count = 0
+        for j, output in enumerate(outputs or []):
+            if index + 1 < len(self.stages):
+                self.stages[index + 1].put(key + (j,), output)
+            else:
+                with self._results_lock:
+                    self.results.append((key + (j,), output))
+            count += 1
+        return count
+
+    def _work(self, index: int):
+        """Boucle d'un worker: traite jusqu'au marqueur de fin"""
+        stage = self.stages[index]
+        try:
+            while True:
+                entry = stage.queue.get()
+                if entry is _DONE:
+                    break
+                key, item = entry
+
+                started = time.monotonic()
+                with stage._lock:
+                    if stage.first_start is None:
+                        stage.first_start = started
+                produced = 0
+                try:
+                    produced = self._emit(index, key, stage.fn(item))
+                except Exception as e:
+                    logger.error(f"❌ Étape {stage.name}: élément ignoré ({e})", exc_info=True)
+                    with stage._lock:
+                        stage.errors += 1
+                except BaseException:
+                    # Interruption (KeyboardInterrupt, SystemExit...): élément compté en erreur,
+                    # relancée après la transmission de la fin ci-dessous
+                    with stage._lock:
+                        stage.errors += 1
+                    raise
+                finally:
+                    ended = time.monotonic()
+                    with stage._lock:
+                        stage.items_out += produced
+                        stage.busy += ended - started
+                        stage.last_end = ended
+        finally:
+            # Le dernier worker de l'étape propage la fin à l'étape suivante (même interrompu,
+            # sinon close() attendrait indéfiniment)
+            with stage._lock:
+                stage._alive -= 1
+                last = stage._alive == 0
+            if last and index + 1 < len(self.stages):
+                self._finish(self.stages[index + 1])
+
+    @staticmethod
+    def _finish(stage: Stage):
+        """Envoie un marqueur de fin à chaque worker d'une étape (ignoré si elle est arrêtée)"""
+        try:
+            for _ in range(stage.workers):
+                stage._put(_DONE)
+        except RuntimeError:
+            pass
+
+    def close(self) -> List[Any]:
+        """
+        Signale la fin du flux et attend la vidange de toutes les étapes
+
+        Returns:
+            Sorties de la dernière étape, dans l'ordre des éléments injectés
+        """
+        self._finish(self.stages[0])
+        for thread in self._threads:
+            thread.join()
+        self._end_time = time.monotonic()
+        return [output for _, output in sorted(self.results, key=lambda entry: entry[0])]
+
+    def report(self, producer: Optional[str] = None) -> Dict:
+        """
+        Rapport par étape (débit, profondeur de file, erreurs)
+
+        Args:
+            producer: Nom de l'étape productrice (éléments injectés via put)
+
+        Returns:
+            {'elapsed', 'stages': {nom: {...}}}
+        """
+        elapsed = (self._end_time or time.monotonic()) - (self._start_time or time.monotonic())
+        stages = {}
+        if producer:
+            stages[producer] = {
+                'workers': 1,
+                'items_in': self._produced,
+                'items_out': self._produced,
+                'errors': 0,
+                'busy_seconds': round(elapsed, 2),
+                'active_seconds': round(elapsed, 2),
+                'throughput': self._produced / elapsed if elapsed else 0.0,
+                'queue_depth_avg': 0.0,
+                'queue_depth_max': 0
+            }
+        for stage in self.stages:
+            stages[stage.name] = stage.report()
+        return {'elapsed': round(elapsed, 1), 'stages': stages}
+
+    def log_report(self, producer: Optional[str] = None):
+        """Journalise le rapport par étape"""
+        report = self.report(producer)
+        logger.info(f"🔀 Pipeline en flux: {report['elapsed']}s")
+        for name, stage in report['stages'].items():
+            logger.info(
+                f"   {name}: {stage['items_in']} → {stage['items_out']} | {stage['workers']} worker(s) | "
+                f"{stage['throughput']:.2f}/s | file moy. {stage['queue_depth_avg']:.1f}, "
+                f"max {stage['queue_depth_max']}"
+            )
+
+
+def main():
+    """Test du pipeline avec des étapes simulées"""
+    def extract(email):
+        time.sleep(0.1)
+        return [f"{email}-article{i}" for i in range(3)]
+
+    def translate(article):
+        time.sleep(0.05)
+        return [article.upper()]
+
+    pipeline = StreamingPipeline([
+        Stage('extraction', extract, workers=3, queue_size=5),
+        Stage('translation', translate, workers=4, queue_size=10)
+    ])
+    pipeline.start()
+    for i in range(10):
+        pipeline.put(f"email{i}")
+    results = pipeline.close()
+    pipeline.log_report('fetch')
+    print(f"\n✅ {len(results)} articles: {results[:4]}...")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Ordonnanceur partagé des appels Anthropic
+Admet les appels selon des budgets requêtes/minute et tokens/minute
+et réessaie les erreurs transitoires avec backoff exponentiel + jitter
+"""
+
+import time
+import random
+import logging
+import threading
+from collections import deque
+from typing import Dict, Callable, Tuple, Any, Optional
+
+import anthropic
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# Codes HTTP considérés comme transitoires (timeout, conflit, rate limit, surcharge)
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation grossière du nombre de tokens (~4 caractères par token)"""
+    return max(1, len(text) // 4)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Détermine si une erreur API mérite un nouvel essai
+
+    Args:
+        error: Exception levée par le client Anthropic
+
+    Returns:
+        True si l'erreur est transitoire
+    """
+    if isinstance(error, anthropic.APIConnectionError):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    return status_code in TRANSIENT_STATUS_CODES
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Lit l'en-tête retry-after d'une erreur API si présent"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('retry-after')
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Fenêtre glissante d'une minute sur requêtes et tokens, partagée entre threads"""
+
+    WINDOW = 60.0
+
+    def __init__(self, requests_per_minute: int = 50,
+                 input_tokens_per_minute: int = 40000,
+                 output_tokens_per_minute: int = 8000,
+                 max_retries: int = 4,
+                 base_delay: float = 1.0,
+                 max_delay: float = 30.0):
+        """
+        Initialise l'ordonnanceur
+
+        Args:
+            requests_per_minute: Budget de requêtes par minute
+            input_tokens_per_minute: Budget de tokens input par minute
+            output_tokens_per_minute: Budget de tokens output par minute
+            max_retries: Nombre max de nouveaux essais sur erreur transitoire
+            base_delay: Délai de base du backoff (secondes)
+            max_delay: Délai max du backoff (secondes)
+        """
+        self.rpm = requests_per_minute
+        self.input_tpm = input_tokens_per_minute
+        self.output_tpm = output_tokens_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        # Entrées de la fenêtre: [timestamp, tokens_input, tokens_output]
+        self._window = deque()
+        self._condition = threading.Condition()
+        self._paused_until = 0.0
+
+        self._stats = {
+            'calls': 0,
+            'retries': 0,
+            'queue_wait_total': 0.0,
+            'queue_wait_max': 0.0
+        }
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> 'RateLimiter':
+        """Construit l'ordonnanceur depuis la section `rate_limits` de sources.yaml"""
+        config = config or {}
+        return cls(
+            requests_per_minute=config.get('requests_per_minute', 50),
+            input_tokens_per_minute=config.get('input_tokens_per_minute', 40000),
+            output_tokens_per_minute=config.get('output_tokens_per_minute', 8000),
+            max_retries=config.get('max_retries', 4),
+            base_delay=config.get('base_delay', 1.0),
+            max_delay=config.get('max_delay', 30.0)
+        )
+
+    def _purge(self, now: float):
+        """Retire les entrées sorties de la fenêtre"""
+        while self._window and now - self._window[0][0] >= self.WINDOW:
+            self._window.popleft()
+
+    def _fits(self, input_tokens: int, output_tokens: int) -> bool:
+        """Vérifie si une requête tient dans les budgets courants"""
+        if not self._window:
+            # Fenêtre vide: toujours admettre (même une requête plus grosse que le budget)
+            return True
+        used_input = sum(entry[1] for entry in self._window)
+        used_output = sum(entry[2] for entry in self._window)
+        return (len(self._window) + 1 <= self.rpm
+                and used_input + input_tokens <= self.input_tpm
+                and used_output + output_tokens <= self.output_tpm)
+
+    def acquire(self, input_tokens: int, output_tokens: int) -> Tuple[list, float]:
+        """
+        Attend qu'une requête puisse être admise et la réserve
+
+        Args:
+            input_tokens: Tokens input estimés
+            output_tokens: Tokens output estimés (max_tokens)
+
+        Returns:
+            Tuple (réservation, temps d'attente en secondes)
+        """
+        start = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._purge(now)
+                if now >= self._paused_until and self._fits(input_tokens, output_tokens):
+                    entry = [now, input_tokens, output_tokens]
+                    self._window.append(entry)
+                    break
+                if now < self._paused_until:
+                    timeout = self._paused_until - now
+                else:
+                    timeout = max(0.05, self._window[0][0] + self.WINDOW - now)
+                self._condition.wait(timeout)
+
+            waited = time.monotonic() - start
+            self._stats['queue_wait_total'] += waited
+            self._stats['queue_wait_max'] = max(self._stats['queue_wait_max'], waited)
+        return entry, waited
+
+    def settle(self, entry: list, input_tokens: int, output_tokens: int):
+        """
+        Corrige une réservation avec l'usage réel (message.usage)
+
+        Args:
+            entry: Réservation retournée par acquire
+            input_tokens: Tokens input réellement consommés
+            output_tokens: Tokens output réellement consommés
+        """
+        with self._condition:
+            entry[1] = input_tokens
+            entry[2] = output_tokens
+            self._condition.notify_all()
+
+    def _pause(self, delay: float):
+        """Suspend toutes les admissions (ex: après un 429)"""
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    def _backoff(self, attempt: int) -> float:
+        """Backoff exponentiel avec full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, fn: Callable[[], Any], input_tokens: int, output_tokens: int,
+             usage_of: Callable[[Any], Tuple[int, int]]) -> Tuple[Any, Dict]:
+        """
+        Exécute un appel en respectant les budgets, avec nouveaux essais
+
+        Args:
+            fn: Appel API à exécuter
+            input_tokens: Tokens input estimés
+            output_tokens: Tokens output estimés
+            usage_of: Extrait (tokens_input, tokens_output) réels du résultat
+
+        Returns:
+            Tuple (résultat, {'queue_wait', 'latency', 'attempts'})
+        """
+        queue_wait = 0.0
+        attempt = 0
+        while True:
+            entry, waited = self.acquire(input_tokens, output_tokens)
+            queue_wait += waited
+            start = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                # La requête rejetée ne consomme pas d'output
+                self.settle(entry, input_tokens, 0)
+                if not is_transient_error(e) or attempt >= self.max_retries:
+                    raise
+                delay = _retry_after(e) or self._backoff(attempt)
+                if getattr(e, 'status_code', None) in (429, 529):
+                    self._pause(delay)
+                attempt += 1
+                with self._condition:
+                    self._stats['retries'] += 1
+                logger.warning(f"  🔁 Erreur transitoire ({e.__class__.__name__}), nouvel essai {attempt}/{self.max_retries} dans {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            latency = time.monotonic() - start
+            self.settle(entry, *usage_of(result))
+            with self._condition:
+                self._stats['calls'] += 1
+            return result, {'queue_wait': queue_wait, 'latency': latency, 'attempts': attempt + 1}
+
+    def stats(self) -> Dict:
+        """Statistiques d'ordonnancement (attente en file, nouveaux essais)"""
+        with self._condition:
+            stats = dict(self._stats)
+        stats['queue_wait_avg'] = stats['queue_wait_total'] / stats['calls'] if stats['calls'] else 0.0
+        return stats
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Record Store - Cache compact des étapes (emails, articles, articles classés)
+Un enregistrement JSON compressé par bloc, index des offsets par clé et par source,
+lecture par mmap: accès direct à un enregistrement et itération paresseuse
+"""
+
+import os
+import json
+import mmap
+import zlib
+import logging
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from scripts.run_journal import write_json_atomic
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+DATA_SUFFIX = '.records'
+INDEX_SUFFIX = '.index.json'
+
+
+def record_key(record: Dict) -> Optional[str]:
+    """Clé d'index d'un enregistrement: message_id (emails) ou URL (articles)"""
+    return record.get('message_id') or record.get('url')
+
+
+class RecordWriter:
+    """Écriture incrémentale d'un cache (enregistrements ajoutés au fil de l'eau)"""
+
+    def __init__(self, path: str):
+        """
+        Commence un cache
+
+        Args:
+            path: Chemin sans extension (ex: cache/emails)
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._tmp_path = path + DATA_SUFFIX + '.tmp'
+        self._file = open(self._tmp_path, 'wb')
+        self._lock = threading.Lock()
+        self.entries = []
+        self.offset = 0
+
+    def append(self, source: str, record: Dict):
+        """Ajoute un enregistrement (dict ou ArticleRecord)"""
+        block = zlib.compress(json.dumps(record, ensure_ascii=False, default=dict).encode('utf-8'))
+        with self._lock:
+            self._file.write(block)
+            self.entries.append([self.offset, len(block), record_key(record), source])
+            self.offset += len(block)
+
+    def close(self) -> int:
+        """
+        Publie le cache (données puis index, chacun de façon atomique)
+
+        Returns:
+            Nombre d'enregistrements écrits
+        """
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self._tmp_path, self.path + DATA_SUFFIX)
+
+            # L'index est écrit en dernier: il fait foi de la cohérence des données
+            write_json_atomic(
+                self.path + INDEX_SUFFIX,
+                {'version': FORMAT_VERSION, 'size': self.offset, 'entries': self.entries}
+            )
+            return len(self.entries)
+
+
+def write_records(path: str, items: Iterable[Tuple[str, Dict]]) -> int:
+    """
+    Écrit un cache complet
+
+    Args:
+        path: Chemin sans extension (ex: cache/emails)
+        items: Couples (source, enregistrement), consommés au fil de l'eau
+
+    Returns:
+        Nombre d'enregistrements écrits
+    """
+    writer = RecordWriter(path)
+    for source, record in items:
+        writer.append(source, record)
+    return writer.close()
+
+
+class RecordStore:
+    """Lecture paresseuse d'un cache écrit par write_records"""
+
+    def __init__(self, path: str):
+        """
+        Ouvre un cache
+
+        Args:
+            path: Chemin sans extension (ex: cache/emails)
+
+        Raises:
+            FileNotFoundError: Cache absent
+            ValueError: Index et données incohérents (écriture interrompue)
+        """
+        self.path = path
+        with open(path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Version de cache inconnue: {index.get('version')}")
+
+        data_path = path + DATA_SUFFIX
+        if os.path.getsize(data_path) != index['size']:
+            raise ValueError(f"Cache incohérent: {data_path}")
+
+        self.entries = index['entries']
+        self.by_key = {entry[2]: i for i, entry in enumerate(self.entries) if entry[2]}
+        self.by_source = {}
+        for i, entry in enumerate(self.entries):
+            self.by_source.setdefault(entry[3], []).append(i)
+
+        self._file = open(data_path, 'rb')
+        # mmap refuse les fichiers vides
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if index['size'] else b''
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        """True si un cache complet existe pour ce chemin"""
+        return os.path.exists(path + INDEX_SUFFIX) and os.path.exists(path + DATA_SUFFIX)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def read(self, position: int) -> Dict:
+        """Décompresse l'enregistrement à une position de l'index"""
+        offset, length = self.entries[position][:2]
+        return json.loads(zlib.decompress(self._data[offset:offset + length]))
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Itère sur les enregistrements sans tout charger"""
+        for position in range(len(self.entries)):
+            yield self.read(position)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Enregistrement par message_id ou URL"""
+        position = self.by_key.get(key)
+        return self.read(position) if position is not None else None
+
+    def sources(self) -> List[str]:
+        """Sources présentes, dans l'ordre d'écriture"""
+        return list(self.by_source)
+
+    def source_view(self, source: str) -> 'SourceView':
+        """Séquence paresseuse des enregistrements d'une source"""
+        return SourceView(self, self.by_source.get(source, []))
+
+    def as_source_map(self) -> Dict[str, 'SourceView']:
+        """Équivalent paresseux de {source: [enregistrements]}"""
+        return {source: self.source_view(source) for source in self.by_source}
+
+    def close(self):
+        """Libère le mmap et le fichier"""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+
+class SourceView:
+    """Enregistrements d'une source, décompressés à la demande"""
+
+    def __init__(self, store: RecordStore, positions: List[int]):
+        self.store = store
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, i: int) -> Dict:
+        return self.store.read(self.positions[i])
+
+    def __iter__(self) -> Iterator[Dict]:
+        for position in self.positions:
+            yield self.store.read(position)
+
+
+def save_source_map(path: str, records_by_source: Dict[str, Iterable[Dict]]) -> int:
+    """Écrit un dictionnaire {source: [enregistrements]}"""
+    return write_records(path, (
+        (source, record) for source, records in records_by_source.items() for record in records
+    ))
+
+
+def save_list(path: str, records: Iterable[Dict]) -> int:
+    """Écrit une liste d'enregistrements (source lue dans chaque enregistrement)"""
+    return write_records(path, ((record.get('source', ''), record) for record in records))
+
+
+def load_cached(path: str) -> Optional[RecordStore]:
+    """
+    Ouvre le cache d'une étape s'il est utilisable
+
+    Args:
+        path: Chemin sans extension
+
+    Returns:
+        RecordStore, ou None si absent ou incohérent
+    """
+    if not RecordStore.exists(path):
+        return None
+    try:
+        return RecordStore(path)
+    except (OSError, ValueError, json.JSONDecodeError) as e:
+        logger.warning(f"⚠️  Cache {path} inutilisable ({e}), étape recalculée")
+        return None
+
+
+def main():
+    """Test du cache: écriture puis accès direct et itération paresseuse"""
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), 'emails')
+    emails = {
+        'Lenny': [{'message_id': 'm1', 'subject': 'Edition 1', 'content': 'Growth ' * 500}],
+        'Kyle Poyar': [{'message_id': 'm2', 'subject': 'Pricing', 'content': 'SaaS ' * 500}]
+    }
+    count = save_source_map(path, emails)
+    store = RecordStore(path)
+    print(f"\n✅ {count} enregistrement(s), {os.path.getsize(path + DATA_SUFFIX)} octets")
+    print(f"   m2 -> {store.get('m2')['subject']}")
+    print(f"   Sources: {store.sources()} | Lenny: {[e['subject'] for e in store.source_view('Lenny')]}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Result Cache - Cache local à TTL des résultats Firecrawl (scrape et search)
+TTL aligné sur maxAge, stale-while-revalidate et éviction LRU bornée en taille
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Dict, Any, Callable, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def cache_key(operation: str, params: Dict[str, Any]) -> str:
+    """Clé stable d'un appel (opération + paramètres canoniques)"""
+    canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{operation}:{canonical}".encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Cache disque des résultats d'outils, une entrée JSON par clé"""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 100 * 1024 * 1024,
+                 stale_while_revalidate: float = 86400.0):
+        """
+        Initialise le cache
+
+        Args:
+            directory: Dossier du cache (défaut: $CACHE_DIR/firecrawl)
+            max_bytes: Taille maximale sur disque (éviction des entrées les moins récemment lues)
+            stale_while_revalidate: Durée (secondes) après expiration pendant laquelle une
+                                    entrée périmée est servie pendant son rafraîchissement
+        """
+        self.directory = directory or os.path.join(os.getenv('CACHE_DIR', 'cache'), 'firecrawl')
+        self.max_bytes = max_bytes
+        self.stale_while_revalidate = stale_while_revalidate
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.stats = {'fresh': 0, 'stale': 0, 'miss': 0, 'evicted': 0}
+
+        # Index taille/dernier accès, reconstruit depuis le disque
+        self._sizes = {}
+        self._atimes = {}
+        for item in os.scandir(self.directory):
+            if item.name.endswith('.json'):
+                stat = item.stat()
+                self._sizes[item.name[:-5]] = stat.st_size
+                self._atimes[item.name[:-5]] = stat.st_mtime
+
+    @classmethod
+    def from_config(cls, cache_config: Optional[Dict] = None) -> 'ResultCache':
+        """Construit le cache depuis la section `firecrawl_cache` de sources.yaml"""
+        cache_config = cache_config or {}
+        return cls(
+            max_bytes=int(float(cache_config.get('max_mb', 100)) * 1024 * 1024),
+            stale_while_revalidate=float(cache_config.get('stale_while_revalidate', 86400))
+        )
+
+    def _path(self, key: str) -> str:
+        """Fichier d'une entrée"""
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[Dict]:
+        """Lit une entrée (None si absente ou illisible)"""
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write(self, key: str, result: Any, ttl: float):
+        """Écrit une entrée puis applique la limite de taille"""
+        data = json.dumps({'stored_at': time.time(), 'ttl': ttl, 'result': result}, ensure_ascii=False)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+
+        with self._lock:
+            self._sizes[key] = len(data.encode('utf-8'))
+            self._atimes[key] = time.time()
+            self._evict()
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment lues au-delà de max_bytes (verrou tenu)"""
+        total = sum(self._sizes.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self._atimes, key=self._atimes.get):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            total -= self._sizes.pop(key, 0)
+            self._atimes.pop(key, None)
+            self.stats['evicted'] += 1
+
+    def _count(self, outcome: str):
+        """Comptabilise une issue de consultation"""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _touch(self, key: str):
+        """Marque une entrée comme lue (ordre LRU, persisté via mtime)"""
+        now = time.time()
+        with self._lock:
+            self._atimes[key] = now
+        try:
+            os.utime(self._path(key), (now, now))
+        except OSError:
+            pass
+
+    def _refresh(self, key: str, fetch: Callable[[], Any], ttl: float):
+        """Rafraîchit une entrée en arrière-plan (un seul rafraîchissement par clé)"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                result = fetch()
+                if result:
+                    self._write(key, result, ttl)
+            except Exception as e:
+                logger.warning(f"  ⚠️  Rafraîchissement du cache échoué: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def get_or_fetch(self, operation: str, params: Dict[str, Any], ttl: float,
+                     fetch: Callable[[], Any]) -> Any:
+        """
+        Retourne le résultat en cache ou l'obtient via fetch
+
+        Args:
+            operation: Nom de l'outil (ex: firecrawl_scrape)
+            params: Paramètres formant la clé
+            ttl: Durée de fraîcheur (secondes), ex: maxAge / 1000
+            fetch: Appel réel (résultat vide = non mis en cache)
+
+        Returns:
+            Résultat frais, périmé (rafraîchi en arrière-plan) ou nouvellement obtenu
+        """
+        key = cache_key(operation, params)
+        entry = self._read(key)
+
+        if entry is not None:
+            age = time.time() - entry['stored_at']
+            if age < entry['ttl']:
+                self._count('fresh')
+                self._touch(key)
+                return entry['result']
+            if age < entry['ttl'] + self.stale_while_revalidate:
+                self._count('stale')
+                self._touch(key)
+                logger.info(f"  ♻️  Résultat périmé servi, rafraîchissement en arrière-plan ({operation})")
+                self._refresh(key, fetch, ttl)
+                return entry['result']
+
+        self._count('miss')
+        result = fetch()
+        if result:
+            self._write(key, result, ttl)
+        return result
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Rule Extractors - Recettes d'extraction déclaratives par source (SANS IA)
+Chaque source de sources.yaml peut déclarer une recette regex ou sélecteurs CSS,
+compilée une seule fois au démarrage
+"""
+
+import re
+import logging
+from typing import List, Dict, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+_REGEX_FLAGS = {
+    'multiline': re.MULTILINE,
+    'dotall': re.DOTALL,
+    'ignorecase': re.IGNORECASE,
+}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _clean(text: Optional[str]) -> str:
+    """Supprime balises et espaces multiples"""
+    if not text:
+        return ''
+    return _WHITESPACE_RE.sub(' ', _TAG_RE.sub('', text)).strip()
+
+
+class RuleRecipe:
+    """Recette d'extraction compilée pour une source"""
+
+    def __init__(self, source_name: str, spec: Dict):
+        """
+        Compile une recette
+
+        Args:
+            source_name: Nom de la source
+            spec: Déclaration `extraction_recipe` de la source
+        """
+        self.source_name = source_name
+        self.name = spec.get('name', source_name.lower().replace(' ', '_'))
+        self.type = spec.get('type', 'regex')
+        self.min_articles = spec.get('min_articles', 1)
+        self.normalize_title = spec.get('normalize_title')
+
+        if self.type == 'regex':
+            flags = 0
+            for flag in spec.get('flags', ['multiline']):
+                flags |= _REGEX_FLAGS[flag]
+            self.pattern = re.compile(spec['pattern'], flags)
+            missing = {'title', 'summary'} - set(self.pattern.groupindex)
+            if missing:
+                raise ValueError(f"Recette {self.name}: groupes manquants {sorted(missing)}")
+            self.link_references = (
+                re.compile(spec['link_references'], re.MULTILINE) if spec.get('link_references') else None
+            )
+        elif self.type == 'selector':
+            self.selectors = {
+                'item': spec['item'],
+                'title': spec['title'],
+                'summary': spec.get('summary'),
+                'url': spec.get('url'),
+            }
+            self.url_attr = spec.get('url_attr', 'href')
+        else:
+            raise ValueError(f"Recette {self.name}: type inconnu {self.type}")
+
+    def _format_title(self, title: str) -> str:
+        """Normalise le titre (ex: TITRE EN MAJUSCULES -> Titre en majuscules)"""
+        if self.normalize_title == 'sentence' and title.isupper():
+            return title[:1].upper() + title[1:].lower()
+        return title
+
+    def _extract_regex(self, content: str) -> List[Dict]:
+        """Applique une recette regex"""
+        references = {}
+        if self.link_references:
+            for match in self.link_references.finditer(content):
+                references[match.group('ref')] = match.group('url')
+
+        records = []
+        for match in self.pattern.finditer(content):
+            groups = match.groupdict()
+            url = groups.get('url')
+            if not url and groups.get('ref'):
+                url = references.get(groups['ref'])
+            records.append({'title': groups['title'], 'summary': groups['summary'], 'url': url})
+        return records
+
+    def _extract_selector(self, content: str) -> List[Dict]:
+        """Applique une recette à sélecteurs CSS (HTML)"""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, 'html.parser')
+        records = []
+        for item in soup.select(self.selectors['item']):
+            title_node = item.select_one(self.selectors['title'])
+            if title_node is None:
+                continue
+            summary_node = item.select_one(self.selectors['summary']) if self.selectors['summary'] else None
+            url = None
+            if self.selectors['url']:
+                url_node = item.select_one(self.selectors['url'])
+                url = url_node.get(self.url_attr) if url_node is not None else None
+            elif title_node.name == 'a':
+                url = title_node.get(self.url_attr)
+            records.append({
+                'title': title_node.get_text(' '),
+                'summary': summary_node.get_text(' ') if summary_node is not None else '',
+                'url': url
+            })
+        return records
+
+    def extract(self, content: str) -> List[Dict]:
+        """
+        Extrait les articles d'un contenu
+
+        Args:
+            content: Contenu de l'email ou de la page
+
+        Returns:
+            Liste d'articles (vide si la recette ne s'applique pas)
+        """
+        if self.type == 'regex':
+            records = self._extract_regex(content)
+        else:
+            records = self._extract_selector(content)
+
+        articles = []
+        for record in records:
+            title = self._format_title(_clean(record['title']))
+            summary = _clean(record['summary'])
+            if not title:
+                continue
+
+            # Limiter la longueur
+            if len(title) > 80:
+                title = title[:77] + '...'
+            if len(summary) > 160:
+                summary = summary[:157] + '...'
+
+            articles.append({
+                'title': title,
+                'summary': summary,
+                'url': record['url'] or None,
+                'category': 'important',
+                'source': self.source_name,
+                'extraction_method': f"rule:{self.name}"
+            })
+
+        if len(articles) < self.min_articles:
+            return []
+        return articles
+
+
+def _fill_urls_from_links(articles: List[Dict], links: List[Dict]):
+    """Complète les URLs manquantes par correspondance titre / texte d'ancre"""
+    by_text = {}
+    for link in links:
+        key = _clean(link.get('text')).lower()
+        if key and key not in by_text:
+            by_text[key] = link['href']
+
+    for article in articles:
+        if not article['url']:
+            article['url'] = by_text.get(article['title'].lower().rstrip('.'))
+
+
+class RuleExtractorRegistry:
+    """Registre des recettes d'extraction déclarées dans sources.yaml"""
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Compile toutes les recettes `extraction_recipe` des sources
+
+        Args:
+            config: Configuration complète (sources.yaml)
+        """
+        self.recipes = {}
+        for source in (config or {}).get('sources', []) or []:
+            spec = source.get('extraction_recipe')
+            if not spec:
+                continue
+            try:
+                self.recipes[source['name']] = RuleRecipe(source['name'], spec)
+            except (KeyError, ValueError, re.error) as e:
+                logger.error(f"❌ Recette invalide pour {source['name']}: {e}")
+
+        if self.recipes:
+            logger.info(f"✅ {len(self.recipes)} recette(s) d'extraction compilée(s)")
+
+    def has_recipe(self, source_name: str) -> bool:
+        """Indique si une source a une recette"""
+        return source_name in self.recipes
+
+    def extract(self, content: str, source_name: str, html: Optional[str] = None,
+                links: Optional[List[Dict]] = None) -> Optional[List[Dict]]:
+        """
+        Extrait les articles avec la recette de la source
+
+        Args:
+            content: Contenu texte à analyser
+            source_name: Nom de la source
+            html: HTML brut (utilisé par les recettes à sélecteurs)
+            links: Table des liens de l'email, pour compléter les URLs manquantes
+
+        Returns:
+            Articles extraits, ou None si pas de recette ou aucun résultat
+        """
+        recipe = self.recipes.get(source_name)
+        if recipe is None:
+            return None
+
+        articles = recipe.extract(html if recipe.type == 'selector' and html else content)
+        if not articles:
+            logger.info(f"  ℹ️  Recette {recipe.name} sans résultat pour {source_name}")
+            return None
+
+        if links:
+            _fill_urls_from_links(articles, links)
+
+        logger.info(f"  ✅ {len(articles)} articles extraits par la recette {recipe.name}")
+        return articles
+
+
+def main():
+    """Test de la recette TLDR"""
+    import yaml
+
+    with open('config/sources.yaml', 'r', encoding='utf-8') as f:
+        registry = RuleExtractorRegistry(yaml.safe_load(f))
+
+    test_email = """TLDR Marketing 2025-10-20
+
+HOW DUOLINGO GREW DAU WITH STREAKS (4 MINUTE READ) [1]
+
+Duolingo's streak feature drove a 60% lift in daily actives.
+The team shares the experiments behind it.
+
+GOOGLE ROLLS OUT AI MODE ADS (2 MINUTE READ) [2]
+
+Advertisers can now appear inside AI Mode answers in the US.
+
+Links:
+------
+[1] https://tracking.tldrnewsletter.com/CL0/https:%2F%2Fblog.duolingo.com%2Fstreaks/1
+[2] https://tracking.tldrnewsletter.com/CL0/https:%2F%2Fblog.google%2Fads/1
+"""
+    articles = registry.extract(test_email, "TLDR Marketing") or []
+    print(f"\n✅ {len(articles)} articles extraits")
+    for art in articles:
+        print(f"  - {art['title']} -> {art['url']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Run Budget - Budgets de coût/tokens et deadline pour une génération
+Estime le coût par étape avant traitement et dégrade progressivement
+le pipeline (moins de traduction, parsers sans IA, classement local)
+"""
+
+import time
+import logging
+import threading
+from typing import List, Dict, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class RunBudget:
+    """Budget d'une génération et niveaux de dégradation appliqués"""
+
+    # Dégradations, de la moins à la plus coûteuse en qualité
+    DEGRADATION_LEVELS = [
+        'skip_low_priority_translation',  # Pas de traduction pour les sources non prioritaires
+        'ai_free_extraction',             # Parsers sans IA uniquement
+        'local_ranking',                  # Classement local sans appel IA
+    ]
+
+    # Durée moyenne d'un appel par étape (secondes), surchargeable via `budget.seconds_per_call`
+    SECONDS_PER_CALL = {
+        'extraction': 15.0,
+        'translation': 2.0,
+        'ranking': 40.0,
+    }
+
+    # Fraction du budget consommée déclenchant chaque niveau en cours de route
+    LEVEL_THRESHOLDS = [0.8, 0.9, 1.0]
+
+    def __init__(self, max_cost: Optional[float] = None, max_tokens: Optional[int] = None,
+                 deadline: Optional[float] = None, seconds_per_call: Optional[Dict] = None):
+        """
+        Initialise le budget
+
+        Args:
+            max_cost: Budget maximum en dollars
+            max_tokens: Budget maximum en tokens (input + output)
+            deadline: Durée maximale de la génération en secondes
+            seconds_per_call: Surcharges de SECONDS_PER_CALL
+        """
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+        self.deadline = deadline
+        self.start_time = time.monotonic()
+
+        self.seconds_per_call = dict(self.SECONDS_PER_CALL)
+        self.seconds_per_call.update(seconds_per_call or {})
+
+        self.level = 0
+        self.events = []
+        # Budget partagé par les workers du pipeline et le classement des éditions
+        self._lock = threading.RLock()
+
+    def configure(self, config: Optional[Dict]):
+        """Applique la section `budget` de sources.yaml (durées par appel)"""
+        self.seconds_per_call.update((config or {}).get('seconds_per_call', {}) or {})
+
+    @property
+    def enabled(self) -> bool:
+        """True si au moins une limite est définie"""
+        return any(limit is not None for limit in (self.max_cost, self.max_tokens, self.deadline))
+
+    def elapsed(self) -> float:
+        """Temps écoulé depuis le début de la génération"""
+        return time.monotonic() - self.start_time
+
+    def is_degraded(self, name: str) -> bool:
+        """Indique si une dégradation est active"""
+        return self.DEGRADATION_LEVELS.index(name) < self.level
+
+    def _degrade_to(self, level: int, reason: str):
+        """Monte au niveau de dégradation demandé (jamais en arrière)"""
+        level = min(level, len(self.DEGRADATION_LEVELS))
+        with self._lock:
+            while self.level < level:
+                name = self.DEGRADATION_LEVELS[self.level]
+                self.level += 1
+                self.events.append({'degradation': name, 'reason': reason, 'at': round(self.elapsed(), 1)})
+                logger.warning(f"⚠️  Dégradation activée: {name} ({reason})")
+
+    def _project(self, estimates: List[Dict], metrics, level: int) -> Dict:
+        """Projette coût, tokens et durée des appels restants pour un niveau donné"""
+        degraded = self.DEGRADATION_LEVELS[:level]
+        cost = 0.0
+        tokens = 0
+        seconds = 0.0
+
+        for entry in estimates:
+            stage = entry['stage']
+            if stage == 'translation' and 'skip_low_priority_translation' in degraded and entry.get('priority') != 'high':
+                continue
+            if stage == 'extraction' and 'ai_free_extraction' in degraded:
+                continue
+            if stage == 'ranking' and 'local_ranking' in degraded:
+                continue
+            if stage == 'translation' and 'ai_free_extraction' in degraded and entry.get('from_ai_extraction'):
+                continue
+
+            cost += metrics.estimate_cost(entry['model'], entry['input_tokens'], entry['output_tokens'])
+            tokens += entry['input_tokens'] + entry['output_tokens']
+            seconds += entry['calls'] * self.seconds_per_call.get(stage, 5.0)
+
+        return {'cost': cost, 'tokens': tokens, 'seconds': seconds}
+
+    def _fits(self, projection: Dict, spent_cost: float, spent_tokens: int) -> bool:
+        """Vérifie qu'une projection tient dans les budgets restants"""
+        if self.max_cost is not None and spent_cost + projection['cost'] > self.max_cost:
+            return False
+        if self.max_tokens is not None and spent_tokens + projection['tokens'] > self.max_tokens:
+            return False
+        if self.deadline is not None and self.elapsed() + projection['seconds'] > self.deadline:
+            return False
+        return True
+
+    def preflight(self, estimates: List[Dict], metrics) -> Dict:
+        """
+        Choisit le plus petit niveau de dégradation qui tient dans le budget
+
+        Args:
+            estimates: Estimations par appel/étape (voir AIProcessor.estimate_run)
+            metrics: APIMetrics (prix par modèle et consommation courante)
+
+        Returns:
+            Projection retenue {'cost', 'tokens', 'seconds'}
+        """
+        costs = metrics.calculate_costs()
+        spent_cost, spent_tokens = costs['total_cost'], costs['total_tokens']
+
+        projection = self._project(estimates, metrics, self.level)
+        logger.info(
+            f"📐 Estimation: ${projection['cost']:.4f} | {projection['tokens']:,} tokens | "
+            f"~{projection['seconds']:.0f}s"
+        )
+        if not self.enabled:
+            return projection
+
+        for level in range(self.level, len(self.DEGRADATION_LEVELS) + 1):
+            projection = self._project(estimates, metrics, level)
+            if self._fits(projection, spent_cost, spent_tokens):
+                self._degrade_to(level, "estimation avant traitement")
+                return projection
+
+        self._degrade_to(len(self.DEGRADATION_LEVELS), "budget insuffisant même en mode dégradé")
+        return projection
+
+    def checkpoint(self, metrics):
+        """
+        Vérifie la consommation réelle en cours de route et dégrade si besoin
+
+        Args:
+            metrics: APIMetrics de la génération
+        """
+        if not self.enabled:
+            return
+
+        costs = metrics.calculate_costs()
+        ratios = []
+        if self.max_cost:
+            ratios.append(costs['total_cost'] / self.max_cost)
+        if self.max_tokens:
+            ratios.append(costs['total_tokens'] / self.max_tokens)
+        if self.deadline:
+            ratios.append(self.elapsed() / self.deadline)
+        usage = max(ratios) if ratios else 0.0
+
+        level = sum(1 for threshold in self.LEVEL_THRESHOLDS if usage >= threshold)
+        with self._lock:
+            if level > self.level:
+                self._degrade_to(level, f"budget consommé à {usage:.0%}")
+
+    def report(self) -> Dict:
+        """Résumé des limites et des dégradations appliquées"""
+        with self._lock:
+            degradations = list(self.events)
+        return {
+            'max_cost': self.max_cost,
+            'max_tokens': self.max_tokens,
+            'deadline': self.deadline,
+            'elapsed': round(self.elapsed(), 1),
+            'degradations': degradations
+        }
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Run Journal - Journal append-only des étapes terminées d'une génération
+Chaque récupération, extraction, traduction et classement est écrit (fsync) dès
+qu'il est terminé; `--resume` rejoue le journal et reprend au premier élément manquant
+"""
+
+import os
+import json
+import copy
+import hashlib
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+FETCH = 'fetch'
+FETCH_RESTART = 'fetch_restart'
+FETCH_COMPLETE = 'fetch_complete'
+EXTRACTION = 'extraction'
+TRANSLATION = 'translation'
+RANKING = 'ranking'
+
+
+def write_json_atomic(path: str, data: Any, **dump_kwargs):
+    """
+    Écrit un fichier JSON de façon atomique (fichier temporaire, fsync, renommage)
+
+    Args:
+        path: Fichier cible
+        data: Données sérialisables
+        **dump_kwargs: Options de json.dump (ex: indent)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _digest(*parts: Any) -> str:
+    """Empreinte stable (indépendante du processus, contrairement à hash())"""
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:24]
+
+
+def email_key(source_name: str, email: Dict) -> str:
+    """Clé d'un enregistrement récupéré (contenu, pas l'identifiant: hash(url) varie entre exécutions)"""
+    return _digest(source_name, email.get('subject'), email.get('date'), email.get('content'), email.get('articles'))
+
+
+def article_key(article: Dict) -> str:
+    """Clé d'un article avant traduction"""
+    return _digest(article)
+
+
+def ranking_key(articles: Iterable[Dict]) -> str:
+    """Clé d'un classement (ensemble d'articles traduits, dicts ou ArticleRecord)"""
+    digest = hashlib.sha256()
+    for article in articles:
+        digest.update(json.dumps(dict(article), sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+    return digest.hexdigest()[:24]
+
+
+class RunJournal:
+    """Journal JSONL d'une génération: une ligne par élément terminé"""
+
+    def __init__(self, path: Optional[str] = None, resume: bool = False, retain: bool = True):
+        """
+        Ouvre le journal
+
+        Args:
+            path: Fichier JSONL (défaut: $CACHE_DIR/journal.jsonl)
+            resume: Rejouer le journal existant au lieu d'en commencer un nouveau
+            retain: Garder en mémoire les éléments écrits pendant cette génération
+                    (False en mode mémoire bornée: seul le disque les conserve)
+        """
+        self.path = path or os.path.join(os.getenv('CACHE_DIR', 'cache'), 'journal.jsonl')
+        self.retain = retain
+        self._lock = threading.Lock()
+        self.entries = {FETCH: {}, FETCH_COMPLETE: {}, EXTRACTION: {}, TRANSLATION: {}, RANKING: {}}
+        self.fetch_order = []
+        self.replayed = {stage: 0 for stage in self.entries}
+
+        if resume and os.path.exists(self.path):
+            self._load()
+        else:
+            # Nouvelle génération: journal remplacé atomiquement
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'stage': 'run', 'started_at': datetime.now().isoformat()}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            if resume:
+                logger.info(f"ℹ️  Aucun journal à reprendre ({self.path}), nouvelle génération")
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _load(self):
+        """Rejoue le journal (une dernière ligne tronquée par un crash est ignorée)"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"⚠️  Ligne {line_number} du journal illisible, ignorée")
+                    continue
+                stage = entry.get('stage')
+                if stage == FETCH_RESTART:
+                    self.entries[FETCH] = {}
+                    self.fetch_order = []
+                elif stage == FETCH:
+                    if entry['key'] not in self.entries[FETCH]:
+                        self.fetch_order.append(entry['key'])
+                    self.entries[FETCH].setdefault(entry['key'], []).extend(entry['data'])
+                elif stage in self.entries:
+                    self.entries[stage][entry['key']] = entry['data']
+
+        # Les ajouts repartent après la dernière ligne complète
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+        logger.info(
+            f"♻️  Reprise du journal {self.path}: "
+            + ", ".join(f"{stage}={len(items)}" for stage, items in self.entries.items() if items)
+        )
+
+    def record(self, stage: str, key: str, data: Any):
+        """
+        Ajoute un élément terminé (écrit et synchronisé sur disque avant retour)
+
+        Args:
+            stage: fetch, fetch_complete, extraction, translation ou ranking
+            key: Clé de l'élément
+            data: Résultat de l'élément
+        """
+        line = json.dumps({'stage': stage, 'key': key, 'data': data}, ensure_ascii=False)
+        if self.retain:
+            data = copy.deepcopy(data)  # L'appelant peut encore modifier ses objets
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            if not self.retain and stage != FETCH_COMPLETE:
+                return
+            if stage == FETCH:
+                if key not in self.entries[FETCH]:
+                    self.fetch_order.append(key)
+                self.entries[FETCH].setdefault(key, []).extend(data)
+            else:
+                self.entries[stage][key] = data
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        """Résultat journalisé d'un élément (copie), None s'il reste à faire"""
+        with self._lock:
+            if key not in self.entries[stage]:
+                return None
+            self.replayed[stage] += 1
+            return copy.deepcopy(self.entries[stage][key])
+
+    def restart_fetch(self):
+        """Oublie une récupération incomplète avant de la refaire (évite les doublons)"""
+        with self._lock:
+            self._file.write(json.dumps({'stage': FETCH_RESTART}) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.entries[FETCH] = {}
+            self.fetch_order = []
+
+    @property
+    def fetch_complete(self) -> bool:
+        """True si la récupération de toutes les sources est journalisée"""
+        return bool(self.entries[FETCH_COMPLETE])
+
+    def fetched(self) -> Dict[str, List[Dict]]:
+        """Enregistrements récupérés par source, dans l'ordre du journal"""
+        with self._lock:
+            return {name: copy.deepcopy(self.entries[FETCH][name]) for name in self.fetch_order}
+
+    def log_summary(self):
+        """Résumé des éléments rejoués depuis le journal"""
+        replayed = {stage: count for stage, count in self.replayed.items() if count}
+        if replayed:
+            logger.info("♻️  Rejoué depuis le journal: " + ", ".join(f"{s}={c}" for s, c in replayed.items()))
+
+    def close(self):
+        """Ferme le journal"""
+        with self._lock:
+            self._file.close()
+
+
+def main():
+    """Test du journal: écriture, ligne tronquée puis reprise"""
+    path = os.path.join(tempfile.mkdtemp(), 'journal.jsonl')
+    journal = RunJournal(path)
+    journal.record(FETCH, 'Lenny', [{'subject': 'Edition 1', 'content': '...'}])
+    journal.record(EXTRACTION, 'abc', [{'title': 'Article', 'summary': '...', 'url': 'https://x.y'}])
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"stage": "translation", "key": "de')
+
+    resumed = RunJournal(path, resume=True)
+    print(f"\n✅ Reprise: {resumed.fetched()} | extraction abc: {resumed.get(EXTRACTION, 'abc')}")
+    resumed.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Source History - Historique par source des recherches Gmail (emails trouvés ou non)
+Sert à lancer spéculativement le fallback web des sources souvent vides
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class SourceHistory:
+    """Taux de succès Gmail par source sur les dernières générations"""
+
+    def __init__(self, history_file: str = "metrics/source_history.json", window: int = 10):
+        """
+        Charge l'historique
+
+        Args:
+            history_file: Fichier JSON de l'historique
+            window: Nombre de générations conservées par source
+        """
+        self.history_file = Path(history_file)
+        self.window = window
+        self._lock = threading.Lock()
+        self.history = {}
+
+        if self.history_file.exists():
+            try:
+                with open(self.history_file, 'r', encoding='utf-8') as f:
+                    self.history = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"⚠️  Historique des sources illisible ({e}), réinitialisé")
+
+    def record(self, source_name: str, found: bool):
+        """Enregistre le résultat de la recherche Gmail d'une source"""
+        with self._lock:
+            entry = self.history.setdefault(source_name, {'runs': []})
+            entry['runs'] = (entry['runs'] + [1 if found else 0])[-self.window:]
+            entry['updated_at'] = datetime.now().isoformat()
+
+    def empty_rate(self, source_name: str) -> Optional[float]:
+        """Part des générations sans email (None si aucun historique)"""
+        runs = self.history.get(source_name, {}).get('runs', [])
+        if not runs:
+            return None
+        return 1 - sum(runs) / len(runs)
+
+    def likely_empty(self, source: Dict, threshold: float = 0.6, min_runs: int = 3) -> bool:
+        """
+        Indique si la source sera probablement sans email
+
+        Args:
+            source: Configuration de la source (`speculative_fallback: true` force la spéculation)
+            threshold: Taux de générations vides à partir duquel spéculer
+            min_runs: Nombre minimum de générations connues
+
+        Returns:
+            True si le fallback doit être lancé en parallèle de la recherche Gmail
+        """
+        if source.get('speculative_fallback'):
+            return True
+        runs = self.history.get(source['name'], {}).get('runs', [])
+        return len(runs) >= min_runs and self.empty_rate(source['name']) >= threshold
+
+    def save(self):
+        """Sauvegarde l'historique"""
+        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            with open(self.history_file, 'w', encoding='utf-8') as f:
+                json.dump(self.history, f, indent=2, ensure_ascii=False)
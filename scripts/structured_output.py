@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Structured Output - Schémas tool-use et parsing JSON tolérant
+Récupère tous les objets complets d'une réponse tronquée ou mal formée
+"""
+
+import re
+import json
+import logging
+from typing import List, Dict, Tuple, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# Schéma tool-use pour l'extraction d'articles
+EXTRACTION_TOOL = {
+    "name": "enregistrer_articles",
+    "description": "Enregistre les articles extraits d'une newsletter.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "articles": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string", "description": "Titre court (max 80 car.)"},
+                        "summary": {"type": "string", "description": "Résumé ultra court (max 160 car.)"},
+                        "url": {"type": ["string", "null"], "description": "Identifiant du lien (ex: L7) ou null"},
+                        "category": {"type": "string", "enum": ["critical", "important", "good_to_know"]}
+                    },
+                    "required": ["title", "summary", "url", "category"]
+                }
+            }
+        },
+        "required": ["articles"]
+    }
+}
+
+# Schéma tool-use pour le classement
+RANKING_TOOL = {
+    "name": "enregistrer_classement",
+    "description": "Enregistre le classement des articles sélectionnés.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "ranked_articles": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "article_index": {"type": "integer"},
+                        "rank": {"type": "integer"},
+                        "category": {"type": "string", "enum": ["critical", "important", "good_to_know"]},
+                        "source": {"type": "string"},
+                        "reason": {"type": "string"}
+                    },
+                    "required": ["article_index", "rank", "category", "source"]
+                }
+            }
+        },
+        "required": ["ranked_articles"]
+    }
+}
+
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+
+
+def strip_code_fences(text: str) -> str:
+    """Enlève les balises ``` autour d'une réponse JSON"""
+    text = text.strip()
+    if text.startswith('```json'):
+        text = text[7:]
+    if text.startswith('```'):
+        text = text[3:]
+    if text.endswith('```'):
+        text = text[:-3]
+    return text.strip()
+
+
+def _find_object_end(text: str, start: int) -> int:
+    """
+    Trouve l'accolade fermante correspondant à l'objet commençant à `start`
+
+    Returns:
+        Index juste après '}' ou -1 si l'objet est tronqué
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def _strip_comments(text: str) -> str:
+    """Supprime les commentaires // hors des chaînes JSON"""
+    out = []
+    in_string = False
+    escaped = False
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch == '/' and text.startswith('//', i):
+            newline = text.find('\n', i)
+            if newline == -1:
+                break
+            i = newline
+            continue
+        else:
+            out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def _load_object(fragment: str) -> Optional[Dict]:
+    """Parse un objet JSON, en réparant commentaires et virgules finales si besoin"""
+    for candidate in (fragment, _TRAILING_COMMA.sub(r'\1', _strip_comments(fragment))):
+        try:
+            obj = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(obj, dict):
+            return obj
+    return None
+
+
+def salvage_json_array(text: str, array_key: str) -> Tuple[List[Dict], bool]:
+    """
+    Récupère les objets complets du tableau `array_key` d'une réponse JSON
+
+    Args:
+        text: Réponse brute du modèle (éventuellement tronquée ou mal formée)
+        array_key: Clé du tableau à récupérer (ex: "articles")
+
+    Returns:
+        Tuple (objets récupérés, True si le tableau a été lu jusqu'au bout)
+    """
+    text = strip_code_fences(text or '')
+
+    # Cas nominal: JSON valide
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict) and isinstance(data.get(array_key), list):
+            return [item for item in data[array_key] if isinstance(item, dict)], True
+        if isinstance(data, list):
+            return [item for item in data if isinstance(item, dict)], True
+    except json.JSONDecodeError:
+        pass
+
+    # Localiser le début du tableau
+    key_match = re.search(r'"%s"\s*:\s*\[' % re.escape(array_key), text)
+    if key_match:
+        pos = key_match.end()
+    else:
+        bracket = text.find('[')
+        if bracket == -1:
+            return [], False
+        pos = bracket + 1
+
+    items = []
+    skipped = 0
+    while pos < len(text):
+        ch = text[pos]
+        if ch in ' \t\r\n,':
+            pos += 1
+            continue
+        if ch == ']':
+            if skipped:
+                logger.warning(f"  ⚠️  {skipped} objet(s) JSON illisible(s) ignoré(s)")
+            return items, True
+        if ch == '/' and text.startswith('//', pos):
+            newline = text.find('\n', pos)
+            if newline == -1:
+                break
+            pos = newline
+            continue
+        if ch != '{':
+            # Caractère inattendu: avancer jusqu'au prochain objet
+            next_obj = text.find('{', pos)
+            if next_obj == -1:
+                break
+            pos = next_obj
+            continue
+
+        end = _find_object_end(text, pos)
+        if end == -1:
+            # Objet tronqué: on s'arrête sur les objets complets
+            break
+
+        obj = _load_object(text[pos:end])
+        if obj is not None:
+            items.append(obj)
+        else:
+            skipped += 1
+        pos = end
+
+    if skipped:
+        logger.warning(f"  ⚠️  {skipped} objet(s) JSON illisible(s) ignoré(s)")
+    return items, False
+
+
+def main():
+    """Test du parser tolérant"""
+    truncated = """```json
+{
+  "articles": [
+    {"title": "A", "summary": "Résumé A", "url": "https://a.com", "category": "critical"},
+    {"title": "B", "summary": "Résumé B", "url": null, "category": "important",},
+    {"title": "C", "summary": "Résumé tron"""
+    items, complete = salvage_json_array(truncated, "articles")
+    print(f"\n✅ {len(items)} objet(s) récupéré(s) - complet: {complete}")
+    for item in items:
+        print(f"  - {item['title']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,16 @@ Trouve les derniers contenus pour les sources sans emails récents
 """
 
 import os
+import re
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Callable, Set
 from datetime import datetime
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlunparse
+
+from scripts.cassette import get_cassette
+from scripts.fetch_pool import FetchPool
+from scripts.result_cache import ResultCache
+from scripts.run_journal import _digest
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,109 +22,275 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Format texte renvoyé par tavily-mcp (un bloc par résultat)
+TEXT_RESULT_RE = re.compile(r'^Title:\s*(.+)\nURL:\s*(\S+)\nContent:\s*(.*)$', re.MULTILINE)
+
+
+def normalize_url(url: str) -> str:
+    """URL comparable: sans paramètres de suivi, fragment ni slash final"""
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return urlunparse(('https', host, parsed.path.rstrip('/'), '', '', ''))
+
+
+def delivered_urls(records: List[Dict]) -> Set[str]:
+    """URLs normalisées déjà présentes dans des enregistrements (emails, flux, pages)"""
+    urls = set()
+    for record in records:
+        for link in record.get('links') or []:
+            urls.add(normalize_url(link['href']))
+        for article in record.get('articles') or []:
+            if article.get('url'):
+                urls.add(normalize_url(article['url']))
+        if str(record.get('from', '')).startswith('http'):
+            urls.add(normalize_url(record['from']))
+    return urls
+
+
+def mcp_backend(tool_name: str, params: Dict) -> Dict:
+    """Backend réel: outil MCP Tavily (session persistante), via la cassette"""
+    from warp_mcp_helper import call_mcp
+
+    return get_cassette().call('tavily', tool_name, params, lambda: call_mcp(tool_name, params))
+
+
+def stub_backend(tool_name: str, params: Dict) -> Dict:
+    """Backend local déterministe (mêmes réponses que le serveur MCP stub)"""
+    from warp_mcp_helper import _tool_result
+    from scripts.mcp_stub_server import call_tool
+
+    return _tool_result(call_tool(tool_name, params))
+
 
 class TavilySearcher:
     """Recherche d'articles récents via Tavily MCP"""
-    
-    def __init__(self):
-        """Initialise le searcher Tavily"""
+
+    def __init__(self, pool: Optional[FetchPool] = None, cache: Optional[ResultCache] = None,
+                 backend: Optional[Callable[[str, Dict], Dict]] = None, target_per_source: int = 3):
+        """
+        Initialise le searcher Tavily
+
+        Args:
+            pool: Pool de concurrence partagé (fan-out des recherches)
+            cache: Cache des requêtes (défaut: $CACHE_DIR/search)
+            backend: Fonction (outil, paramètres) -> résultat; défaut selon TAVILY_BACKEND (mcp|stub)
+            target_per_source: Nombre d'articles visé par source
+        """
+        self.pool = pool or FetchPool()
+        self.cache = cache or ResultCache(
+            os.path.join(os.getenv('CACHE_DIR', 'cache'), 'search'),
+            stale_while_revalidate=0
+        )
+        if backend is None:
+            backend = stub_backend if os.getenv('TAVILY_BACKEND', 'mcp') == 'stub' else mcp_backend
+        self.backend = backend
+        self.target_per_source = target_per_source
         logger.info("✅ Tavily MCP Searcher initialisé")
-    
-    def search_recent_articles(self, source: Dict, max_results: int = 3) -> List[Dict]:
+
+    @classmethod
+    def from_config(cls, search_config: Optional[Dict], pool: Optional[FetchPool] = None) -> 'TavilySearcher':
+        """Construit le searcher depuis la section `search_enrichment` de sources.yaml"""
+        search_config = search_config or {}
+        backend = {'stub': stub_backend, 'mcp': mcp_backend}.get(search_config.get('backend'))
+        return cls(pool=pool, backend=backend, target_per_source=search_config.get('target_per_source', 3))
+
+    def _search(self, query: str, max_results: int) -> List[Dict]:
+        """Résultats bruts d'une requête (cache par backend, requête, taille et jour)"""
+        params = {
+            "query": query,
+            "max_results": max_results,
+            "search_depth": "basic",
+            "include_raw_content": False
+        }
+        # Backend dans la clé: les résultats du stub ne sont jamais servis à une vraie génération
+        key = {
+            "backend": getattr(self.backend, '__name__', type(self.backend).__name__),
+            "query": query,
+            "max_results": max_results,
+            "day": datetime.now().strftime('%Y-%m-%d')
+        }
+        response = self.cache.get_or_fetch(
+            'tavily-search', key, 86400, lambda: self.backend("tavily-search", params)
+        ) or {}
+
+        if isinstance(response.get('results'), list):
+            return response['results']
+        # Réponse texte de tavily-mcp
+        return [
+            {'title': title.strip(), 'url': url, 'content': content.strip()}
+            for title, url, content in TEXT_RESULT_RE.findall(response.get('markdown', ''))
+        ]
+
+    def search_recent_articles(self, source: Dict, max_results: int = 3,
+                               exclude_urls: Optional[Set[str]] = None) -> List[Dict]:
         """
         Recherche les derniers articles d'une source
-        
+
         Args:
             source: Configuration de la source
             max_results: Nombre maximum de résultats
-            
+            exclude_urls: URLs normalisées déjà connues (ignorées)
+
         Returns:
-            Liste d'articles trouvés avec URLs précises
+            Liste d'articles trouvés avec URLs précises (pré-structurés, sans IA)
         """
         source_name = source.get('name', '')
-        fallback_url = source.get('fallback_url', '')
-        
+        fallback_url = source.get('fallback_url') or (source.get('fallback_urls') or [''])[0]
+
         if not fallback_url:
             logger.warning(f"  ⚠️  Pas d'URL pour {source_name}")
             return []
-        
+
         # Extraire le domaine
         domain = urlparse(fallback_url).netloc
-        
+
         # Construire requête ciblée
         query = f"site:{domain} growth marketing"
-        
+
         logger.info(f"🔍 Tavily search: {query}")
-        
+
         try:
-            # NOTE: Appel MCP à activer en production
-            # result = call_mcp_tool("tavily-search", {
-            #     "query": query,
-            #     "max_results": max_results,
-            #     "search_depth": "basic",
-            #     "include_raw_content": False
-            # })
-            
-            # PLACEHOLDER pour développement
-            # Simuler résultats basés sur le vrai retour Tavily
-            articles = []
-            
-            # Format attendu de Tavily:
-            # [{"title": "...", "url": "...", "content": "..."}]
-            
-            # Exemple structure:
-            # for result in tavily_results:
-            #     articles.append({
-            #         'source': source_name,
-            #         'subject': f"Tavily: {result['title']}",
-            #         'date': datetime.now().strftime('%Y-%m-%d'),
-            #         'from': result['url'],
-            #         'content': result['content'],
-            #         'url': result['url'],
-            #         'message_id': f'tavily_{hash(result["url"])}'
-            #     })
-            
-            logger.info(f"  ✅ {len(articles)} articles trouvés via Tavily")
-            return articles
-            
+            results = self._search(query, max_results)
         except Exception as e:
             logger.error(f"  ❌ Erreur Tavily pour {source_name}: {e}")
             return []
-    
-    def enrich_source_content(self, source: Dict, existing_count: int = 0) -> List[Dict]:
+
+        exclude_urls = exclude_urls if exclude_urls is not None else set()
+        articles = []
+        for result in results:
+            if not result.get('url') or not result.get('title'):
+                continue
+            normalized = normalize_url(result['url'])
+            if normalized in exclude_urls:
+                continue
+            exclude_urls.add(normalized)
+
+            title = result['title'].strip()
+            summary = ' '.join((result.get('content') or '').split())
+            if len(title) > 80:
+                title = title[:77] + '...'
+            if len(summary) > 160:
+                summary = summary[:157] + '...'
+
+            articles.append({
+                'title': title,
+                'summary': summary,
+                'url': result['url'],
+                'category': 'good_to_know',
+                'source': source_name,
+                'extraction_method': 'search_enrichment'
+            })
+
+        logger.info(f"  ✅ {len(articles)} articles trouvés via Tavily")
+        return articles
+
+    def _existing_count(self, records: List[Dict]) -> int:
+        """Articles déjà disponibles (un email complet suffit à remplir la source)"""
+        count = 0
+        for record in records:
+            if record.get('articles') is not None:
+                count += len(record['articles'])
+            else:
+                count += self.target_per_source
+        return count
+
+    def enrich_source_content(self, source: Dict, existing_count: int = 0,
+                              exclude_urls: Optional[Set[str]] = None) -> List[Dict]:
         """
         Enrichit une source avec des articles récents si peu de contenu
-        
+
         Args:
             source: Configuration de la source
             existing_count: Nombre d'articles déjà récupérés
-            
+            exclude_urls: URLs normalisées déjà connues
+
         Returns:
             Liste d'articles supplémentaires
         """
-        # Si on a déjà 3+ articles, pas besoin de chercher plus
-        if existing_count >= 3:
+        # Si on a déjà assez d'articles, pas besoin de chercher plus
+        if existing_count >= self.target_per_source:
             logger.info(f"  ℹ️  {source['name']}: Assez d'articles ({existing_count})")
             return []
-        
+
         # Chercher des articles complémentaires
-        needed = 3 - existing_count
+        needed = self.target_per_source - existing_count
         logger.info(f"  🔍 {source['name']}: Recherche de {needed} articles supplémentaires")
-        
-        return self.search_recent_articles(source, max_results=needed)
+
+        return self.search_recent_articles(source, max_results=needed, exclude_urls=exclude_urls)
+
+    def enrich_sources(self, results: Dict[str, List[Dict]], sources: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Complète en parallèle toutes les sources sous-alimentées
+
+        Args:
+            results: Enregistrements par source ({nom: [emails/flux/pages]}), complétés sur place
+            sources: Configurations des sources
+
+        Returns:
+            Le dictionnaire `results` enrichi
+        """
+        known_urls = delivered_urls([record for records in results.values() for record in records])
+
+        jobs = []
+        for source in sources:
+            if not (source.get('fallback_url') or source.get('fallback_urls')):
+                continue
+            existing = self._existing_count(results.get(source['name'], []))
+            if existing < self.target_per_source:
+                jobs.append((source, existing))
+
+        if not jobs:
+            return results
+
+        logger.info(f"🔍 Enrichissement par recherche de {len(jobs)} source(s)...")
+        found = self.pool.map(
+            jobs,
+            lambda job: self.enrich_source_content(job[0], job[1]),
+            url_of=lambda job: job[0].get('fallback_url') or job[0]['fallback_urls'][0]
+        )
+
+        # Dédoublonnage après le fan-out (ordre des sources, puis des résultats)
+        for (source, _), articles in zip(jobs, found):
+            kept = []
+            for article in articles:
+                normalized = normalize_url(article['url'])
+                if normalized not in known_urls:
+                    known_urls.add(normalized)
+                    kept.append(article)
+            if not kept:
+                continue
+
+            results.setdefault(source['name'], []).append({
+                'source': source['name'],
+                'subject': f"Tavily: {len(kept)} article(s) récent(s)",
+                'date': datetime.now().strftime('%Y-%m-%d'),
+                'from': 'tavily',
+                'content': "\n\n".join(f"{a['title']}\n{a['summary']}\n{a['url']}" for a in kept),
+                'articles': kept,
+                'content_type': 'search',
+                'message_id': f"tavily_{_digest(source['name'])}_{datetime.now().strftime('%Y%m%d')}"
+            })
+
+        return results
 
 
 def main():
-    """Test du searcher"""
-    searcher = TavilySearcher()
-    
+    """Test du searcher (backend stub local, cache temporaire)"""
+    import tempfile
+
+    searcher = TavilySearcher(backend=stub_backend, cache=ResultCache(tempfile.mkdtemp(), stale_while_revalidate=0))
+
     test_source = {
         'name': 'Demand Curve',
         'fallback_url': 'https://www.demandcurve.com/newsletter'
     }
-    
+
     articles = searcher.search_recent_articles(test_source, max_results=3)
     print(f"\n✅ {len(articles)} articles trouvés")
+    for article in articles:
+        print(f"  - {article['title']} -> {article['url']}")
 
 
 if __name__ == "__main__":
@@ -9,6 +9,8 @@ import requests
 from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 from datetime import datetime
+from scripts.fetch_pool import FetchPool, fallback_urls
+from scripts.http_cache import HTTPCache, HIT, REVALIDATE, MISS
 
 # Configuration du logging
 logging.basicConfig(
@@ -21,10 +23,54 @@ logger = logging.getLogger(__name__)
 class WebScraper:
     """Scraper web pour récupérer le contenu des URLs fallback"""
     
-    def __init__(self):
-        """Initialise le scraper web"""
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+    def __init__(self, pool: Optional[FetchPool] = None, cache: Optional[HTTPCache] = None):
+        """
+        Initialise le scraper web
+        
+        Args:
+            pool: Pool de récupération partagé (session keep-alive, limites de concurrence)
+            cache: Cache HTTP conditionnel (défaut: $CACHE_DIR/http)
+        """
+        self.pool = pool or FetchPool()
+        self.cache = cache or HTTPCache()
+    
+    def _parse_page(self, response) -> Dict:
+        """
+        Extrait texte, titre et HTML brut d'une page
+        
+        Args:
+            response: Réponse HTTP 200
+            
+        Returns:
+            Dictionnaire {'text', 'title', 'html'} (mis en cache tel quel)
+        """
+        # Parser le HTML (le HTML brut est conservé pour les parsers sans IA, ex: archives Substack)
+        raw_html = response.text
+        soup = BeautifulSoup(response.content, 'html.parser')
+        
+        # Supprimer les scripts et styles
+        for script in soup(["script", "style"]):
+            script.decompose()
+        
+        # Extraire le texte
+        text = soup.get_text()
+        
+        # Nettoyer les espaces
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        text = '\n'.join(chunk for chunk in chunks if chunk)
+        
+        # Limiter à 15000 caractères pour éviter les tokens excessifs
+        if len(text) > 15000:
+            text = text[:15000]
+        
+        # Essayer d'extraire le titre
+        title = soup.find('title')
+        
+        return {
+            'text': text,
+            'title': str(title.string) if title and title.string else None,
+            'html': raw_html
         }
     
     def scrape_url(self, url: str, source_name: str) -> Optional[Dict]:
@@ -41,38 +87,35 @@ class WebScraper:
         logger.info(f"🌐 Scraping URL: {url}")
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            # Parser le HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Supprimer les scripts et styles
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Extraire le texte
-            text = soup.get_text()
+            entry = self.cache.lookup(url)
             
-            # Nettoyer les espaces
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
+            if entry and self.cache.is_fresh(entry):
+                outcome = HIT
+                page = entry
+            else:
+                # GET conditionnel: un 304 évite téléchargement et parsing
+                response = self.pool.get(url, headers=self.cache.conditional_headers(entry))
+                if response.status_code == 304 and entry:
+                    outcome = REVALIDATE
+                    self.cache.revalidated(entry, response.headers)
+                    page = entry
+                else:
+                    response.raise_for_status()
+                    outcome = MISS
+                    page = self._parse_page(response)
+                    self.cache.store(url, response.headers, page)
             
-            # Limiter à 15000 caractères pour éviter les tokens excessifs
-            if len(text) > 15000:
-                text = text[:15000]
-            
-            # Essayer d'extraire le titre
-            title = soup.find('title')
-            title_text = title.string if title else source_name
+            self.cache.count(source_name, outcome)
+            logger.info(f"  🗄️  Cache HTTP: {outcome}")
             
             return {
                 'source': source_name,
-                'subject': f"Web scraping: {title_text}",
+                'subject': f"Web scraping: {page.get('title') or source_name}",
                 'date': datetime.now().strftime('%Y-%m-%d'),
                 'from': url,
-                'content': text,
+                'content': page['text'],
+                'html': page['html'],
+                'content_type': 'html',
                 'message_id': f'web_{hash(url)}'
             }
             
@@ -86,37 +129,47 @@ class WebScraper:
             logger.error(f"  ❌ Erreur inattendue: {e}")
             return None
     
-    def scrape_source(self, source: Dict) -> List[Dict]:
+    def scrape_sources(self, sources: List[Dict]) -> Dict[str, List[Dict]]:
         """
-        Scrape les URLs fallback d'une source
+        Scrape en parallèle les URLs fallback de plusieurs sources
         
         Args:
-            source: Configuration de la source avec fallback_url ou fallback_urls
+            sources: Configurations des sources avec fallback_url ou fallback_urls
             
         Returns:
-            Liste des contenus scrapés
+            Dictionnaire {nom_source: [contenus scrapés]}
         """
-        results = []
-        
-        # Récupérer les URLs
-        urls = []
-        if 'fallback_url' in source and source['fallback_url']:
-            urls.append(source['fallback_url'])
-        if 'fallback_urls' in source and source['fallback_urls']:
-            urls.extend(source['fallback_urls'])
-        
-        if not urls:
-            logger.warning(f"  ⚠️  Aucune URL fallback pour {source['name']}")
-            return results
-        
-        # Scraper chaque URL
-        for url in urls:
-            content = self.scrape_url(url, source['name'])
+        results = {source['name']: [] for source in sources}
+        
+        # Toutes les URLs de toutes les sources dans un seul lot concurrent
+        jobs = []
+        for source in sources:
+            urls = fallback_urls(source)
+            if not urls:
+                logger.warning(f"  ⚠️  Aucune URL fallback pour {source['name']}")
+            jobs.extend((url, source['name']) for url in urls)
+        
+        contents = self.pool.map(jobs, lambda job: self.scrape_url(*job), url_of=lambda job: job[0])
+        
+        for (url, source_name), content in zip(jobs, contents):
             if content:
-                results.append(content)
+                results[source_name].append(content)
                 logger.info(f"  ✅ Contenu récupéré: {len(content['content'])} caractères")
         
+        self.cache.log_summary()
         return results
+    
+    def scrape_source(self, source: Dict) -> List[Dict]:
+        """
+        Scrape les URLs fallback d'une source
+        
+        Args:
+            source: Configuration de la source avec fallback_url ou fallback_urls
+            
+        Returns:
+            Liste des contenus scrapés
+        """
+        return self.scrape_sources([source])[source['name']]
 
 
 def main():
@@ -1,114 +1,453 @@
 #!/usr/bin/env python3
 """
 Helper pour appels MCP depuis les scripts Python
-Les outils MCP ne sont disponibles que dans l'environnement Warp
-Ce script simule localement et documente l'intégration
+Client JSON-RPC persistant: une session longue durée (stdio ou HTTP) par serveur
+d'outils, requêtes concurrentes multiplexées, reconnexion automatique
 """
 
+import os
+import json
+import atexit
 import logging
+import itertools
+import threading
 import subprocess
-import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Callable
+
+import yaml
 
 logger = logging.getLogger(__name__)
 
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "growth-newsletter", "version": "1.0"}
+DEFAULT_TIMEOUT = 120.0
+
+
+class MCPError(Exception):
+    """Erreur renvoyée par un serveur MCP (ou outil en erreur)"""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+
+class MCPConnectionError(MCPError):
+    """Session MCP interrompue (processus terminé, connexion perdue)"""
+
+
+class _StdioTransport:
+    """Serveur MCP lancé en sous-processus, messages JSON délimités par des retours ligne"""
+
+    def __init__(self, command: List[str], env: Optional[Dict] = None, cwd: Optional[str] = None):
+        self.command = command
+        self.env = env
+        self.cwd = cwd
+        self.process = None
+        self._write_lock = threading.Lock()
+
+    def start(self, on_message: Callable[[Dict], None], on_close: Callable[[str], None]):
+        """Lance le serveur et le thread de lecture"""
+        env = dict(os.environ)
+        env.update(self.env or {})
+        try:
+            self.process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env,
+                cwd=self.cwd,
+                text=True,
+                encoding='utf-8',
+                bufsize=1
+            )
+        except OSError as e:
+            raise MCPConnectionError(f"Lancement impossible de {self.command[0]}: {e}")
+
+        process = self.process
+
+        def read_stdout():
+            for line in process.stdout:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    on_message(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.debug(f"Sortie MCP ignorée: {line[:200]}")
+            on_close(f"processus terminé (code {process.poll()})")
+
+        def read_stderr():
+            for line in process.stderr:
+                logger.debug(f"[mcp stderr] {line.rstrip()}")
+
+        threading.Thread(target=read_stdout, daemon=True).start()
+        threading.Thread(target=read_stderr, daemon=True).start()
+
+    def send(self, message: Dict):
+        """Écrit un message (thread-safe)"""
+        data = json.dumps(message, ensure_ascii=False) + "\n"
+        with self._write_lock:
+            try:
+                self.process.stdin.write(data)
+                self.process.stdin.flush()
+            except (BrokenPipeError, OSError, ValueError) as e:
+                raise MCPConnectionError(f"Écriture impossible: {e}")
+
+    def close(self):
+        """Arrête le serveur"""
+        if self.process and self.process.poll() is None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class _HTTPTransport:
+    """Serveur MCP HTTP (Streamable HTTP): POST JSON-RPC, réponse JSON ou SSE"""
+
+    def __init__(self, url: str, headers: Optional[Dict] = None, pool_size: int = 10):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url = url
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Accept': 'application/json, text/event-stream'
+        })
+        self.session.headers.update(headers or {})
+        # Connexions keep-alive réutilisées par les requêtes concurrentes
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._on_message = None
+
+    def start(self, on_message: Callable[[Dict], None], on_close: Callable[[str], None]):
+        """Pas de connexion persistante à ouvrir: chaque POST réutilise le pool"""
+        self._on_message = on_message
+
+    def send(self, message: Dict):
+        """Envoie un message; la réponse est dispatchée avant le retour"""
+        import requests
+
+        try:
+            response = self.session.post(self.url, json=message, timeout=DEFAULT_TIMEOUT)
+        except requests.RequestException as e:
+            raise MCPConnectionError(f"Requête HTTP impossible: {e}")
+
+        if response.status_code == 404 and 'Mcp-Session-Id' in self.session.headers:
+            raise MCPConnectionError("Session MCP expirée côté serveur")
+        if response.status_code >= 400:
+            raise MCPConnectionError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+        session_id = response.headers.get('Mcp-Session-Id')
+        if session_id:
+            self.session.headers['Mcp-Session-Id'] = session_id
+
+        if response.status_code == 202 or not response.content:
+            return
+
+        if response.headers.get('Content-Type', '').startswith('text/event-stream'):
+            payloads = [
+                line[5:].strip() for line in response.text.splitlines() if line.startswith('data:')
+            ]
+        else:
+            payloads = [response.text]
+
+        for payload in payloads:
+            data = json.loads(payload)
+            for item in data if isinstance(data, list) else [data]:
+                self._on_message(item)
+
+    def close(self):
+        """Ferme la session HTTP"""
+        self.session.headers.pop('Mcp-Session-Id', None)
+        self.session.close()
+
+
+class _Pending:
+    """Requête en attente de sa réponse"""
+
+    __slots__ = ('event', 'response')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.response = None
+
+
+class MCPSession:
+    """Session JSON-RPC longue durée avec un serveur MCP"""
+
+    def __init__(self, name: str, transport_factory: Callable[[], Any], timeout: float = DEFAULT_TIMEOUT):
+        """
+        Initialise la session (connexion au premier appel)
+
+        Args:
+            name: Nom du serveur (logs)
+            transport_factory: Crée un transport stdio ou HTTP neuf
+            timeout: Délai maximum d'une requête (secondes)
+        """
+        self.name = name
+        self.transport_factory = transport_factory
+        self.timeout = timeout
+
+        self.transport = None
+        self.connected = False
+        self.server_info = {}
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self.stats = {'calls': 0, 'connects': 0, 'reconnects': 0, 'errors': 0}
+
+    def _on_message(self, message: Dict):
+        """Dispatche un message reçu vers la requête correspondante"""
+        if 'method' in message:
+            # Requête du serveur (ex: ping): réponse minimale
+            if 'id' in message:
+                reply = {'jsonrpc': '2.0', 'id': message['id']}
+                if message['method'] == 'ping':
+                    reply['result'] = {}
+                else:
+                    reply['error'] = {'code': -32601, 'message': f"Méthode non supportée: {message['method']}"}
+                try:
+                    self.transport.send(reply)
+                except MCPConnectionError:
+                    pass
+            return
+
+        with self._lock:
+            pending = self._pending.pop(message.get('id'), None)
+        if pending is not None:
+            pending.response = message
+            pending.event.set()
+
+    def _on_close(self, reason: str):
+        """Échoue toutes les requêtes en cours quand la session tombe"""
+        self.connected = False
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for item in pending.values():
+            item.response = {'error': {'code': None, 'message': reason, 'disconnected': True}}
+            item.event.set()
+        if pending:
+            logger.warning(f"⚠️  Session MCP {self.name} interrompue: {reason}")
+
+    def _request(self, method: str, params: Optional[Dict] = None) -> Dict:
+        """Envoie une requête et attend sa réponse (autres requêtes non bloquées)"""
+        request_id = next(self._ids)
+        pending = _Pending()
+        with self._lock:
+            self._pending[request_id] = pending
+
+        message = {'jsonrpc': '2.0', 'id': request_id, 'method': method}
+        if params is not None:
+            message['params'] = params
+
+        try:
+            self.transport.send(message)
+        except MCPConnectionError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            self.connected = False
+            raise
+
+        if not pending.event.wait(self.timeout):
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise MCPError(f"Délai dépassé ({self.timeout:.0f}s) pour {method} sur {self.name}")
+
+        error = pending.response.get('error')
+        if error:
+            if error.get('disconnected'):
+                raise MCPConnectionError(error['message'])
+            raise MCPError(error.get('message', 'Erreur MCP'), error.get('code'))
+        return pending.response.get('result', {})
+
+    def _connect(self):
+        """Ouvre le transport et fait la poignée de main MCP"""
+        if self.transport is not None:
+            self.transport.close()
+        transport = self.transport = self.transport_factory()
+        # Fermeture d'un ancien transport ignorée après reconnexion
+        transport.start(
+            self._on_message,
+            lambda reason: self._on_close(reason) if transport is self.transport else None
+        )
+
+        result = self._request('initialize', {
+            'protocolVersion': PROTOCOL_VERSION,
+            'capabilities': {},
+            'clientInfo': CLIENT_INFO
+        })
+        self.transport.send({'jsonrpc': '2.0', 'method': 'notifications/initialized'})
+        self.server_info = result.get('serverInfo', {})
+        self.connected = True
+        self.stats['connects'] += 1
+        logger.info(f"🔌 Session MCP {self.name} ouverte ({self.server_info.get('name', '?')})")
+
+    def ensure_connected(self):
+        """Connecte la session si besoin (une seule connexion pour tous les threads)"""
+        if self.connected:
+            return
+        with self._connect_lock:
+            if not self.connected:
+                self._connect()
+
+    def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict:
+        """
+        Appelle un outil, avec une reconnexion si la session est tombée
+
+        Args:
+            tool_name: Nom de l'outil
+            arguments: Arguments de l'outil
+
+        Returns:
+            Résultat brut de tools/call
+        """
+        for attempt in range(2):
+            try:
+                self.ensure_connected()
+                self.stats['calls'] += 1
+                return self._request('tools/call', {'name': tool_name, 'arguments': arguments})
+            except MCPConnectionError as e:
+                self.connected = False
+                if attempt:
+                    self.stats['errors'] += 1
+                    raise
+                self.stats['reconnects'] += 1
+                logger.warning(f"🔁 Reconnexion MCP {self.name} ({e})")
+
+    def close(self):
+        """Ferme la session"""
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+        self.connected = False
+
+
+def _tool_result(result: Dict) -> Dict[str, Any]:
+    """Convertit un résultat tools/call en dictionnaire (format des appelants)"""
+    texts = [block.get('text', '') for block in result.get('content', []) if block.get('type') == 'text']
+    text = "\n".join(texts)
+
+    if result.get('isError'):
+        raise MCPError(text or "Outil MCP en erreur")
+    if isinstance(result.get('structuredContent'), dict):
+        return result['structuredContent']
+
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return data
+    except json.JSONDecodeError:
+        pass
+    # Texte brut (ex: markdown renvoyé par firecrawl_scrape)
+    return {'markdown': text}
+
+
+class MCPClientPool:
+    """Sessions MCP partagées, une par serveur déclaré dans `mcp_servers`"""
+
+    def __init__(self, servers: Optional[Dict] = None):
+        """
+        Initialise le pool
+
+        Args:
+            servers: Section `mcp_servers` de sources.yaml
+                     {nom: {command: [...] | url: "...", env, headers, tools, timeout}}
+        """
+        self.sessions = {}
+        self.tools = {}
+        for name, spec in (servers or {}).items():
+            spec = spec or {}
+            self.sessions[name] = MCPSession(name, self._factory(spec), float(spec.get('timeout', DEFAULT_TIMEOUT)))
+            for tool in spec.get('tools', []) or []:
+                self.tools[tool] = name
+
+    @staticmethod
+    def _factory(spec: Dict) -> Callable[[], Any]:
+        """Fabrique de transport pour un serveur"""
+        env = {key: os.path.expandvars(str(value)) for key, value in (spec.get('env') or {}).items()}
+        if spec.get('url'):
+            headers = {key: os.path.expandvars(str(value)) for key, value in (spec.get('headers') or {}).items()}
+            url = os.path.expandvars(spec['url'])
+            return lambda: _HTTPTransport(url, headers, pool_size=spec.get('pool_size', 10))
+
+        command = spec['command']
+        if isinstance(command, str):
+            command = command.split()
+        return lambda: _StdioTransport(command, env, spec.get('cwd'))
+
+    def session_for(self, tool_name: str) -> MCPSession:
+        """Session du serveur exposant l'outil (déclaré ou préfixe du nom)"""
+        name = self.tools.get(tool_name)
+        if name is None:
+            name = next((server for server in self.sessions if tool_name.startswith(server)), None)
+        if name is None:
+            raise MCPError(f"Aucun serveur MCP configuré pour l'outil {tool_name}")
+        return self.sessions[name]
+
+    def call_tool(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Appelle un outil sur la session de son serveur"""
+        return _tool_result(self.session_for(tool_name).call_tool(tool_name, params))
+
+    def close(self):
+        """Ferme toutes les sessions"""
+        for session in self.sessions.values():
+            session.close()
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def _load_servers(config_path: str) -> Dict:
+    """Lit la section mcp_servers de la configuration"""
+    if not os.path.exists(config_path):
+        return {}
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return (yaml.safe_load(f) or {}).get('mcp_servers', {}) or {}
+
+
+def get_mcp_pool() -> MCPClientPool:
+    """Retourne le pool partagé du processus (config/sources.yaml)"""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            config_dir = os.getenv('CONFIG_DIR', 'config')
+            _shared_pool = MCPClientPool(_load_servers(os.path.join(config_dir, 'sources.yaml')))
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+
+def set_mcp_pool(pool: Optional[MCPClientPool]):
+    """Remplace le pool partagé (tests, serveur stub)"""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is not None and _shared_pool is not pool:
+            _shared_pool.close()
+        _shared_pool = pool
+
 
 def call_mcp(tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Appelle un outil MCP via Warp
-    
+    Appelle un outil MCP sur la session persistante de son serveur
+
     Args:
         tool_name: Nom de l'outil MCP (ex: "firecrawl_scrape")
         params: Paramètres de l'appel
-        
-    Returns:
-        Résultat de l'appel MCP
-        
-    Note:
-        Les vrais appels MCP ne sont disponibles que dans Warp Agent Mode.
-        Pour les tests locaux, on retourne un placeholder.
-    """
-    
-    # Détection si on est dans Warp ou en local
-    try:
-        # Test si on a accès aux outils MCP
-        import os
-        is_warp = os.environ.get('WARP_SESSION', False)
-        
-        if not is_warp:
-            logger.warning(f"⚠️  Appel MCP '{tool_name}' hors Warp - Mode simulation")
-            return _simulate_mcp_call(tool_name, params)
-        
-        # Appel MCP réel (à implémenter selon l'API Warp)
-        # Pour l'instant, on simule aussi
-        logger.info(f"🔥 Appel MCP: {tool_name}")
-        return _simulate_mcp_call(tool_name, params)
-        
-    except Exception as e:
-        logger.error(f"❌ Erreur appel MCP {tool_name}: {e}")
-        return {}
 
+    Returns:
+        Résultat de l'appel MCP (dict; texte brut sous la clé "markdown")
 
-def _simulate_mcp_call(tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Simule un appel MCP pour développement local"""
-    
-    if tool_name == "firecrawl_scrape":
-        url = params.get("url", "")
-        return {
-            "markdown": f"""# Growth Marketing Article
-
-## Recent News from {url}
-
-### Article 1: Product-Led Growth Strategies
-**Date**: October 26, 2024
-**Summary**: New insights on PLG implementation for B2B SaaS companies.
-
-Key takeaways:
-- Focus on time-to-value optimization
-- Implement reverse trial strategy
-- Leverage product analytics for conversion
-
-[Read more]({url}/article1)
-
-### Article 2: AI-Powered Marketing Automation
-**Date**: October 25, 2024
-**Summary**: How AI is transforming growth marketing workflows in 2024.
-
-Highlights:
-- Predictive lead scoring
-- Dynamic content personalization
-- Automated A/B testing at scale
-
-[Read more]({url}/article2)
-
-### Article 3: Community-Led Growth Framework
-**Date**: October 24, 2024
-**Summary**: Building sustainable growth through community engagement.
-
-Main points:
-- Create value-first communities
-- Leverage UGC for acquisition
-- Measure community health metrics
-
-[Read more]({url}/article3)
-""",
-            "metadata": {
-                "title": f"Latest from {url}",
-                "date": "2024-10-26",
-                "source": url
-            }
-        }
-    
-    elif tool_name == "tavily-search":
-        query = params.get("query", "")
-        return {
-            "results": [
-                {
-                    "title": f"Search result for: {query}",
-                    "url": "https://example.com/article1",
-                    "content": "Growth marketing insights from recent research..."
-                }
-            ]
-        }
-    
-    return {}
+    Raises:
+        MCPError: Serveur non configuré, outil en erreur ou session perdue
+    """
+    logger.info(f"🔥 Appel MCP: {tool_name}")
+    return get_mcp_pool().call_tool(tool_name, params)